@@ -51,3 +51,148 @@ STAT_CATEGORIES = {
     877: "Fewest Penalty Yards",
     926: "Defensive TDs",
 }
+
+# Default request timeout (seconds) for NCAA API calls
+NCAA_DEFAULT_TIMEOUT = 10
+
+# Per-endpoint request timeouts (seconds), keyed by the first path segment
+NCAA_ENDPOINT_TIMEOUTS = {
+    "scoreboard": 10,
+    "stats": 10,
+    "rankings": 10,
+    "standings": 10,
+    "history": 15,
+}
+
+# Response cache freshness (seconds), keyed by the first path segment
+NCAA_CACHE_TTLS = {
+    "scoreboard": 60,
+    "stats": 6 * 60 * 60,
+    "rankings": 60 * 60,
+    "standings": 60 * 60,
+    "history": 7 * 24 * 60 * 60,
+}
+
+# Scoreboard freshness depends on the state of the week's games
+SCOREBOARD_LIVE_TTL = 5
+SCOREBOARD_FINAL_TTL = 24 * 60 * 60
+
+# Built scoreboards of completed weeks no longer change, keep them for a year
+SCOREBOARD_COMPLETED_WEEK_TTL = 365 * 24 * 60 * 60
+
+# How long a week's predictions lookup map is cached (seconds); a new
+# predictions version stamp replaces it sooner
+PREDICTIONS_MAP_TTL = 10 * 60
+
+# Prediction columns the scoreboard reads, projected instead of select('*')
+SCOREBOARD_PREDICTION_COLUMNS = (
+    'week',
+    'game_date',
+    'home_team',
+    'away_team',
+    'predicted_home_score',
+    'predicted_away_score',
+    'predicted_winner',
+    'predicted_margin',
+    'prediction_made_at',
+)
+
+# Read-through prediction cache in SupabaseClient: how long entries live (seconds),
+# how often the predictions_meta version stamp is re-read and the memory budget
+PREDICTIONS_CACHE_TTL = 60 * 60
+PREDICTIONS_VERSION_CHECK = 30
+PREDICTIONS_CACHE_BYTES = 16 * 1024 * 1024
+
+# Rows per page when streaming predictions with keyset pagination
+PREDICTIONS_PAGE_SIZE = 500
+
+# Season scoreboard range requests: concurrent week fetches and the widest range allowed
+SCOREBOARD_SEASON_WORKERS = 8
+SCOREBOARD_SEASON_MAX_WEEKS = 20
+
+# Regular season calendar used to find the current week (month, day of week 1)
+SEASON_START = (8, 23)
+SEASON_LAST_WEEK = 16
+
+# Cache warm-up: concurrent prefetch jobs
+CACHE_WARMUP_WORKERS = 4
+
+# Maximum concurrent page requests when fetching a full stat category
+STATS_PAGE_WORKERS = 8
+
+# Maximum concurrent stat categories fetched for a full team profile
+STATS_CATEGORY_WORKERS = 8
+
+# How long (seconds) after expiry a cached response is served while it is
+# refreshed in the background, keyed by the first path segment
+NCAA_STALE_WHILE_REVALIDATE = {
+    "scoreboard": 30,
+    "stats": 60 * 60,
+    "rankings": 60 * 60,
+    "standings": 60 * 60,
+    "history": 24 * 60 * 60,
+}
+
+# Default grace window (seconds) for serving the last good response while
+# the upstream is failing
+NCAA_STALE_IF_ERROR = 24 * 60 * 60
+
+# Live scoreboard stream: seconds between shared upstream polls and between keep-alive comments
+SCOREBOARD_STREAM_INTERVAL = 10
+SCOREBOARD_STREAM_KEEPALIVE = 15
+
+# Common team name variants, keyed and valued by normalized name
+# (see services.team_service.normalize_team_name)
+TEAM_NAME_ALIASES = {
+    "usc": "southern california",
+    "ole miss": "mississippi",
+    "lsu": "louisiana state",
+    "ucf": "central florida",
+    "byu": "brigham young",
+    "smu": "southern methodist",
+    "tcu": "texas christian",
+    "utep": "texas el paso",
+    "utsa": "texas san antonio",
+    "uab": "alabama birmingham",
+    "fiu": "florida international",
+    "fau": "florida atlantic",
+    "unlv": "nevada las vegas",
+    "uconn": "connecticut",
+    "umass": "massachusetts",
+    "pitt": "pittsburgh",
+    "app state": "appalachian state",
+    "nc state": "north carolina state",
+    "n c state": "north carolina state",
+    "ulm": "louisiana monroe",
+    "ul monroe": "louisiana monroe",
+    "southern miss": "southern mississippi",
+    "miami": "miami fl",
+    "miami florida": "miami fl",
+    "miami ohio": "miami oh",
+    "louisiana lafayette": "louisiana",
+    "ul lafayette": "louisiana",
+    "sam houston state": "sam houston",
+}
+
+# Responses smaller than this (bytes) are sent uncompressed
+COMPRESS_MIN_BYTES = 1024
+
+# Memory budget (bytes) for compressed response bodies reused across requests
+COMPRESS_CACHE_BYTES = 16 * 1024 * 1024
+
+# HTTP Cache-Control policy per URL prefix (longest prefix wins), in seconds:
+# max_age for browsers, s_maxage for shared caches (CDN / reverse proxy) and
+# stale_while_revalidate. no_store marks responses that must never be cached.
+# Routes whose freshness depends on the data (e.g. live vs final scoreboards)
+# override max_age and s_maxage per response.
+CACHE_CONTROL_POLICIES = {
+    "/history": {"max_age": 24 * 60 * 60, "s_maxage": 7 * 24 * 60 * 60, "stale_while_revalidate": 24 * 60 * 60},
+    "/rankings": {"max_age": 5 * 60, "s_maxage": 60 * 60, "stale_while_revalidate": 10 * 60},
+    "/stats": {"max_age": 10 * 60, "s_maxage": 6 * 60 * 60, "stale_while_revalidate": 60 * 60},
+    "/team": {"max_age": 5 * 60, "s_maxage": 60 * 60, "stale_while_revalidate": 10 * 60},
+    "/scoreboard": {"max_age": 60, "s_maxage": 60, "stale_while_revalidate": 30},
+    "/api": {"no_store": True},
+}
+
+# Request headers that select between variants of a cacheable response
+CACHE_CONTROL_VARY = ("Accept-Encoding", "Origin")
@@ -1,19 +1,36 @@
 import os
+import time
 from flask import Flask
 from flask_cors import CORS
 from config import config
-from routes.main import main_bp
-from routes.api import api_bp
-from routes.history import history_bp
-from routes.rankings import rankings_bp
-from routes.stats import stats_bp
-from routes.scoreboard import scoreboard_bp
-from routes.team import team_bp
 from utils.helpers import setup_logging
+from utils.conditional import register_conditional_requests
+from utils.compression import register_compression
+from utils.json_provider import FastJSONProvider
+from utils.metrics import register_metrics
+from utils.cache_control import register_cache_control
+from utils.startup import get_startup_report
+from utils.supabase_client import get_supabase_client
+
+# Blueprints as (module, attribute); route modules pull in the service layer.
+# create_app imports them so each import is timed in the startup report. This
+# does not defer them: the module-level app below is built on import of app.py
+BLUEPRINTS = [
+    ('routes.main', 'main_bp'),
+    ('routes.api', 'api_bp'),
+    ('routes.history', 'history_bp'),
+    ('routes.rankings', 'rankings_bp'),
+    ('routes.stats', 'stats_bp'),
+    ('routes.scoreboard', 'scoreboard_bp'),
+    ('routes.team', 'team_bp'),
+]
 
 def create_app(config_name=None):
     """Application factory function"""
+    report = get_startup_report()
+    start = time.perf_counter()
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
     # Load configuration
     if config_name is None:
@@ -27,14 +44,32 @@ def create_app(config_name=None):
     CORS(app, origins=app.config['CORS_ORIGINS'])
     
     # Register blueprints
-    app.register_blueprint(main_bp)
-    app.register_blueprint(api_bp)
-    app.register_blueprint(history_bp)
-    app.register_blueprint(rankings_bp)
-    app.register_blueprint(stats_bp)
-    app.register_blueprint(scoreboard_bp)
-    app.register_blueprint(team_bp)
+    for module_name, blueprint_name in BLUEPRINTS:
+        module = report.import_module(module_name)
+        with report.measure(f"register {blueprint_name}"):
+            app.register_blueprint(getattr(module, blueprint_name))
+    
+    # Per-route latency and in-flight metrics for /api/metrics
+    register_metrics(app)
+    
+    # Cache-Control policies, applied after the conditional GET hook so 304s carry them too
+    register_cache_control(app)
+    
+    # Compression runs after the conditional GET hook (Flask runs after_request
+    # hooks in reverse order), so 304s are decided on the uncompressed body
+    register_compression(app)
+    
+    # ETag / Last-Modified support for conditional GETs
+    register_conditional_requests(app)
+    
+    # Connect to Supabase in the background instead of on the first request
+    get_supabase_client().start_probe()
+    
+    # Optional background warm-up of the upstream-bound routes' data
+    if app.config['CACHE_WARMUP']:
+        report.import_module('services.warmup_service').get_cache_warmer().start(app.config['CACHE_WARMUP_INTERVAL'])
     
+    report.finish(time.perf_counter() - start)
     return app
 
 # Create the Flask application
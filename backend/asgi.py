@@ -0,0 +1,287 @@
+"""
+ASGI entry point
+
+Serves the upstream-bound routes with the async service layer, so a single
+process can keep hundreds of NCAA requests in flight. Their responses go
+through the Flask app's request hooks, and every other path is passed
+through to the Flask app on a thread pool (ASGI_WSGI_THREADS), so a
+long-lived request such as a live scoreboard stream only holds its own
+thread.
+
+Run with: uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+
+import io
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import format_datetime
+from urllib.parse import parse_qs, unquote
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from api_vars import STAT_CATEGORIES
+from app import app as flask_app
+from services import async_service
+from services.scoreboard_service import scoreboard_ttl
+from services.stats_service import get_stat_category_name, parse_stats_query
+from utils.async_http_client import get_async_ncaa_client
+from utils.cache_control import set_cache_ttl
+from utils.conditional import parse_upstream_timestamp
+from utils.json_provider import dumps_bytes
+
+
+class ThreadPoolWsgiToAsgiInstance(WsgiToAsgiInstance):
+    """One WSGI request, run on the fallback thread pool"""
+
+    async def run_wsgi_app(self, body):
+        # WsgiToAsgi runs every request on one shared thread (thread_sensitive=True),
+        # so a single open event stream would block all other Flask routes
+        run = sync_to_async(WsgiToAsgiInstance.run_wsgi_app.__wrapped__, thread_sensitive=False, executor=wsgi_executor)
+        await run(self, body)
+
+
+class ThreadPoolWsgiToAsgi(WsgiToAsgi):
+    """WsgiToAsgi adapter that serves concurrent requests on separate threads"""
+
+    async def __call__(self, scope, receive, send):
+        await ThreadPoolWsgiToAsgiInstance(self.wsgi_application)(scope, receive, send)
+
+
+# Threads for Flask routes, each open scoreboard stream holds one
+wsgi_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('ASGI_WSGI_THREADS', 64)),
+    thread_name_prefix='asgi-wsgi'
+)
+
+# Reuse the app built by app.py so the Supabase probe and warm-up start only once
+wsgi_app = ThreadPoolWsgiToAsgi(flask_app)
+
+
+class JSONResult:
+    """JSON payload, status and extra headers returned by an async route"""
+
+    def __init__(self, payload, status=200, headers=None, cache_ttl=None):
+        self.payload = payload
+        self.status = status
+        self.headers = headers or {}
+        self.cache_ttl = cache_ttl
+
+
+async def champions_route(params, query):
+    """Async version of GET /history/champions"""
+    champions = await async_service.get_championship_winners()
+    if champions is None:
+        return JSONResult({
+            "success": False,
+            "error": "Failed to fetch championship data from NCAA API"
+        }, 500)
+    return JSONResult({
+        "success": True,
+        "data": champions,
+        "count": len(champions) if isinstance(champions, list) else 1,
+        "message": "Championship data retrieved successfully"
+    })
+
+
+async def ap_rankings_route(params, query):
+    """Async version of GET /rankings/ap-top25"""
+    rankings_data = await async_service.get_ap_rankings()
+    if rankings_data is None:
+        return JSONResult({"success": False, "error": "Failed to fetch AP rankings"}, 500)
+    return JSONResult({"success": True, "data": rankings_data, "data_type": "AP rankings"})
+
+
+async def scoreboard_route(params, query):
+    """Async version of GET /scoreboard/week/<week>"""
+    scoreboard_data = await async_service.get_scoreboard_data(int(params['week']))
+    if scoreboard_data is None:
+        return JSONResult({"success": False, "error": "Failed to fetch scoreboard data"}, 500)
+
+    headers = {}
+    last_modified = parse_upstream_timestamp(scoreboard_data.get('updatedAt'))
+    if last_modified is not None:
+        headers['Last-Modified'] = format_datetime(last_modified, usegmt=True)
+    return JSONResult({"success": True, "data": scoreboard_data, "data_type": "Scoreboard data"},
+                      headers=headers, cache_ttl=scoreboard_ttl(scoreboard_data))
+
+
+async def stat_category_route(params, query):
+    """Async version of GET /stats/stat/<stat_id>"""
+    stat_id = int(params['stat_id'])
+    try:
+        stats_query = parse_stats_query({name: values[0] for name, values in query.items()})
+        if stats_query is None:
+            stats_data = await async_service.get_all_teams_stats(stat_id)
+        else:
+            stats_data = await async_service.query_stats_category(stat_id, **stats_query)
+    except ValueError as e:
+        return JSONResult({"success": False, "error": str(e)}, 400)
+    if stats_data is None:
+        return JSONResult({
+            "success": False,
+            "error": f"Failed to fetch statistics for stat category {stat_id}"
+        }, 500)
+    return JSONResult({"success": True, "data": stats_data, "stat_name": get_stat_category_name(stat_id)})
+
+
+async def team_stat_route(params, query):
+    """Async version of GET /stats/stat/<stat_id>/team/<team_name>"""
+    stat_id = int(params['stat_id'])
+    team_name = params['team_name']
+    team_data = await async_service.get_team_stats(stat_id, team_name)
+    if team_data is None:
+        return JSONResult({
+            "success": False,
+            "error": f"Team '{team_name}' not found in {get_stat_category_name(stat_id)} statistics"
+        }, 404)
+    return JSONResult({
+        "success": True,
+        "data": team_data,
+        "stat_name": get_stat_category_name(stat_id),
+        "team_name": team_name
+    })
+
+
+async def team_profile_route(params, query):
+    """Async version of GET /stats/team/<team_name>/profile"""
+    team_name = params['team_name']
+    stat_ids = None
+    categories_param = query.get('categories', [''])[0]
+    if categories_param:
+        try:
+            stat_ids = [int(stat_id) for stat_id in categories_param.split(',') if stat_id.strip()]
+        except ValueError:
+            return JSONResult({
+                "success": False,
+                "error": "categories must be a comma-separated list of stat category IDs"
+            }, 400)
+        unknown = [stat_id for stat_id in stat_ids if stat_id not in STAT_CATEGORIES]
+        if unknown:
+            return JSONResult({"success": False, "error": f"Unknown stat categories: {unknown}"}, 400)
+
+    profile = await async_service.get_team_profile(team_name, stat_ids)
+    if profile is None:
+        return JSONResult({"success": False, "error": "Failed to fetch team statistics"}, 500)
+    if not profile['categories']:
+        return JSONResult({
+            "success": False,
+            "error": f"Team '{team_name}' not found in any statistics"
+        }, 404)
+    return JSONResult({"success": True, "data": profile, "team_name": team_name})
+
+
+async def team_record_route(params, query):
+    """Async version of GET /team/<team_name>/record"""
+    team_name = params['team_name']
+    record = await async_service.get_team_record(team_name)
+    if record is None:
+        return JSONResult({
+            "success": False,
+            "error": f"Failed to fetch record for team '{team_name}'."
+        }, 404)
+    return JSONResult({"success": True, "data": record, "data_type": "Team record"})
+
+
+ASYNC_ROUTES = [
+    (re.compile(r'^/history/champions$'), champions_route),
+    (re.compile(r'^/rankings/ap-top25$'), ap_rankings_route),
+    (re.compile(r'^/scoreboard/week/(?P<week>\d+)$'), scoreboard_route),
+    (re.compile(r'^/stats/stat/(?P<stat_id>\d+)$'), stat_category_route),
+    (re.compile(r'^/stats/stat/(?P<stat_id>\d+)/team/(?P<team_name>[^/]+)$'), team_stat_route),
+    (re.compile(r'^/stats/team/(?P<team_name>[^/]+)/profile$'), team_profile_route),
+    (re.compile(r'^/team/(?P<team_name>[^/]+)/record$'), team_record_route),
+]
+
+
+def match_route(method, path):
+    """
+    Find the async route for a request
+
+    Returns:
+        tuple: (handler, path parameters), or (None, None) to fall back to Flask
+    """
+    if method not in ('GET', 'HEAD'):
+        return None, None
+    for pattern, handler in ASYNC_ROUTES:
+        match = pattern.match(path)
+        if match:
+            return handler, {name: unquote(value) for name, value in match.groupdict().items()}
+    return None, None
+
+
+def build_environ(scope):
+    """Build the WSGI environ Flask needs for a request context from an ASGI scope"""
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': scope['server'][0] if scope.get('server') else 'localhost',
+        'SERVER_PORT': str(scope['server'][1]) if scope.get('server') else '80',
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+    }
+    for name, value in scope['headers']:
+        key = name.decode('latin-1').upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = f"HTTP_{key}"
+        value = value.decode('latin-1')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def send_async_route(scope, send, handler, params):
+    """
+    Serve an async route through the Flask request pipeline
+
+    The handler runs inside a Flask request context and its result passes
+    through the app's before/after-request hooks, so async routes get the
+    same metrics, ETag/Last-Modified 304s, Cache-Control, compression and
+    CORS headers as the Flask routes.
+    """
+    with flask_app.request_context(build_environ(scope)):
+        response = flask_app.preprocess_request()
+        if response is None:
+            query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+            result = await handler(params, query)
+            response = flask_app.response_class(
+                dumps_bytes(result.payload) + b"\n",
+                status=result.status,
+                headers=result.headers,
+                mimetype='application/json'
+            )
+            if result.cache_ttl is not None:
+                set_cache_ttl(result.cache_ttl)
+        response = flask_app.process_response(flask_app.make_response(response))
+
+        body = b'' if scope['method'] == 'HEAD' else response.get_data()
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in response.headers.items()]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+
+async def app(scope, receive, send):
+    """ASGI application: async routes first, everything else through Flask"""
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await get_async_ncaa_client().aclose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    if scope['type'] == 'http':
+        handler, params = match_route(scope['method'], scope['path'])
+        if handler is not None:
+            await send_async_route(scope, send, handler, params)
+            return
+
+    await wsgi_app(scope, receive, send)
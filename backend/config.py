@@ -18,6 +18,10 @@ class Config:
     # CORS Configuration
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:3000,http://127.0.0.1:3000').split(',')
     
+    # Cache warm-up at startup, repeated every CACHE_WARMUP_INTERVAL seconds (0 runs it once)
+    CACHE_WARMUP = os.environ.get('CACHE_WARMUP', 'False').lower() == 'true'
+    CACHE_WARMUP_INTERVAL = int(os.environ.get('CACHE_WARMUP_INTERVAL', 15 * 60))
+    
     # Supabase Configuration
     SUPABASE_URL = os.environ.get('SUPABASE_URL')
     SUPABASE_KEY = os.environ.get('SUPABASE_KEY')
@@ -1,8 +1,13 @@
 """API routes for the application"""
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, jsonify
 from datetime import datetime, timezone
 from utils.supabase_client import get_supabase_client
+from utils.cache import get_response_cache
+from utils.http_client import get_ncaa_client
+from utils.metrics import render_metrics
+from services.stats_warehouse import get_stats_warehouse
+from utils.startup import get_startup_report
 
 # Create API blueprint
 api_bp = Blueprint('api', __name__, url_prefix='/api')
@@ -19,13 +24,30 @@ def health():
 @api_bp.route('/status', methods=['GET'])
 def status():
     """Application status endpoint"""
+    # Imported here so the warm-up service only loads when warm-up is enabled or status is asked for
+    from services.warmup_service import get_cache_warmer
     supabase = get_supabase_client()
+    warmer = get_cache_warmer()
     return jsonify({
         'name': 'React Flask Web App',
         'version': '1.0.0',
         'status': 'running',
         'uptime': 'active',
+        'ready': warmer.ready,
+        'warmup': warmer.status(),
         'supabase': {
-            'connected': supabase.is_connected
+            'connected': supabase.is_connected,
+            'probe': supabase.probe
+        },
+        'startup': get_startup_report().report(),
+        'cache': get_response_cache().stats(),
+        'stats_warehouse': get_stats_warehouse().stats(),
+        'upstream': {
+            'ncaa_circuit': get_ncaa_client().breaker.stats()
         }
     })
+
+@api_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics endpoint"""
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
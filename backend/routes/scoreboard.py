@@ -2,8 +2,14 @@
 Scoreboard routes for NCAA football game data
 """
 
-from flask import Blueprint, jsonify, request
-from services.scoreboard_service import get_scoreboard_data
+import json
+import queue
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from api_vars import SCOREBOARD_STREAM_KEEPALIVE, SEASON_LAST_WEEK
+from services.scoreboard_service import get_scoreboard_data, get_season_scoreboard, parse_week_range, scoreboard_ttl
+from services.live_scoreboard_service import get_scoreboard_poller
+from utils.cache_control import set_cache_ttl
+from utils.conditional import parse_upstream_timestamp
 
 # Create blueprint for scoreboard routes
 scoreboard_bp = Blueprint('scoreboard', __name__, url_prefix='/scoreboard')
@@ -25,9 +31,90 @@ def get_scoreboard_by_week(week):
             "error": "Failed to fetch scoreboard data"
         }), 500
     
-    return jsonify({
+    response = jsonify({
         "success": True,
         "data": scoreboard_data,
         "data_type": "Scoreboard data"
     })
+    response.last_modified = parse_upstream_timestamp(scoreboard_data.get('updatedAt'))
+    set_cache_ttl(scoreboard_ttl(scoreboard_data))
+    return response
+
+
+@scoreboard_bp.route('/season/<int:year>', methods=['GET'])
+def get_scoreboard_by_season(year):
+    """
+    Route to get the scoreboards of several weeks of a season in one response
+    Args:
+        year (int): Season year
+    Query Parameters:
+        weeks (str, optional): Weeks to include, e.g. ?weeks=1-15 (default) or ?weeks=1,3,5-7
+    Returns:
+        JSON response with one scoreboard section per week or error message
+    """
+    try:
+        weeks = parse_week_range(request.args.get('weeks', '1-15'))
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+
+    season_data = get_season_scoreboard(year, weeks)
+
+    if season_data is None:
+        return jsonify({
+            "success": False,
+            "error": "Failed to fetch scoreboard data"
+        }), 500
+
+    # The season is only as fresh as its liveliest week
+    ttls = [scoreboard_ttl(section) for section in season_data['weeks']]
+    if ttls:
+        set_cache_ttl(min(ttls))
+    return jsonify({
+        "success": True,
+        "data": season_data,
+        "data_type": "Season scoreboard data"
+    })
+
+
+@scoreboard_bp.route('/week/<int:week>/stream', methods=['GET'])
+def stream_scoreboard_by_week(week):
+    """
+    Server-Sent Events stream of live scoreboard changes for a week
+
+    Sends a 'snapshot' event with every game, then 'update' events with only
+    the games whose score, state or rank changed. All viewers of a week share
+    one upstream poller.
+    Args:
+        week (int): Week number, 1 to SEASON_LAST_WEEK
+    """
+    # Every streamed week gets an upstream poller, so only weeks of the season may start one
+    if not 1 <= week <= SEASON_LAST_WEEK:
+        return jsonify({
+            "success": False,
+            "error": f"week must be between 1 and {SEASON_LAST_WEEK}"
+        }), 400
+
+    poller = get_scoreboard_poller(week)
+
+    def events():
+        subscriber = poller.subscribe()
+        try:
+            while True:
+                try:
+                    event, payload = subscriber.get(timeout=SCOREBOARD_STREAM_KEEPALIVE)
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            poller.unsubscribe(subscriber)
 
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
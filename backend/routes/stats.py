@@ -2,11 +2,15 @@
 Stats routes for NCAA football statistics data
 """
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
+from api_vars import STAT_CATEGORIES
 from services.stats_service import (
 get_stat_category_name,
 get_all_teams_stats,
 get_team_stats,
+get_team_profile,
+parse_stats_query,
+query_stats_category,
 
 get_offense_stats,
 get_defense_stats,
@@ -105,29 +109,63 @@ get_team_fewest_penalty_yards_stats,
 get_team_defensive_tds_stats
 
 )
+from services.stats_warehouse import get_stats_warehouse, PANDAS_AVAILABLE
 
 # Create blueprint for stats routes
 stats_bp = Blueprint('stats', __name__, url_prefix='/stats')
 
 
-@stats_bp.route('/stat/<int:stat_id>', methods=['GET'])
-def get_stat_category(stat_id):
-    """Route to get statistics for all teams in a specific stat category"""
-    stats_data = get_all_teams_stats(stat_id)
+def stat_category_response(stat_id, fetch_all, stat_name, error):
+    """
+    Build the response for a stat category route
+
+    Query Parameters:
+        sort (str, optional): Numeric column to sort by, e.g. ?sort=Yards
+        order (str, optional): 'asc' or 'desc' (default)
+        limit (int, optional): Maximum number of teams to return
+        offset (int, optional): Number of teams to skip
+        conference (str, optional): Only include teams in this conference
+        fields (str, optional): Comma-separated columns to include, e.g. ?fields=Team,Yards
+
+    Args:
+        stat_id (int): The stat category ID
+        fetch_all (callable): Loads the full category when no query parameters are given
+        stat_name (str): Stat category name for the response
+        error (str): Error message when the category cannot be loaded
+    """
+    try:
+        query = parse_stats_query(request.args)
+        stats_data = fetch_all() if query is None else query_stats_category(stat_id, **query)
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     
     if stats_data is None:
         return jsonify({
             "success": False,
-            "error": f"Failed to fetch statistics for stat category {stat_id}"
+            "error": error
         }), 500
     
     return jsonify({
         "success": True,
         "data": stats_data,
-        "stat_name": get_stat_category_name(stat_id)
+        "stat_name": stat_name
     })
 
 
+@stats_bp.route('/stat/<int:stat_id>', methods=['GET'])
+def get_stat_category(stat_id):
+    """Route to get statistics for all teams in a specific stat category"""
+    return stat_category_response(
+        stat_id,
+        lambda: get_all_teams_stats(stat_id),
+        get_stat_category_name(stat_id),
+        f"Failed to fetch statistics for stat category {stat_id}"
+    )
+
+
 @stats_bp.route('/stat/<int:stat_id>/team/<team_name>', methods=['GET'])
 def get_team_stat(stat_id, team_name):
     """Route to get statistics for a specific team in a specific stat category"""
@@ -147,57 +185,113 @@ def get_team_stat(stat_id, team_name):
     })
 
 
-@stats_bp.route('/offense', methods=['GET'])
-def get_offense_stats_route():
-    """Route to get total offense statistics for all teams"""
-    offense_data = get_offense_stats()
-    
-    if offense_data is None:
+@stats_bp.route('/team/<team_name>/profile', methods=['GET'])
+def get_team_profile_route(team_name):
+    """
+    Route to get a team's statistics across all stat categories in one response
+
+    Query Parameters:
+        categories (str, optional): Comma-separated stat category IDs, e.g. ?categories=21,22
+    """
+    stat_ids = None
+    categories_param = request.args.get('categories')
+    if categories_param:
+        try:
+            stat_ids = [int(stat_id) for stat_id in categories_param.split(',') if stat_id.strip()]
+        except ValueError:
+            return jsonify({
+                "success": False,
+                "error": "categories must be a comma-separated list of stat category IDs"
+            }), 400
+
+        unknown = [stat_id for stat_id in stat_ids if stat_id not in STAT_CATEGORIES]
+        if unknown:
+            return jsonify({
+                "success": False,
+                "error": f"Unknown stat categories: {unknown}"
+            }), 400
+
+    profile = get_team_profile(team_name, stat_ids)
+
+    if profile is None:
         return jsonify({
             "success": False,
-            "error": "Failed to fetch offense statistics"
+            "error": "Failed to fetch team statistics"
         }), 500
-    
+
+    if not profile['categories']:
+        return jsonify({
+            "success": False,
+            "error": f"Team '{team_name}' not found in any statistics"
+        }), 404
+
     return jsonify({
         "success": True,
-        "data": offense_data,
-        "stat_name": "Total Offense"
+        "data": profile,
+        "team_name": team_name
     })
 
 
-@stats_bp.route('/offense/rushing', methods=['GET'])
-def get_rushing_offense_stats_route():
-    """Route to get total offense rushing statistics for all teams"""
-    rushing_offense_data = get_rushing_offense()
-    
-    if rushing_offense_data is None:
+@stats_bp.route('/compare', methods=['GET'])
+def compare_teams_route():
+    """
+    Route to score every team on metrics from any stat categories at once
+
+    Query Parameters:
+        metrics (str): Comma-separated '<stat_id>:<column>' metrics, '-' prefix when lower is better,
+            e.g. ?metrics=21:YPG,-22:YPG
+        method (str, optional): 'rank' (default), 'percentile' or 'zscore'
+        limit (int, optional): Maximum number of teams to return
+    """
+    if not PANDAS_AVAILABLE:
+        return jsonify({
+            "success": False,
+            "error": "Stats comparison requires numpy and pandas"
+        }), 503
+
+    metrics = [metric for metric in request.args.get('metrics', '').split(',') if metric.strip()]
+    try:
+        try:
+            limit = int(request.args['limit']) if request.args.get('limit') else None
+        except ValueError:
+            raise ValueError("limit must be a positive integer")
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be a positive integer")
+        teams = get_stats_warehouse().query(metrics, request.args.get('method', 'rank'), limit)
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+
+    if teams is None:
         return jsonify({
             "success": False,
-            "error": "Failed to fetch rushing offense statistics"
+            "error": "Failed to fetch statistics for comparison"
         }), 500
-    
+
     return jsonify({
         "success": True,
-        "data": rushing_offense_data,
-        "stat_name": "Rushing Offense"
+        "data": teams,
+        "metrics": metrics
     })
 
+
+@stats_bp.route('/offense', methods=['GET'])
+def get_offense_stats_route():
+    """Route to get total offense statistics for all teams"""
+    return stat_category_response(21, get_offense_stats, "Total Offense", "Failed to fetch offense statistics")
+
+
+@stats_bp.route('/offense/rushing', methods=['GET'])
+def get_rushing_offense_stats_route():
+    """Route to get total offense rushing statistics for all teams"""
+    return stat_category_response(23, get_rushing_offense, "Rushing Offense", "Failed to fetch rushing offense statistics")
+
 @stats_bp.route('/defense/rushing', methods=['GET'])
 def get_rushing_defense_stats_route():
     """Route to get total defense rushing statistics for all teams"""
-    rushing_defense_data = get_rushing_defense()
-    
-    if rushing_defense_data is None:
-        return jsonify({
-            "success": False,
-            "error": "Failed to fetch rushing defense statistics"
-        }), 500
-    
-    return jsonify({
-        "success": True,
-        "data": rushing_defense_data,
-        "stat_name": "Rushing Defense"
-    })
+    return stat_category_response(24, get_rushing_defense, "Rushing Defense", "Failed to fetch rushing defense statistics")
 
 
 @stats_bp.route('/offense/team/<team_name>', methods=['GET'])
@@ -222,19 +316,7 @@ def get_team_offense_stats_route(team_name):
 @stats_bp.route('/defense', methods=['GET'])
 def get_defense_stats_route():
     """Route to get total defense statistics for all teams"""
-    defense_data = get_defense_stats()
-    
-    if defense_data is None:
-        return jsonify({
-            "success": False,
-            "error": "Failed to fetch defense statistics"
-        }), 500
-    
-    return jsonify({
-        "success": True,
-        "data": defense_data,
-        "stat_name": "Total Defense"
-    })
+    return stat_category_response(22, get_defense_stats, "Total Defense", "Failed to fetch defense statistics")
 
 
 @stats_bp.route('/defense/team/<team_name>', methods=['GET'])
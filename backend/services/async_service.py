@@ -0,0 +1,288 @@
+"""
+Async service layer for NCAA data
+Async variants of the history, rankings, scoreboard, stats and team services.
+They share parsing code and the response cache with the sync services but
+fetch through the async client, so one process can serve many concurrent
+upstream-bound requests. Cache reads and writes (which may hit the SQLite
+tier) run on worker threads so they never block the event loop.
+"""
+
+import asyncio
+from datetime import date
+import httpx
+from api_vars import STAT_CATEGORIES, NCAA_CACHE_TTLS
+from utils.async_http_client import get_async_ncaa_client
+from utils.cache import get_response_cache
+from services.scoreboard_service import build_scoreboard, scoreboard_path, get_predictions_map
+from services.stats_service import (
+    stats_page_path,
+    combine_stats_pages,
+    build_team_index,
+    build_team_profile,
+    build_stats_table,
+    query_stats_table,
+)
+from services.team_service import normalize_team_name, build_standings_index, conference_teams
+
+
+async def get_championship_winners():
+    """
+    Fetch championship winners from NCAA API
+
+    Returns:
+        dict or None: Championship data from API, or None if error occurred
+    """
+    try:
+        return await get_async_ncaa_client().get_json('/history/football/fbs')
+    except httpx.HTTPError as e:
+        print(f"Request error occurred: {e}")
+    return None
+
+
+async def get_ap_rankings():
+    """
+    Fetch AP Top 25 rankings from NCAA API
+
+    Returns:
+        dict or None: AP Top 25 rankings data, or None if error occurred
+    """
+    try:
+        return await get_async_ncaa_client().get_json('/rankings/football/fbs/associated-press')
+    except httpx.HTTPError as e:
+        print(f"Request error occurred: {e}")
+    return None
+
+
+async def _get_predictions_map(week, year):
+    """Get a week's cached predictions map on a worker thread (the version check may query Supabase)"""
+    return await asyncio.to_thread(get_predictions_map, year, week)
+
+
+async def get_scoreboard_data(week, year=None):
+    """
+    Fetch a week's scoreboard and its predictions concurrently
+
+    Args:
+        week (int): Week number (required)
+        year (int): Season year, defaults to the current year
+    Returns:
+        dict or None: Scoreboard data or None if error occurred
+    """
+    if year is None:
+        year = date.today().year
+
+    path = scoreboard_path(week, year)
+    raw_result, predictions_map = await asyncio.gather(
+        get_async_ncaa_client().get_json(path),
+        _get_predictions_map(week, year),
+        return_exceptions=True
+    )
+
+    if isinstance(raw_result, Exception):
+        print(f"Request error occurred: {raw_result}")
+        return None
+    if isinstance(predictions_map, Exception):
+        predictions_map = {}
+
+    # Matching predictions may persist newly seen team names, keep that off the event loop
+    return await asyncio.to_thread(build_scoreboard, raw_result, predictions_map, week, year)
+
+
+async def _fetch_stats_page(stat_id, page):
+    """Fetch one stat category page as (data, ttl), or (None, 0) if the API returned an error"""
+    try:
+        return await get_async_ncaa_client().get_json_with_ttl(stats_page_path(stat_id, page))
+    except httpx.HTTPStatusError as e:
+        print(f"API returned an error for page {page}: {e}")
+        return None, 0
+
+
+async def fetch_all_teams_stats(stat_id):
+    """
+    Fetch all pages of a stat category, remaining pages concurrently, with how long the result stays fresh
+
+    Args:
+        stat_id (int): The stat category ID
+
+    Returns:
+        tuple: (combined statistics data or None if error occurred; seconds until
+        the first page expires, 0 if any page was served stale or failed)
+    """
+    try:
+        first_page, ttl = await _fetch_stats_page(stat_id, 1)
+        if first_page is None or not first_page.get('data'):
+            return None, 0
+
+        total_pages = first_page.get('pages', 1)
+        later_pages = await asyncio.gather(
+            *(_fetch_stats_page(stat_id, page) for page in range(2, total_pages + 1))
+        )
+        ttl = min([ttl] + [page_ttl for _, page_ttl in later_pages])
+        return combine_stats_pages(first_page, [page for page, _ in later_pages]), ttl
+
+    except httpx.HTTPError as e:
+        print(f"Error fetching all teams stats for stat ID {stat_id}: {e}")
+        return None, 0
+
+
+async def get_all_teams_stats(stat_id):
+    """
+    Fetch statistics for all teams in a stat category, remaining pages concurrently
+
+    Args:
+        stat_id (int): The stat category ID
+
+    Returns:
+        dict or None: Combined statistics data from all pages, or None if error occurred
+    """
+    return (await fetch_all_teams_stats(stat_id))[0]
+
+
+async def get_team_index(stat_id):
+    """
+    Get the cached normalized team name -> row index for a stat category
+
+    Args:
+        stat_id (int): The stat category ID
+
+    Returns:
+        dict or None: Team index, or None if error occurred
+    """
+    cache = get_response_cache()
+    cache_key = f"stats-index:{stat_id}"
+
+    index = await asyncio.to_thread(cache.get, cache_key)
+    if index is not None:
+        return index
+
+    stats_data, ttl = await fetch_all_teams_stats(stat_id)
+    if stats_data is None:
+        return None
+
+    index = build_team_index(stats_data)
+    await asyncio.to_thread(cache.set, cache_key, index, min(NCAA_CACHE_TTLS['stats'], ttl))
+    return index
+
+
+async def get_team_stats(stat_id, team_name):
+    """
+    Fetch statistics for a specific team from the stat category's team index
+
+    Args:
+        stat_id (int): The stat category ID
+        team_name (str): The team name to search for
+
+    Returns:
+        dict or None: Team statistics data if found, or None if not found or error occurred
+    """
+    index = await get_team_index(stat_id)
+    if index is None:
+        return None
+    return index.get(normalize_team_name(team_name))
+
+
+async def get_team_profile(team_name, stat_ids=None):
+    """
+    Fetch a team's statistics across many stat categories, all categories concurrently
+
+    Args:
+        team_name (str): The team name to search for
+        stat_ids (list, optional): Stat category IDs to include, defaults to all STAT_CATEGORIES
+
+    Returns:
+        dict or None: Team profile, or None if every category failed to load
+    """
+    if stat_ids is None:
+        stat_ids = list(STAT_CATEGORIES)
+
+    indexes = await asyncio.gather(*(get_team_index(stat_id) for stat_id in stat_ids))
+    return build_team_profile(team_name, dict(zip(stat_ids, indexes)))
+
+
+async def get_stats_table(stat_id):
+    """
+    Get the cached stats table (rows plus precomputed sort orders) for a stat category
+
+    Args:
+        stat_id (int): The stat category ID
+
+    Returns:
+        dict or None: Stats table, or None if error occurred
+    """
+    cache = get_response_cache()
+    cache_key = f"stats-table:{stat_id}"
+
+    table = await asyncio.to_thread(cache.get, cache_key)
+    if table is not None:
+        return table
+
+    stats_data, ttl = await fetch_all_teams_stats(stat_id)
+    if stats_data is None:
+        return None
+
+    table = build_stats_table(stats_data)
+    await asyncio.to_thread(cache.set, cache_key, table, min(NCAA_CACHE_TTLS['stats'], ttl))
+    return table
+
+
+async def query_stats_category(stat_id, sort=None, order='desc', limit=None, offset=0, conference=None, fields=None):
+    """
+    Fetch a sorted, filtered and paginated view of a stat category
+
+    Args:
+        stat_id (int): The stat category ID
+        sort, order, limit, offset, conference, fields: See stats_service.query_stats_category
+
+    Returns:
+        dict or None: Selected statistics data, or None if error occurred
+
+    Raises:
+        ValueError: If sort is not a numeric column of the category
+    """
+    table = await get_stats_table(stat_id)
+    if table is None:
+        return None
+
+    teams = None
+    if conference:
+        index = await get_standings_index()
+        if index is None:
+            return None
+        teams = conference_teams(index, conference)
+
+    return query_stats_table(table, sort, order, limit, offset, teams, fields)
+
+
+async def get_standings_index():
+    """
+    Get the FBS standings indexed by normalized team name
+
+    Returns:
+        dict or None: Standings index, or None if error occurred
+    """
+    cache = get_response_cache()
+    index = await asyncio.to_thread(cache.get, 'standings-index')
+    if index is None:
+        try:
+            raw_data, ttl = await get_async_ncaa_client().get_json_with_ttl('/standings/football/fbs')
+        except httpx.HTTPError as e:
+            print(f"Request error occurred: {e}")
+            return None
+        index = build_standings_index(raw_data)
+        await asyncio.to_thread(cache.set, 'standings-index', index, min(NCAA_CACHE_TTLS['standings'], ttl))
+    return index
+
+
+async def get_team_record(team_name):
+    """
+    Fetch a team's record from the cached standings index
+
+    Args:
+        team_name (str): Team name (required)
+    Returns:
+        dict or None: Team record data or None if not found or error occurred
+    """
+    index = await get_standings_index()
+    if index is None:
+        return None
+    return index['teams'].get(normalize_team_name(team_name))
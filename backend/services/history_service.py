@@ -3,7 +3,7 @@ History service for fetching NCAA championship data
 """
 
 import requests
-from api_vars import NCAA_API_BASE_URL
+from utils.http_client import get_ncaa_client
 
 
 def get_championship_winners():
@@ -15,9 +15,7 @@ def get_championship_winners():
     """
 
     try:
-        response = requests.get(f'{NCAA_API_BASE_URL}/history/football/fbs')
-        response.raise_for_status()
-        return response.json()
+        return get_ncaa_client().get_json('/history/football/fbs')
 
     except requests.exceptions.HTTPError as e:
         print(f"HTTP error occurred: {e}")
@@ -0,0 +1,197 @@
+"""
+Live scoreboard service for streaming score changes to many viewers
+One background poller per week fetches the scoreboard once per interval
+and pushes only the games that changed to every subscriber
+"""
+
+import queue
+import threading
+from datetime import date
+from api_vars import SCOREBOARD_STREAM_INTERVAL
+from services.scoreboard_service import get_scoreboard_data
+
+# Maximum events buffered for one slow subscriber before its queue is reset to a snapshot
+SUBSCRIBER_QUEUE_SIZE = 50
+
+
+def game_key(game: dict):
+    """Get a stable identifier for a processed game"""
+    return game.get('gameID') or (
+        game.get('away', {}).get('names', {}).get('seo'),
+        game.get('home', {}).get('names', {}).get('seo'),
+        game.get('epoch')
+    )
+
+
+def game_signature(game: dict):
+    """Get the parts of a game that viewers need to be told about when they change"""
+    return (
+        game.get('away', {}).get('score'),
+        game.get('home', {}).get('score'),
+        game.get('away', {}).get('rank'),
+        game.get('home', {}).get('rank'),
+        tuple(sorted(game.get('game_state', {}).items()))
+    )
+
+
+def diff_games(previous: dict, games: list):
+    """
+    Find games whose score, state or rank changed
+
+    Args:
+        previous: Mapping of game key -> signature from the last poll
+        games: Processed games from the current poll
+
+    Returns:
+        tuple: (changed games, new key -> signature mapping)
+    """
+    current = {}
+    changed = []
+    for game in games:
+        key = game_key(game)
+        signature = game_signature(game)
+        current[key] = signature
+        if previous.get(key) != signature:
+            changed.append(game)
+    return changed, current
+
+
+class ScoreboardPoller:
+    """Shared poller for one week's scoreboard"""
+
+    def __init__(self, week: int, year: int, interval: float = SCOREBOARD_STREAM_INTERVAL):
+        self.week = week
+        self.year = year
+        self.interval = interval
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        # None until the first successful poll, an empty dict is a week without games
+        self._signatures = None
+        self._games = []
+        self._updated_at = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def subscribe(self) -> queue.Queue:
+        """
+        Register a viewer and start polling if this is the first one
+
+        Returns:
+            Queue that receives (event name, payload) tuples, starting with a full snapshot
+        """
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with _pollers_lock, self._lock:
+            if self._signatures is not None:
+                subscriber.put(('snapshot', self._payload(self._games)))
+            self._subscribers.add(subscriber)
+            self._stop.clear()
+            # Re-register if the last viewer left between get_scoreboard_poller and now
+            _pollers.setdefault((self.year, self.week), self)
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f'scoreboard-poller-{self.year}-{self.week}',
+                    daemon=True
+                )
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue) -> None:
+        """Remove a viewer, then stop polling and forget the poller once nobody is watching"""
+        with _pollers_lock, self._lock:
+            self._subscribers.discard(subscriber)
+            if not self._subscribers:
+                self._stop.set()
+                if _pollers.get((self.year, self.week)) is self:
+                    del _pollers[(self.year, self.week)]
+
+    def subscriber_count(self) -> int:
+        """Get the number of connected viewers"""
+        with self._lock:
+            return len(self._subscribers)
+
+    def poll_once(self) -> None:
+        """Fetch the scoreboard once and publish the games that changed"""
+        scoreboard = get_scoreboard_data(self.week, self.year)
+        if scoreboard is None:
+            return
+
+        games = scoreboard.get('games', [])
+        with self._lock:
+            is_first_poll = self._signatures is None
+            changed, self._signatures = diff_games(self._signatures or {}, games)
+            self._games = games
+            self._updated_at = scoreboard.get('updatedAt')
+
+            if is_first_poll:
+                self._publish('snapshot', self._payload(games))
+            elif changed:
+                self._publish('update', self._payload(changed))
+
+    def _run(self) -> None:
+        """Poll until the last subscriber leaves"""
+        while True:
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"Scoreboard poller for week {self.week} failed: {e}")
+            self._stop.wait(self.interval)
+
+            # Decide under the lock so a viewer joining right now keeps the poller alive
+            with self._lock:
+                if self._stop.is_set():
+                    self._thread = None
+                    return
+
+    def _payload(self, games: list) -> dict:
+        """Build the event payload for a list of games"""
+        return {
+            'week': self.week,
+            'year': self.year,
+            'updatedAt': self._updated_at,
+            'games': games
+        }
+
+    def _publish(self, event: str, payload: dict) -> None:
+        """Send an event to every subscriber, caller must hold the lock"""
+        for subscriber in self._subscribers:
+            try:
+                subscriber.put_nowait((event, payload))
+            except queue.Full:
+                # Slow viewer: updates are deltas, so dropping any of them would leave it
+                # with a wrong board. Replace everything it has queued with the full state.
+                while True:
+                    try:
+                        subscriber.get_nowait()
+                    except queue.Empty:
+                        break
+                subscriber.put_nowait(('snapshot', self._payload(self._games)))
+
+
+# Pollers with at least one viewer (or just handed out), by (year, week);
+# lock order is _pollers_lock, then the poller's own lock
+_pollers = {}
+_pollers_lock = threading.Lock()
+
+
+def get_scoreboard_poller(week: int, year: int = None) -> ScoreboardPoller:
+    """
+    Get the shared poller for a week, creating it on first use
+
+    Args:
+        week (int): Week number
+        year (int): Season year, defaults to the current year
+
+    Returns:
+        ScoreboardPoller instance
+    """
+    if year is None:
+        year = date.today().year
+
+    with _pollers_lock:
+        poller = _pollers.get((year, week))
+        if poller is None:
+            poller = ScoreboardPoller(week, year)
+            _pollers[(year, week)] = poller
+        return poller
@@ -3,7 +3,7 @@ Rankings service for fetching NCAA football rankings data
 """
 
 import requests
-from api_vars import NCAA_API_BASE_URL
+from utils.http_client import get_ncaa_client
 
 
 def get_ap_rankings():
@@ -15,9 +15,7 @@ def get_ap_rankings():
     """
 
     try:
-        response = requests.get(f'{NCAA_API_BASE_URL}/rankings/football/fbs/associated-press', timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return get_ncaa_client().get_json('/rankings/football/fbs/associated-press')
 
     except requests.exceptions.HTTPError as e:
         print(f"HTTP error occurred: {e}")
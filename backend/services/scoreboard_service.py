@@ -3,10 +3,53 @@ Scoreboard service for fetching NCAA football game data by week
 Includes predictions from Supabase when available
 """
 
+import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from api_vars import NCAA_API_BASE_URL
+from api_vars import (
+    NCAA_CACHE_TTLS,
+    PREDICTIONS_MAP_TTL,
+    SCOREBOARD_LIVE_TTL,
+    SCOREBOARD_FINAL_TTL,
+    SCOREBOARD_PREDICTION_COLUMNS,
+    SCOREBOARD_COMPLETED_WEEK_TTL,
+    SCOREBOARD_SEASON_WORKERS,
+    SCOREBOARD_SEASON_MAX_WEEKS,
+    SEASON_START,
+    SEASON_LAST_WEEK,
+)
+from utils.cache import get_response_cache
+from utils.http_client import get_ncaa_client
 from utils.supabase_client import get_supabase_client
+from services.team_identity import build_prediction_index, get_team_identity, match_prediction
+
+logger = logging.getLogger(__name__)
+
+# Worker pool for NCAA scoreboard fetches that run alongside Supabase queries
+_week_executor = ThreadPoolExecutor(max_workers=SCOREBOARD_SEASON_WORKERS, thread_name_prefix='scoreboard-week')
+
+
+def get_current_week(today=None):
+    """
+    Estimate the current regular season week from the calendar
+
+    Args:
+        today (date, optional): Defaults to today
+    Returns:
+        int: Week number between 1 and SEASON_LAST_WEEK
+    """
+    today = today or date.today()
+    start = date(today.year, *SEASON_START)
+    if today < start:
+        return 1
+    return min((today - start).days // 7 + 1, SEASON_LAST_WEEK)
+
+
+def scoreboard_path(week, year):
+    """Build the NCAA API path for a week's FBS scoreboard"""
+    return f"/scoreboard/football/fbs/{year}/{week:02d}/all-conf"
+
 
 def process_games(raw_data: dict, predictions_map: dict = None):
     """
@@ -14,9 +57,10 @@ def process_games(raw_data: dict, predictions_map: dict = None):
     
     Args:
         raw_data: Raw game data from NCAA API
-        predictions_map: Dictionary mapping team names to predictions
+        predictions_map: Prediction join index from build_predictions_map
     """
     processed_games = []
+    identity = get_team_identity()
     
     if predictions_map is None:
         predictions_map = {}
@@ -26,15 +70,17 @@ def process_games(raw_data: dict, predictions_map: dict = None):
         away_team = game.get('away', {}) or {}
         home_team = game.get('home', {}) or {}
         
-        # Get team names for prediction lookup
-        home_team_name = home_team.get('names', {}).get('full', '')
-        away_team_name = away_team.get('names', {}).get('full', '')
+        # Learn the NCAA name variants of both teams for prediction matching
+        home_names = home_team.get('names', {}) or {}
+        away_names = away_team.get('names', {}) or {}
+        identity.register_ncaa_team(home_names)
+        identity.register_ncaa_team(away_names)
         
-        # Debug: Print team names
-        if predictions_map:  # Only print if we have predictions to match
-            print(f"Debug: Scoreboard game - {away_team_name} @ {home_team_name}")
+        if predictions_map:
+            logger.debug("Scoreboard game - %s @ %s", away_names.get('full', ''), home_names.get('full', ''))
 
         game_data = {
+            'gameID': game.get('gameID'),
             'game_state':  { 
                 'isUpcoming': True if game.get('gameState') == "pre" else False,
                 'isLive': True if game.get('gameState') == "live" else False,
@@ -62,10 +108,9 @@ def process_games(raw_data: dict, predictions_map: dict = None):
             'epoch': game.get('startTimeEpoch')
         }
         
-        # Add prediction if available (match by both team names)
-        prediction_key = f"{home_team_name}|{away_team_name}"
-        if prediction_key in predictions_map:
-            prediction = predictions_map[prediction_key]
+        # Add prediction if available (match by canonical team ids and date)
+        prediction = match_prediction(predictions_map, home_names, away_names, game.get('startTimeEpoch'), identity)
+        if prediction is not None:
             game_data['prediction'] = {
                 'home_score': prediction.get('predicted_home_score'),
                 'away_score': prediction.get('predicted_away_score'),
@@ -76,9 +121,104 @@ def process_games(raw_data: dict, predictions_map: dict = None):
         
         processed_games.append(game_data)
 
+    identity.save_in_background()
     return processed_games
         
 
+def build_predictions_map(predictions: list):
+    """
+    Create the join index for quick lookup: canonical "home|away|date" and
+    "home|away" -> prediction
+
+    Args:
+        predictions: Prediction rows from Supabase
+    """
+    predictions_map = build_prediction_index(predictions)
+    logger.debug("Indexed %d predictions under %d keys", len(predictions), len(predictions_map))
+    return predictions_map
+
+
+def predictions_map_key(season, week):
+    """Response cache key of a week's predictions map under the current predictions version"""
+    return f"predictions-map:{get_supabase_client().predictions_version()}:{season}:{week}"
+
+
+def completed_week_key(year, week):
+    """Response cache key of a completed week's scoreboard under the current predictions version"""
+    return f"scoreboard-week:{get_supabase_client().predictions_version()}:{year}:{week}"
+
+
+def get_predictions_map(season, week):
+    """
+    Get a week's "home_team|away_team" -> prediction map, cached per (season, week)
+
+    Args:
+        season (int): Season year
+        week (int): Week number
+    Returns:
+        dict: Predictions map, empty (and not cached) if Supabase is unavailable
+    """
+    cache = get_response_cache()
+    predictions_map = cache.get(predictions_map_key(season, week))
+    if predictions_map is not None:
+        return predictions_map
+
+    try:
+        supabase = get_supabase_client()
+        if not supabase.is_connected:
+            return {}
+        predictions = supabase.get_predictions_by_week(season, week, columns=SCOREBOARD_PREDICTION_COLUMNS)
+    except Exception as e:
+        logger.warning("Could not fetch predictions: %s", e)
+        return {}
+    if predictions is None:
+        # The query failed, retry on the next request instead of caching an empty map
+        return {}
+
+    logger.debug("Found %d predictions in database for week %s, year %s", len(predictions), week, season)
+    predictions_map = build_predictions_map(predictions)
+    cache.set(predictions_map_key(season, week), predictions_map, PREDICTIONS_MAP_TTL)
+    return predictions_map
+
+
+def build_scoreboard(raw_data: dict, predictions_map: dict, week, year):
+    """
+    Build the scoreboard response for a week from raw NCAA data and predictions
+
+    Args:
+        raw_data: Raw game data from NCAA API
+        predictions_map: Prediction join index from build_predictions_map
+        week (int): Week number
+        year (int): Season year
+    """
+    return {
+        'week': week,
+        'year': year,
+        'updatedAt': raw_data.get('updated_at'),
+        'games': process_games(raw_data, predictions_map),
+        'totalGames': len(raw_data.get('games', [])),
+        'hasPredictions': len(predictions_map) > 0
+    }
+
+
+def scoreboard_ttl(scoreboard: dict):
+    """
+    How long a built scoreboard stays fresh, from the state of its games
+
+    Args:
+        scoreboard: Scoreboard from build_scoreboard
+    Returns:
+        int: SCOREBOARD_LIVE_TTL while a game is live, SCOREBOARD_FINAL_TTL once
+        every game is final, the default scoreboard TTL otherwise
+    """
+    states = [game['game_state'] for game in scoreboard.get('games', [])]
+    if any(state['isLive'] for state in states):
+        return SCOREBOARD_LIVE_TTL
+    if states and all(state['isFinished'] for state in states):
+        return SCOREBOARD_FINAL_TTL
+    return NCAA_CACHE_TTLS['scoreboard']
+
+
 def get_scoreboard_data(week, year = date.today().year):
     """
     Args:
@@ -91,44 +231,154 @@ def get_scoreboard_data(week, year = date.today().year):
         Includes predictions from Supabase if available
     """ 
     try:
-        # Fetch scoreboard data from NCAA API
-        raw_response = requests.get(f"{NCAA_API_BASE_URL}/scoreboard/football/fbs/{year}/{week:02d}/all-conf", timeout=10)
-        raw_response.raise_for_status()
-        raw_data = raw_response.json()
-        
-        # Fetch predictions from Supabase
-        predictions_map = {}
-        try:
-            supabase = get_supabase_client()
-            if supabase.is_connected:
-                predictions = supabase.get_predictions_by_week(year, week)
-                print(f"Debug: Found {len(predictions)} predictions in database for week {week}, year {year}")
-                
-                # Create a map for quick lookup: "home_team|away_team" -> prediction
-                for pred in predictions:
-                    key = f"{pred.get('home_team')}|{pred.get('away_team')}"
-                    predictions_map[key] = pred
-                    print(f"Debug: Added prediction key: {key}")
-        except Exception as e:
-            print(f"Warning: Could not fetch predictions: {e}")
-            # Continue without predictions
+        # The NCAA scoreboard and the Supabase predictions are independent,
+        # so fetch the scoreboard on a worker while predictions load here
+        raw_future = _week_executor.submit(get_ncaa_client().get_json, scoreboard_path(week, year))
+        predictions_map = get_predictions_map(year, week)
+        raw_data = raw_future.result()
         
         # Process games with predictions
-        processed_games = process_games(raw_data, predictions_map)
+        return build_scoreboard(raw_data, predictions_map, week, year)
 
-        game_data = {
-            'week': week,
-            'year': year,
-            'updatedAt': raw_data.get('updated_at'),
-            'games': processed_games,
-            'totalGames': len(raw_data.get('games', [])),
-            'hasPredictions': len(predictions_map) > 0
-        }
+    except requests.exceptions.HTTPError as e:
+        logger.error("HTTP error occurred: %s", e)
+    except requests.exceptions.RequestException as e:
+        logger.error("Request error occurred: %s", e)
+    return None
 
-        return game_data
 
-    except requests.exceptions.HTTPError as e:
-        print(f"HTTP error occurred: {e}")
+def parse_week_range(text):
+    """
+    Parse a weeks query parameter such as "1-15", "3" or "1,4,7-9"
+
+    Args:
+        text (str): Comma-separated weeks and inclusive week ranges
+
+    Returns:
+        list: Sorted, de-duplicated week numbers
+
+    Raises:
+        ValueError: If the text is malformed or covers too many weeks
+    """
+    weeks = set()
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                start, end = (int(bound) for bound in part.split('-', 1))
+            else:
+                start = end = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid week range '{part}'")
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid week range '{part}'")
+        weeks.update(range(start, end + 1))
+        if len(weeks) > SCOREBOARD_SEASON_MAX_WEEKS:
+            raise ValueError(f"At most {SCOREBOARD_SEASON_MAX_WEEKS} weeks can be requested at once")
+
+    if not weeks:
+        raise ValueError("No weeks requested")
+    return sorted(weeks)
+
+
+def is_week_complete(raw_data: dict):
+    """Check whether every game of a week's raw scoreboard is final"""
+    games = raw_data.get('games', [])
+    return bool(games) and all(
+        game_wrapper.get('game', {}).get('gameState') == 'final' for game_wrapper in games
+    )
+
+
+def fetch_scoreboard_week(week, year):
+    """
+    Fetch one week's raw scoreboard from the NCAA API
+
+    Returns:
+        dict or None: Raw scoreboard (shared with the response cache, do not mutate),
+        or None if error occurred
+    """
+    try:
+        return get_ncaa_client().get_json(scoreboard_path(week, year))
     except requests.exceptions.RequestException as e:
-        print(f"Request error occurred: {e}")
-    return None
\ No newline at end of file
+        logger.error("Error fetching scoreboard for week %s, year %s: %s", week, year, e)
+        return None
+
+
+def get_season_scoreboard(year, weeks):
+    """
+    Fetch the scoreboards of several weeks in one call
+
+    Completed weeks are served from the cache. The remaining weeks are fetched
+    from the NCAA API concurrently while predictions that are not cached are
+    loaded with one Supabase range query; weeks whose games are all final are then cached for
+    SCOREBOARD_COMPLETED_WEEK_TTL.
+
+    Args:
+        year (int): Season year
+        weeks (list): Week numbers, e.g. from parse_week_range
+    Returns:
+        dict or None: {'year', 'weeks': per-week scoreboards, 'failedWeeks', 'totalGames'},
+        or None if no week could be loaded
+    """
+    cache = get_response_cache()
+    sections = {}
+    for week in weeks:
+        section = cache.get(completed_week_key(year, week))
+        if section is not None:
+            sections[week] = section
+
+    missing = [week for week in weeks if week not in sections]
+    if missing:
+        futures = {week: _week_executor.submit(fetch_scoreboard_week, week, year) for week in missing}
+
+        predictions_maps = {}
+        uncached = []
+        for week in missing:
+            predictions_map = cache.get(predictions_map_key(year, week))
+            if predictions_map is None:
+                uncached.append(week)
+            else:
+                predictions_maps[week] = predictions_map
+
+        if uncached:
+            try:
+                supabase = get_supabase_client()
+                predictions = None
+                if supabase.is_connected:
+                    predictions = supabase.get_predictions_by_week_range(
+                        year, min(uncached), max(uncached), columns=SCOREBOARD_PREDICTION_COLUMNS
+                    )
+                # None means the query failed, leave those weeks without a map so nothing is cached
+                if predictions is not None:
+                    predictions_by_week = {week: [] for week in uncached}
+                    for pred in predictions:
+                        if pred.get('week') in predictions_by_week:
+                            predictions_by_week[pred.get('week')].append(pred)
+                    for week, week_predictions in predictions_by_week.items():
+                        predictions_maps[week] = build_predictions_map(week_predictions)
+                        cache.set(predictions_map_key(year, week), predictions_maps[week], PREDICTIONS_MAP_TTL)
+            except Exception as e:
+                logger.warning("Could not fetch predictions: %s", e)
+
+        for week, future in futures.items():
+            raw_data = future.result()
+            if raw_data is None:
+                continue
+            section = build_scoreboard(raw_data, predictions_maps.get(week, {}), week, year)
+            # Only keep a completed week for good once its predictions were actually loaded
+            if is_week_complete(raw_data) and week in predictions_maps:
+                cache.set(completed_week_key(year, week), section, SCOREBOARD_COMPLETED_WEEK_TTL)
+            sections[week] = section
+
+    if not sections:
+        return None
+
+    loaded = [sections[week] for week in weeks if week in sections]
+    return {
+        'year': year,
+        'weeks': loaded,
+        'failedWeeks': [week for week in weeks if week not in sections],
+        'totalGames': sum(section['totalGames'] for section in loaded)
+    }
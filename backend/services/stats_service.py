@@ -3,19 +3,328 @@ Stats service for fetching NCAA football statistics data
 """
 
 import requests
-from api_vars import NCAA_API_BASE_URL, STAT_CATEGORIES
+from concurrent.futures import ThreadPoolExecutor
+from api_vars import STAT_CATEGORIES, STATS_PAGE_WORKERS, STATS_CATEGORY_WORKERS, NCAA_CACHE_TTLS
+from utils.cache import get_response_cache
+from utils.http_client import get_ncaa_client
+from services.team_service import normalize_team_name, get_conference_teams
+
+# Shared worker pool for fetching the remaining pages of a stat category
+_page_executor = ThreadPoolExecutor(max_workers=STATS_PAGE_WORKERS, thread_name_prefix='stats-page')
+
+# Separate pool for whole categories so category jobs never wait on their own page jobs
+_category_executor = ThreadPoolExecutor(max_workers=STATS_CATEGORY_WORKERS, thread_name_prefix='stats-category')
 
 def get_stat_category_name(stat_id):
     """Get the human-readable name for a stat category ID"""
     return STAT_CATEGORIES.get(stat_id, f"Unknown Stat (ID: {stat_id})")
 
 
+def stats_page_path(stat_id, page):
+    """Build the NCAA API path for one page of a stat category"""
+    if page == 1:
+        return f"/stats/football/fbs/current/team/{stat_id}"
+    return f"/stats/football/fbs/current/team/{stat_id}/p{page}"
+
+
+def combine_stats_pages(first_page, later_pages):
+    """
+    Combine stat category pages into a single response
+
+    Args:
+        first_page (dict): Page 1 data, whose metadata is kept
+        later_pages (list): Pages 2..N in order, None for pages that failed
+
+    Returns:
+        dict or None: First page metadata with all rows up to the first failed
+        or empty page, or None if the first page has no data
+    """
+    # Check if the first page has data
+    if first_page is None or not first_page.get('data'):
+        return None
+
+    all_data = list(first_page['data'])
+    for page_data in later_pages:
+        if page_data is None or not page_data.get('data'):
+            break
+        all_data.extend(page_data['data'])
+
+    # Return the first page's metadata with combined data
+    metadata = dict(first_page)
+    metadata['data'] = all_data
+    metadata['total_records'] = len(all_data)
+    return metadata
+
+
+def build_team_index(stats_data):
+    """Build a normalized team name -> stats row index from a combined stat category"""
+    return {
+        normalize_team_name(team['Team']): team
+        for team in stats_data['data']
+        if isinstance(team, dict) and 'Team' in team
+    }
+
+
+def build_team_profile(team_name, indexes):
+    """
+    Build a team profile from stat category indexes
+
+    Args:
+        team_name (str): The team name to search for
+        indexes (dict): Stat category ID -> team index, or None if the category failed
+
+    Returns:
+        dict or None: Profile with one entry per category the team appears in,
+        or None if every category failed to load
+    """
+    normalized_name = normalize_team_name(team_name)
+
+    categories = {}
+    failed_categories = []
+    for stat_id, index in indexes.items():
+        if index is None:
+            failed_categories.append(stat_id)
+            continue
+
+        team = index.get(normalized_name)
+        if team is not None:
+            categories[str(stat_id)] = {
+                'stat_name': get_stat_category_name(stat_id),
+                'data': team
+            }
+
+    if indexes and len(failed_categories) == len(indexes):
+        return None
+
+    return {
+        'team_name': team_name,
+        'categories': categories,
+        'failed_categories': failed_categories
+    }
+
+
+def parse_stat_value(value):
+    """
+    Convert an NCAA stat cell to a number for sorting
+
+    Handles thousands separators, percentages and mm:ss times
+    (time of possession, converted to seconds).
+
+    Args:
+        value: Raw cell value, usually a string
+
+    Returns:
+        float or None: Numeric value, or None if the cell is not numeric
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    text = str(value or '').strip().replace(',', '').rstrip('%')
+    if not text:
+        return None
+
+    try:
+        if ':' in text:
+            minutes, seconds = text.split(':', 1)
+            return int(minutes) * 60 + float(seconds)
+        return float(text)
+    except ValueError:
+        return None
+
+
+def build_stats_table(stats_data):
+    """
+    Precompute sort orders for every numeric column of a stat category
+
+    Args:
+        stats_data (dict): Combined stat category from get_all_teams_stats
+
+    Returns:
+        dict: {'meta': category metadata without rows, 'rows': team rows,
+        'teams': normalized team name per row, 'orders': column -> {'asc', 'desc'}
+        row positions, with rows missing the value last in both}
+    """
+    rows = [row for row in stats_data['data'] if isinstance(row, dict)]
+    meta = {key: value for key, value in stats_data.items() if key != 'data'}
+
+    columns = []
+    for row in rows:
+        for column in row:
+            if column not in columns:
+                columns.append(column)
+
+    orders = {}
+    for column in columns:
+        values = [parse_stat_value(row.get(column)) for row in rows]
+        present = [i for i, value in enumerate(values) if value is not None]
+        # Only columns where every filled-in cell is numeric are sortable
+        filled = [i for i, row in enumerate(rows) if str(row.get(column, '')).strip()]
+        if not present or len(present) != len(filled):
+            continue
+
+        missing = [i for i, value in enumerate(values) if value is None]
+        orders[column] = {
+            'asc': sorted(present, key=lambda i: (values[i], i)) + missing,
+            'desc': sorted(present, key=lambda i: (-values[i], i)) + missing,
+        }
+
+    return {
+        'meta': meta,
+        'rows': rows,
+        'teams': [normalize_team_name(row.get('Team', '')) for row in rows],
+        'orders': orders,
+    }
+
+
+def parse_stats_query(args):
+    """
+    Parse the sort, filter and pagination query parameters of a stat category route
+
+    Args:
+        args: Mapping of query parameter name -> value, e.g. request.args
+
+    Returns:
+        dict or None: Keyword arguments for query_stats_table, or None if no
+        query parameters were given
+
+    Raises:
+        ValueError: If a parameter is invalid
+    """
+    names = ('sort', 'order', 'limit', 'offset', 'conference', 'fields')
+    if not any(args.get(name) for name in names):
+        return None
+
+    order = (args.get('order') or 'desc').lower()
+    if order not in ('asc', 'desc'):
+        raise ValueError("order must be 'asc' or 'desc'")
+
+    try:
+        limit = int(args['limit']) if args.get('limit') else None
+        offset = int(args['offset']) if args.get('offset') else 0
+    except ValueError:
+        raise ValueError("limit and offset must be integers")
+    if (limit is not None and limit < 1) or offset < 0:
+        raise ValueError("limit must be positive and offset must not be negative")
+
+    fields = None
+    if args.get('fields'):
+        fields = [field.strip() for field in args['fields'].split(',') if field.strip()]
+
+    return {
+        'sort': args.get('sort') or None,
+        'order': order,
+        'limit': limit,
+        'offset': offset,
+        'conference': args.get('conference') or None,
+        'fields': fields,
+    }
+
+
+def query_stats_table(table, sort=None, order='desc', limit=None, offset=0, teams=None, fields=None):
+    """
+    Sort, filter, paginate and project a stats table
+
+    Args:
+        table (dict): Table from build_stats_table (shared with the cache, not mutated)
+        sort (str, optional): Numeric column to sort by, defaults to the upstream order
+        order (str): 'asc' or 'desc'
+        limit (int, optional): Maximum number of rows to return
+        offset (int): Number of matching rows to skip
+        teams (set, optional): Normalized team names to keep
+        fields (list, optional): Columns to include in each row
+
+    Returns:
+        dict: Category metadata with the selected rows in 'data' and the number
+        of matching rows in 'total_records'
+
+    Raises:
+        ValueError: If sort is not a numeric column of the table
+    """
+    if sort is None:
+        positions = range(len(table['rows']))
+    elif sort in table['orders']:
+        positions = table['orders'][sort][order]
+    else:
+        raise ValueError(f"Cannot sort by '{sort}', sortable columns: {sorted(table['orders'])}")
+
+    if teams is not None:
+        positions = [i for i in positions if table['teams'][i] in teams]
+
+    end = None if limit is None else offset + limit
+    selected = [table['rows'][i] for i in positions[offset:end]]
+    if fields is not None:
+        selected = [{field: row[field] for field in fields if field in row} for row in selected]
+
+    result = dict(table['meta'])
+    result['data'] = selected
+    result['total_records'] = len(positions)
+    result['offset'] = offset
+    result['limit'] = limit
+    return result
+
+
+def fetch_stats_page(stat_id, page):
+    """
+    Fetch a single page of a stat category from the NCAA API
+
+    Args:
+        stat_id (int): The stat category ID
+        page (int): Page number, starting at 1
+
+    Returns:
+        tuple: (page data shared with the response cache, do not mutate, or None
+        if the API returned an error status; seconds until the page expires,
+        0 if it was served stale)
+    """
+    try:
+        return get_ncaa_client().get_json_with_ttl(stats_page_path(stat_id, page))
+    except requests.exceptions.HTTPError as e:
+        print(f"API returned an error for page {page}: {e}")
+        return None, 0
+
+
+def fetch_all_teams_stats(stat_id):
+    """
+    Fetch all pages of a stat category together with how long the result stays fresh
+
+    The first page tells us how many pages there are, the remaining pages are
+    fetched concurrently and everything is combined into a single response.
+
+    Args:
+        stat_id (int): The stat category ID
+
+    Returns:
+        tuple: (combined statistics data or None if error occurred; seconds until
+        the first page expires, 0 if any page was served stale or failed)
+    """
+    try:
+        first_page, ttl = fetch_stats_page(stat_id, 1)
+        if first_page is None or not first_page.get('data'):
+            return None, 0
+
+        total_pages = first_page.get('pages', 1)
+        futures = [_page_executor.submit(fetch_stats_page, stat_id, page) for page in range(2, total_pages + 1)]
+        later_pages = [future.result() for future in futures]
+
+        ttl = min([ttl] + [page_ttl for _, page_ttl in later_pages])
+        return combine_stats_pages(first_page, [page for page, _ in later_pages]), ttl
+
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching all teams stats for stat ID {stat_id}: {e}")
+        return None, 0
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+        return None, 0
+
+
 def get_all_teams_stats(stat_id):
     """
     Fetch statistics for all teams across all pages for a specific stat category
     
-    This function demonstrates how to handle pagination with the NCAA API.
-    It fetches all pages of data and combines them into a single response.
+    This function demonstrates how to handle pagination with the NCAA API,
+    see fetch_all_teams_stats.
     
     Args:
         stat_id (int): The stat category ID
@@ -23,61 +332,42 @@ def get_all_teams_stats(stat_id):
     Returns:
         dict or None: Combined statistics data from all pages, or None if error occurred
     """
-    try:
-        all_data = []
-        page = 1
-        
-        while True:
-            # Build URL with page parameter
-            if page == 1:
-                url = f"{NCAA_API_BASE_URL}/stats/football/fbs/current/team/{stat_id}"
-            else:
-                url = f"{NCAA_API_BASE_URL}/stats/football/fbs/current/team/{stat_id}/p{page}"
-            
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                page_data = response.json()
-                
-                # Check if this page has data
-                if 'data' in page_data and page_data['data']:
-                    all_data.extend(page_data['data'])
-                    
-                    # Check if there are more pages
-                    total_pages = page_data.get('pages', 1)
-                    if page >= total_pages:
-                        break
-                    
-                    page += 1
-                else:
-                    # No more data, break the loop
-                    break
-            else:
-                print(f"API returned status code: {response.status_code} for page {page}")
-                break
-        
-        if all_data:
-            # Return the first page's metadata with combined data
-            first_page_response = requests.get(f"{NCAA_API_BASE_URL}/stats/football/fbs/current/team/{stat_id}")
-            if first_page_response.status_code == 200:
-                metadata = first_page_response.json()
-                metadata['data'] = all_data
-                metadata['total_records'] = len(all_data)
-                return metadata
-        
-        return None
-        
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching all teams stats for stat ID {stat_id}: {e}")
-        return None
-    except Exception as e:
-        print(f"Unexpected error: {e}")
+    return fetch_all_teams_stats(stat_id)[0]
+
+
+def get_team_index(stat_id):
+    """
+    Get an index of team name to stats row for a stat category
+
+    The index is built from one full category fetch and cached for the
+    category's TTL, so team lookups are dictionary hits after warm-up.
+
+    Args:
+        stat_id (int): The stat category ID
+
+    Returns:
+        dict or None: Normalized team name -> team statistics row, or None if error occurred
+    """
+    cache = get_response_cache()
+    cache_key = f"stats-index:{stat_id}"
+
+    index = cache.get(cache_key)
+    if index is not None:
+        return index
+
+    stats_data, ttl = fetch_all_teams_stats(stat_id)
+    if stats_data is None:
         return None
 
+    index = build_team_index(stats_data)
+    # Never outlive the pages it was built from, nor cache it at all from stale pages
+    cache.set(cache_key, index, min(NCAA_CACHE_TTLS['stats'], ttl))
+    return index
+
 
 def get_team_stats(stat_id, team_name):
     """
-    Fetch statistics for a specific team by searching through all pages
+    Fetch statistics for a specific team from the stat category's team index
     
     Args:
         stat_id (int): The stat category ID
@@ -86,51 +376,97 @@ def get_team_stats(stat_id, team_name):
     Returns:
         dict or None: Team statistics data if found, or None if not found or error occurred
     """
+    index = get_team_index(stat_id)
+    if index is None:
+        print(f"Error fetching stats for team name {team_name} for stat ID {stat_id}")
+        return None
 
-    try:
-        page = 1
-        
-        while True:
-            # Build URL with page parameter
-            if page == 1:
-                url = f"{NCAA_API_BASE_URL}/stats/football/fbs/current/team/{stat_id}"
-            else:
-                url = f"{NCAA_API_BASE_URL}/stats/football/fbs/current/team/{stat_id}/p{page}"
-            
-            response = requests.get(url, timeout=10)
-
-            if response.status_code == 200:
-                page_data = response.json()
-                # Check if this page has data
-                if 'data' in page_data and page_data['data']:
-                    # Check if team_name is in page_data
-                    for team in page_data['data']:
-                        if team['Team'].lower() == team_name.lower():
-                           return team
-                    
-                    # Check if there are more pages
-                    total_pages = page_data.get('pages', 1)
-                    if page >= total_pages:
-                        break
-                    
-                    page += 1
-                else:
-                    # No more data, break the loop
-                    break
-            else:
-                print(f"API returned status code: {response.status_code} for page {page}")
-                break
-    
+    team = index.get(normalize_team_name(team_name))
+    if team is None:
         print(f"Team '{team_name}' not found for stat ID {stat_id}")
-        return None
+    return team
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching stats for team name {team_name} for stat ID {stat_id}: {e}")
+
+def get_team_profile(team_name, stat_ids=None):
+    """
+    Fetch a team's statistics across many stat categories in one call
+
+    Categories are loaded concurrently (or read from cache) through their
+    team indexes.
+
+    Args:
+        team_name (str): The team name to search for
+        stat_ids (list, optional): Stat category IDs to include, defaults to all STAT_CATEGORIES
+
+    Returns:
+        dict or None: Profile with one entry per category the team appears in,
+        or None if every category failed to load
+    """
+    if stat_ids is None:
+        stat_ids = list(STAT_CATEGORIES)
+
+    futures = {stat_id: _category_executor.submit(get_team_index, stat_id) for stat_id in stat_ids}
+    return build_team_profile(team_name, {stat_id: future.result() for stat_id, future in futures.items()})
+
+
+def get_stats_table(stat_id):
+    """
+    Get the cached stats table (rows plus precomputed sort orders) for a stat category
+
+    Args:
+        stat_id (int): The stat category ID
+
+    Returns:
+        dict or None: Table from build_stats_table, or None if error occurred
+    """
+    cache = get_response_cache()
+    cache_key = f"stats-table:{stat_id}"
+
+    table = cache.get(cache_key)
+    if table is not None:
+        return table
+
+    stats_data, ttl = fetch_all_teams_stats(stat_id)
+    if stats_data is None:
         return None
-    except Exception as e:
-        print(f"Unexpected error: {e}")
+
+    table = build_stats_table(stats_data)
+    cache.set(cache_key, table, min(NCAA_CACHE_TTLS['stats'], ttl))
+    return table
+
+
+def stats_table_ttl(stat_id):
+    """Seconds until a stat category's cached stats table expires, 0 if it is not cached"""
+    return get_response_cache().ttl(f"stats-table:{stat_id}")
+
+
+def query_stats_category(stat_id, sort=None, order='desc', limit=None, offset=0, conference=None, fields=None):
+    """
+    Fetch a sorted, filtered and paginated view of a stat category
+
+    Args:
+        stat_id (int): The stat category ID
+        sort, order, limit, offset, fields: See query_stats_table
+        conference (str, optional): Only include teams in this conference
+
+    Returns:
+        dict or None: Selected statistics data, or None if error occurred
+
+    Raises:
+        ValueError: If sort is not a numeric column of the category
+    """
+    table = get_stats_table(stat_id)
+    if table is None:
         return None
 
+    teams = None
+    if conference:
+        teams = get_conference_teams(conference)
+        if teams is None:
+            return None
+
+    return query_stats_table(table, sort, order, limit, offset, teams, fields)
+
 
 # All team stats
 
@@ -0,0 +1,276 @@
+"""
+Columnar stats warehouse
+Loads every stat category into one pandas table with a row per team and a
+float column per metric ("<stat_id>:<column>", e.g. "21:YPG"), so questions
+across categories are answered with vectorized rank, percentile and z-score
+operations instead of per-category fetches and Python joins. Categories are
+refreshed independently as they go stale.
+"""
+
+import importlib.util
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+from api_vars import STAT_CATEGORIES, STATS_CATEGORY_WORKERS, NCAA_CACHE_TTLS
+from services.stats_service import get_stats_table, stats_table_ttl, parse_stat_value
+
+# pandas takes a few hundred milliseconds to import, so only check that it is
+# installed here and import it on the first load
+PANDAS_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in ('numpy', 'pandas'))
+
+# Upstream position column, already implied by every metric
+_SKIPPED_COLUMNS = ('Rank',)
+
+QUERY_METHODS = ('rank', 'percentile', 'zscore')
+
+
+def parse_metric(metric: str) -> tuple:
+    """
+    Parse a metric reference such as "21:YPG" or "-22:YPG"
+
+    A leading '-' marks metrics where lower values are better (e.g. yards allowed).
+
+    Args:
+        metric: Metric reference
+
+    Returns:
+        Tuple of (column name, higher_is_better)
+
+    Raises:
+        ValueError: If the reference is malformed or names an unknown stat category
+    """
+    metric = metric.strip()
+    higher_is_better = not metric.startswith('-')
+    column = metric.lstrip('-')
+
+    stat_id, _, name = column.partition(':')
+    if not name or not stat_id.isdigit() or int(stat_id) not in STAT_CATEGORIES:
+        raise ValueError(f"Invalid metric '{metric}', expected '<stat_id>:<column>' such as '21:YPG'")
+    return column, higher_is_better
+
+
+def build_category_frame(stat_id: int, table: dict):
+    """
+    Convert a stats table into a typed frame for one category
+
+    Args:
+        stat_id: The stat category ID
+        table: Table from stats_service.build_stats_table
+
+    Returns:
+        DataFrame indexed by normalized team name with a float column per numeric metric
+        and a 'team' column with the display name
+    """
+    import numpy as np
+    import pandas as pd
+
+    columns = {'team': [row.get('Team') for row in table['rows']]}
+    for column in table['orders']:
+        if column in _SKIPPED_COLUMNS:
+            continue
+        columns[f"{stat_id}:{column}"] = np.array(
+            [parse_stat_value(row.get(column)) for row in table['rows']], dtype=np.float64
+        )
+
+    frame = pd.DataFrame(columns, index=pd.Index(table['teams'], name='team_id'))
+    return frame[~frame.index.duplicated(keep='first')]
+
+
+class StatsWarehouse:
+    """All stat categories in one columnar table, refreshed per category"""
+
+    def __init__(self, max_age: float = NCAA_CACHE_TTLS['stats'], workers: int = STATS_CATEGORY_WORKERS):
+        """
+        Initialize an empty warehouse
+
+        Args:
+            max_age: Longest a category is kept before it is reloaded, shorter
+                when its cached stats table expires sooner
+            workers: Maximum concurrent category loads
+        """
+        self.max_age = max_age
+        self.workers = workers
+        self._frame = None
+        self._expires_at: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def frame(self):
+        """Current table (replaced, never mutated, on refresh), or None before the first load"""
+        return self._frame
+
+    def stale_categories(self, stat_ids: Iterable[int] = None) -> List[int]:
+        """Categories never loaded or past the expiry of the stats table they were loaded from"""
+        now = time.monotonic()
+        return [
+            stat_id for stat_id in (stat_ids or STAT_CATEGORIES)
+            if now >= self._expires_at.get(stat_id, float('-inf'))
+        ]
+
+    def refresh(self, stat_ids: Iterable[int] = None, force: bool = False) -> List[int]:
+        """
+        Reload stale categories and swap their columns into the table
+
+        Categories come from the cached stats tables, so a refresh only goes
+        upstream for categories whose response cache entry has expired.
+
+        Args:
+            stat_ids: Categories to consider, defaults to all STAT_CATEGORIES
+            force: Reload even if the categories are still fresh
+
+        Returns:
+            Category IDs that failed to load
+        """
+        if not PANDAS_AVAILABLE:
+            return list(stat_ids or STAT_CATEGORIES)
+
+        with self._lock:
+            pending = list(stat_ids or STAT_CATEGORIES) if force else self.stale_categories(stat_ids)
+            if not pending:
+                return []
+
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='stats-warehouse') as executor:
+                tables = dict(zip(pending, executor.map(get_stats_table, pending)))
+
+            frame = self._frame
+            failed = []
+            for stat_id, table in tables.items():
+                if table is None:
+                    failed.append(stat_id)
+                    continue
+                frame = self._replace_category(frame, stat_id, build_category_frame(stat_id, table))
+                # A table built from stale pages is not cached, so it is reloaded on the next query
+                self._expires_at[stat_id] = time.monotonic() + min(self.max_age, stats_table_ttl(stat_id))
+
+            self._frame = frame
+            return failed
+
+    @staticmethod
+    def _replace_category(frame, stat_id: int, category):
+        """Return a new table with a category's columns replaced"""
+        if frame is None:
+            return category
+
+        prefix = f"{stat_id}:"
+        frame = frame.drop(columns=[column for column in frame.columns if column.startswith(prefix)])
+        names = frame['team'].combine_first(category['team']) if len(frame) else category['team']
+        frame = frame.drop(columns='team').join(category.drop(columns='team'), how='outer')
+        frame.insert(0, 'team', names.reindex(frame.index).fillna(category['team']))
+        return frame
+
+    def metrics(self) -> List[str]:
+        """Metric columns currently loaded"""
+        if self._frame is None:
+            return []
+        return [column for column in self._frame.columns if column != 'team']
+
+    def query(self, metrics: List[str], method: str = 'rank', limit: int = None) -> List[Dict[str, Any]]:
+        """
+        Score every team on several metrics at once
+
+        'rank' ranks each metric (1 = best) and orders teams by mean rank,
+        'percentile' uses percentile ranks (1.0 = best) and 'zscore' uses
+        standard scores with the sign flipped for lower-is-better metrics,
+        both ordered by their mean. Teams missing a metric are scored on the
+        metrics they have.
+
+        Args:
+            metrics: Metric references, see parse_metric
+            method: 'rank', 'percentile' or 'zscore'
+            limit: Maximum number of teams to return
+
+        Returns:
+            List of {'team', 'score', 'values', '<method>'} dicts, best first,
+            or None if a category a missing metric belongs to failed to load
+
+        Raises:
+            ValueError: If a metric or the method is invalid, or names an unknown column
+        """
+        if method not in QUERY_METHODS:
+            raise ValueError(f"method must be one of {list(QUERY_METHODS)}")
+        parsed = [parse_metric(metric) for metric in metrics]
+        if not parsed:
+            raise ValueError("At least one metric is required")
+
+        failed = self.refresh({int(column.split(':', 1)[0]) for column, _ in parsed})
+        frame = self._frame
+        missing = [column for column, _ in parsed if frame is None or column not in frame.columns]
+        if missing:
+            # An upstream failure is not the caller's fault, only report unknown columns as invalid
+            if any(int(column.split(':', 1)[0]) in failed for column in missing):
+                return None
+            raise ValueError(f"Metrics not available: {missing}")
+
+        import numpy as np
+        import pandas as pd
+
+        columns = [column for column, _ in parsed]
+        values = frame[columns]
+        higher = np.array([higher_is_better for _, higher_is_better in parsed])
+
+        if method == 'rank':
+            scores = pd.DataFrame({
+                column: values[column].rank(ascending=not better, method='min')
+                for column, better in parsed
+            })
+            composite = scores.mean(axis=1)
+            order = composite.sort_values(ascending=True, na_position='last', kind='stable')
+        elif method == 'percentile':
+            scores = pd.DataFrame({
+                column: values[column].rank(ascending=better, pct=True)
+                for column, better in parsed
+            })
+            composite = scores.mean(axis=1)
+            order = composite.sort_values(ascending=False, na_position='last', kind='stable')
+        else:
+            std = values.std(ddof=0).replace(0, np.nan)
+            scores = (values - values.mean()) / std * np.where(higher, 1.0, -1.0)
+            composite = scores.mean(axis=1)
+            order = composite.sort_values(ascending=False, na_position='last', kind='stable')
+
+        order = order.dropna()
+        if limit is not None:
+            order = order.iloc[:limit]
+
+        names = frame['team']
+        return [
+            {
+                'team': names[team_id],
+                'score': round(float(score), 4),
+                'values': _clean(values.loc[team_id]),
+                method: _clean(scores.loc[team_id])
+            }
+            for team_id, score in order.items()
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the warehouse size for /api/status"""
+        frame = self._frame
+        return {
+            'available': PANDAS_AVAILABLE,
+            'categories': len(self._expires_at),
+            'teams': 0 if frame is None else len(frame),
+            'metrics': len(self.metrics()),
+            'bytes': 0 if frame is None else int(frame.memory_usage(deep=True).sum())
+        }
+
+
+def _clean(series) -> Dict[str, Optional[float]]:
+    """Convert a row of floats to JSON-safe values, NaN as None"""
+    return {column: None if math.isnan(value) else round(float(value), 4) for column, value in series.items()}
+
+
+# Global stats warehouse instance
+stats_warehouse = StatsWarehouse()
+
+
+def get_stats_warehouse() -> StatsWarehouse:
+    """
+    Get the global stats warehouse instance
+
+    Returns:
+        StatsWarehouse instance
+    """
+    return stats_warehouse
@@ -0,0 +1,248 @@
+"""
+Team identity table
+Maps every team name variant seen in NCAA scoreboards (short, full, seo and
+char6 names) and in CFBD-sourced predictions to one canonical team id, so
+games from the two sources can be joined. Variants learned from scoreboards
+are persisted to a JSON file in the background and reloaded on startup.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from services.team_service import normalize_team_name
+
+# Affixes on NCAA full names that CFBD names never carry
+_FULL_NAME_PREFIXES = ('the ', 'university of ')
+_FULL_NAME_SUFFIXES = (' university', ' college')
+
+
+class TeamIdentity:
+    """Normalized team name variant -> canonical team id table"""
+
+    def __init__(self, path: str = None):
+        """
+        Load the identity table
+
+        Args:
+            path: JSON file path (TEAM_IDENTITY_PATH), learned variants are saved here
+        """
+        if path is None:
+            path = os.environ.get('TEAM_IDENTITY_PATH') or os.path.join(tempfile.gettempdir(), 'ncaa_team_identity.json')
+        self.path = path
+        self._ids: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        # Saves run on one background thread so requests never wait on the file
+        self._save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='team-identity')
+        self._save_future: Optional[Future] = None
+        self.load()
+
+    def load(self) -> None:
+        """Load persisted variants, keeping the table empty if the file is missing or unreadable"""
+        try:
+            with open(self.path) as f:
+                ids = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(ids, dict):
+            with self._lock:
+                self._ids.update(ids)
+
+    def save(self) -> None:
+        """Persist the table if new variants were learned since the last save"""
+        with self._lock:
+            if not self._dirty:
+                return
+            ids = dict(self._ids)
+            self._dirty = False
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(ids, f, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving team identity table: {e}")
+
+    def save_in_background(self) -> None:
+        """Schedule save() on the background thread if new variants were learned and no save is pending"""
+        with self._lock:
+            if not self._dirty or (self._save_future is not None and not self._save_future.done()):
+                return
+            self._save_future = self._save_executor.submit(self.save)
+
+    def flush(self) -> None:
+        """Wait for a scheduled background save to finish"""
+        future = self._save_future
+        if future is not None:
+            future.result()
+
+    @staticmethod
+    def variants(name: str) -> List[str]:
+        """Normalized variants of a name, including the full name without 'The'/'University'"""
+        normalized = normalize_team_name(name)
+        if not normalized:
+            return []
+
+        variants = [normalized]
+        stripped = normalized
+        for prefix in _FULL_NAME_PREFIXES:
+            if stripped.startswith(prefix):
+                stripped = stripped[len(prefix):]
+        for suffix in _FULL_NAME_SUFFIXES:
+            if stripped.endswith(suffix):
+                stripped = stripped[:-len(suffix)]
+        stripped = normalize_team_name(stripped)
+        if stripped and stripped != normalized:
+            variants.append(stripped)
+        return variants
+
+    def register_ncaa_team(self, names: dict) -> Optional[str]:
+        """
+        Record the name variants of a team from an NCAA scoreboard
+
+        The canonical id is the normalized short name (e.g. "ohio state"),
+        which is also what CFBD names normalize to in most cases.
+
+        Args:
+            names: NCAA 'names' object with short, full, seo and char6 keys
+
+        Returns:
+            str or None: Canonical team id, or None if the team has no names
+        """
+        base = names.get('short') or names.get('full')
+        if not base:
+            return None
+
+        with self._lock:
+            canonical = self._ids.get(normalize_team_name(base), normalize_team_name(base))
+            for key in ('short', 'full', 'seo', 'char6'):
+                for variant in self.variants(names.get(key) or ''):
+                    # First writer wins so a later ambiguous char6 never re-points a team
+                    if variant not in self._ids:
+                        self._ids[variant] = canonical
+                        self._dirty = True
+        return canonical
+
+    def canonical(self, name: str) -> str:
+        """
+        Resolve any known team name to its canonical id
+
+        Args:
+            name: Team name from any source
+
+        Returns:
+            str: Canonical team id, the normalized name if the team is unknown
+        """
+        for variant in self.variants(name):
+            team_id = self._ids.get(variant)
+            if team_id is not None:
+                return team_id
+        return normalize_team_name(name)
+
+    def candidates(self, names: dict) -> List[str]:
+        """Canonical id first, then every normalized variant of an NCAA team's names"""
+        candidates = []
+        base = names.get('short') or names.get('full') or ''
+        for name in [base] + [names.get(key) or '' for key in ('full', 'seo')]:
+            for variant in [self.canonical(name)] + self.variants(name):
+                if variant and variant not in candidates:
+                    candidates.append(variant)
+        return candidates
+
+
+def game_date(value) -> Optional[str]:
+    """
+    UTC calendar date of a game, from an epoch (NCAA) or an ISO timestamp (CFBD)
+
+    Returns:
+        str or None: 'YYYY-MM-DD', or None if the value cannot be parsed
+    """
+    if value in (None, ''):
+        return None
+    try:
+        if isinstance(value, (int, float)) or str(value).isdigit():
+            return datetime.fromtimestamp(int(value), tz=timezone.utc).date().isoformat()
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except (ValueError, OverflowError, OSError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.date().isoformat()
+
+
+def build_prediction_index(predictions: list, identity: 'TeamIdentity' = None) -> dict:
+    """
+    Index a week's predictions by canonical (home, away, date) and (home, away)
+
+    Args:
+        predictions: Prediction rows from Supabase (CFBD team names)
+        identity: Team identity table, defaults to the global one
+
+    Returns:
+        dict: "home|away|date" and "home|away" keys -> prediction
+    """
+    identity = identity or get_team_identity()
+    index = {}
+    for pred in predictions:
+        home = identity.canonical(pred.get('home_team'))
+        away = identity.canonical(pred.get('away_team'))
+        date = game_date(pred.get('game_date'))
+        if date:
+            index[f"{home}|{away}|{date}"] = pred
+        index.setdefault(f"{home}|{away}", pred)
+    return index
+
+
+def match_prediction(index: dict, home_names: dict, away_names: dict, epoch=None,
+                     identity: 'TeamIdentity' = None) -> Optional[dict]:
+    """
+    Find the prediction for an NCAA scoreboard game
+
+    Tries the canonical ids first and falls back to the other name variants,
+    on the game date first and then on the team pair alone.
+
+    Args:
+        index: Index from build_prediction_index
+        home_names: NCAA 'names' object of the home team
+        away_names: NCAA 'names' object of the away team
+        epoch: Game start time (NCAA startTimeEpoch)
+        identity: Team identity table, defaults to the global one
+
+    Returns:
+        dict or None: Matching prediction
+    """
+    if not index:
+        return None
+
+    identity = identity or get_team_identity()
+    homes = identity.candidates(home_names)
+    aways = identity.candidates(away_names)
+    date = game_date(epoch)
+
+    suffixes = [f"|{date}", ''] if date else ['']
+    for suffix in suffixes:
+        for home in homes:
+            for away in aways:
+                prediction = index.get(f"{home}|{away}{suffix}")
+                if prediction is not None:
+                    return prediction
+    return None
+
+
+# Global team identity table
+team_identity = TeamIdentity()
+
+
+def get_team_identity() -> TeamIdentity:
+    """
+    Get the global team identity table
+
+    Returns:
+        TeamIdentity instance
+    """
+    return team_identity
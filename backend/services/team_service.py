@@ -2,41 +2,142 @@
 Service file for team-specific data like record, ppg, etc.
 """
 
+import re
+import unicodedata
 import requests
-from api_vars import NCAA_API_BASE_URL
+from api_vars import NCAA_CACHE_TTLS, TEAM_NAME_ALIASES
+from utils.cache import get_response_cache
+from utils.http_client import get_ncaa_client
+
+_PUNCTUATION = re.compile(r"[^a-z0-9 ]+")
+
 
 def normalize_team_name(name):
     """
-    Normalize a team name for comparisons on case the name is not always consistent.
+    Normalize a team name for comparisons in case the name is not always consistent.
 
-    Has to be implemented after frontend methods are implemented.
+    Lower-cases, folds accents ("San José" -> "san jose"), drops punctuation, expands "St." to "State" (or "Saint" at the
+    start of a name) and maps common aliases, so that "Ohio St.", "OHIO STATE"
+    and "ohio state" or "USC" and "Southern California" compare equal.
+
+    Args:
+        name (str): Team name from any source
+
+    Returns:
+        str: Normalized team name
     """
-    raise NotImplementedError
+    # Decompose accented letters and drop the combining marks before punctuation is stripped
+    text = ''.join(
+        char for char in unicodedata.normalize('NFKD', str(name or ''))
+        if not unicodedata.combining(char)
+    )
+    text = text.lower().replace('&', '').replace("'", '').replace('-', ' ')
+    words = _PUNCTUATION.sub(' ', text).split()
 
+    for i, word in enumerate(words):
+        if word == 'st':
+            words[i] = 'saint' if i == 0 and len(words) > 1 else 'state'
 
-def get_team_record(team_name):
+    normalized = ' '.join(words)
+    return TEAM_NAME_ALIASES.get(normalized, normalized)
+
+
+def build_standings_index(raw_data):
     """
-    Fetch team records for a given team from NCAA API
+    Index a raw standings payload by normalized team name
 
     Args:
-        team_name (str): Team name (required)
+        raw_data (dict): Standings response from the NCAA API
+
     Returns:
-        dict or None: Comprehensive team record data or None if not found or error occured
+        dict: {'teams': name -> standings row, 'conferences': name -> conference}
     """
-    try:
-        response = requests.get(f'{NCAA_API_BASE_URL}/standings/football/fbs', timeout=10)
-        response.raise_for_status()
-        raw_data = response.json()
-        for conf_block in raw_data.get('data', []):
-            for row in conf_block.get('standings', []):
-                school = row.get("School", "")
-                if school == team_name:
-                    return row
-        return None
+    teams = {}
+    conferences = {}
+    for conf_block in raw_data.get('data', []):
+        conference = conf_block.get('conference')
+        for row in conf_block.get('standings', []):
+            key = normalize_team_name(row.get('School', ''))
+            if not key:
+                continue
+            teams[key] = row
+            if conference:
+                conferences[key] = conference
+
+    return {'teams': teams, 'conferences': conferences}
 
+
+def get_standings_index():
+    """
+    Get the FBS standings indexed by normalized team name
+
+    The index is built once per standings refresh and cached for the
+    standings TTL, so record lookups are dictionary hits.
+
+    Returns:
+        dict or None: {'teams': name -> standings row, 'conferences': name -> conference},
+        or None if error occurred
+    """
+    cache = get_response_cache()
+    index = cache.get('standings-index')
+    if index is not None:
+        return index
+
+    try:
+        raw_data, ttl = get_ncaa_client().get_json_with_ttl('/standings/football/fbs')
     except requests.exceptions.HTTPError as e:
         print(f"HTTP error occurred: {e}")
         return None
     except requests.exceptions.RequestException as e:
         print(f"Request error occurred: {e}")
-        return None
\ No newline at end of file
+        return None
+
+    index = build_standings_index(raw_data)
+    # Never outlive the standings it was built from, nor cache it at all from a stale response
+    cache.set('standings-index', index, min(NCAA_CACHE_TTLS['standings'], ttl))
+    return index
+
+
+def conference_teams(index, conference):
+    """
+    Collect the normalized names of every team in a conference
+
+    Args:
+        index (dict): Standings index from build_standings_index
+        conference (str): Conference name, compared case-insensitively
+
+    Returns:
+        set: Normalized team names, empty if the conference is unknown
+    """
+    wanted = conference.strip().lower()
+    return {team for team, name in index['conferences'].items() if name.lower() == wanted}
+
+
+def get_conference_teams(conference):
+    """
+    Look up the teams in a conference from the standings index
+
+    Args:
+        conference (str): Conference name, compared case-insensitively
+    Returns:
+        set or None: Normalized team names, or None if error occurred
+    """
+    index = get_standings_index()
+    if index is None:
+        return None
+    return conference_teams(index, conference)
+
+
+def get_team_record(team_name):
+    """
+    Fetch team records for a given team from the cached standings index
+
+    Args:
+        team_name (str): Team name (required)
+    Returns:
+        dict or None: Comprehensive team record data or None if not found or error occured
+    """
+    index = get_standings_index()
+    if index is None:
+        return None
+    return index['teams'].get(normalize_team_name(team_name))
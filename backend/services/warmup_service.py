@@ -0,0 +1,162 @@
+"""
+Cache warm-up service
+Prefetches the current and next week's scoreboards and predictions, the AP
+rankings, the standings and every stat category into the response cache, at
+startup and then on a schedule, so users after a deploy or an expiry do not
+pay the cold upstream cost.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+from api_vars import STAT_CATEGORIES, CACHE_WARMUP_WORKERS, SEASON_LAST_WEEK
+from services.rankings_service import get_ap_rankings
+from services.scoreboard_service import get_current_week, get_scoreboard_data, get_predictions_map
+from services.stats_service import get_stats_table
+from services.team_service import get_standings_index
+
+
+def build_warmup_jobs(today: date = None) -> List[tuple]:
+    """
+    List the prefetch jobs for a warm-up run
+
+    Args:
+        today: Defaults to today
+
+    Returns:
+        List of (name, function, args) tuples
+    """
+    today = today or date.today()
+    week = get_current_week(today)
+    weeks = [week, week + 1] if week < SEASON_LAST_WEEK else [week]
+
+    jobs = []
+    for w in weeks:
+        jobs.append((f"scoreboard:{today.year}:{w}", get_scoreboard_data, (w, today.year)))
+        jobs.append((f"predictions:{today.year}:{w}", get_predictions_map, (today.year, w)))
+    jobs.append(('rankings', get_ap_rankings, ()))
+    jobs.append(('standings', get_standings_index, ()))
+    for stat_id in STAT_CATEGORIES:
+        jobs.append((f"stats:{stat_id}", get_stats_table, (stat_id,)))
+    return jobs
+
+
+class CacheWarmer:
+    """Runs warm-up jobs on a bounded worker pool, once or periodically"""
+
+    def __init__(self, workers: int = CACHE_WARMUP_WORKERS):
+        """
+        Initialize the warmer
+
+        Args:
+            workers: Maximum concurrent prefetch jobs
+        """
+        self.workers = workers
+        self.enabled = False
+        self.interval = 0
+        self.runs = 0
+        self.last_run: Optional[str] = None
+        self.last_duration: Optional[float] = None
+        self.failed_jobs: List[str] = []
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """True once the first warm-up run has finished, or when warm-up is disabled"""
+        return not self.enabled or self._ready.is_set()
+
+    def run_once(self, jobs: List[tuple] = None) -> List[str]:
+        """
+        Run every warm-up job, at most `workers` at a time
+
+        Args:
+            jobs: (name, function, args) tuples, defaults to build_warmup_jobs()
+
+        Returns:
+            Names of the jobs that failed or returned None
+        """
+        if jobs is None:
+            jobs = build_warmup_jobs()
+
+        start = time.monotonic()
+        failed = []
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='cache-warmup') as executor:
+            futures = [(name, executor.submit(fn, *args)) for name, fn, args in jobs]
+            for name, future in futures:
+                try:
+                    if future.result() is None:
+                        failed.append(name)
+                except Exception as e:
+                    print(f"Cache warm-up job {name} failed: {e}")
+                    failed.append(name)
+
+        self.runs += 1
+        self.last_run = datetime.now(timezone.utc).isoformat()
+        self.last_duration = round(time.monotonic() - start, 3)
+        self.failed_jobs = failed
+        self._ready.set()
+        return failed
+
+    def start(self, interval: float = 0) -> None:
+        """
+        Warm the cache in a background thread, then every `interval` seconds
+
+        Calling start again while the warmer is running does nothing.
+
+        Args:
+            interval: Seconds between runs, 0 runs the warm-up once
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self.enabled = True
+            self.interval = interval
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='cache-warmer', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop scheduling further runs"""
+        self._stop.set()
+
+    def _run(self) -> None:
+        """Background loop: warm up now and then on every interval"""
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Cache warm-up run failed: {e}")
+                self._ready.set()
+            if not self.interval or self._stop.wait(self.interval):
+                return
+
+    def status(self) -> Dict[str, Any]:
+        """Get the warm-up state for /api/status"""
+        return {
+            'enabled': self.enabled,
+            'ready': self.ready,
+            'interval': self.interval,
+            'runs': self.runs,
+            'last_run': self.last_run,
+            'last_duration': self.last_duration,
+            'failed_jobs': self.failed_jobs
+        }
+
+
+# Global cache warmer instance
+cache_warmer = CacheWarmer()
+
+
+def get_cache_warmer() -> CacheWarmer:
+    """
+    Get the global cache warmer instance
+
+    Returns:
+        CacheWarmer instance
+    """
+    return cache_warmer
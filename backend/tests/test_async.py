@@ -0,0 +1,186 @@
+"""Test the async service layer and ASGI entry point"""
+
+import asyncio
+import unittest
+from unittest.mock import patch, AsyncMock
+import httpx
+from api_vars import NCAA_API_BASE_URL
+from services import async_service
+from utils.async_http_client import AsyncNCAAClient
+from utils.cache import TTLCache, get_response_cache
+from utils.circuit_breaker import CircuitBreaker
+from utils.rate_limiter import RateLimitedError
+from utils.metrics import render_metrics
+import asgi
+
+
+class TestAsyncServices(unittest.TestCase):
+    """Test cases for the async NCAA client and services"""
+
+    def setUp(self):
+        """Clear the shared response cache"""
+        get_response_cache().clear()
+
+    def _client(self, handler):
+        """Build an async client that answers requests with handler"""
+        return AsyncNCAAClient(cache=TTLCache(max_bytes=1024 * 1024), transport=httpx.MockTransport(handler))
+
+    def test_concurrent_requests_share_one_fetch(self):
+        """Test identical concurrent requests cost one upstream call"""
+        calls = []
+
+        async def handler(request):
+            calls.append(str(request.url))
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={'data': []})
+
+        client = self._client(handler)
+
+        async def run():
+            results = await asyncio.gather(*(client.get_json('/rankings/football/fbs/associated-press') for _ in range(20)))
+            await client.aclose()
+            return results
+
+        results = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'data': []}] * 20)
+
+    @patch('utils.async_http_client.get_ncaa_client')
+    def test_rate_limited_probe_is_released(self, mock_sync_client):
+        """Test a half-open probe rejected by the rate limiter does not wedge the shared circuit"""
+        breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        mock_sync_client.return_value.breaker = breaker
+        mock_sync_client.return_value.rate_limiter.reserve.side_effect = [RateLimitedError('limited'), 0]
+
+        client = self._client(lambda request: httpx.Response(200, json={}))
+
+        async def run():
+            with self.assertRaises(httpx.ConnectError):
+                await client.get('/rankings/x')
+            self.assertEqual(breaker.state, 'half_open')
+            await client.get('/rankings/x')
+            await client.aclose()
+
+        asyncio.run(run())
+        self.assertEqual(breaker.state, 'closed')
+
+    def test_all_teams_stats_fetches_pages_concurrently(self):
+        """Test the async stats service combines pages in order"""
+        base_url = f"{NCAA_API_BASE_URL}/stats/football/fbs/current/team/21"
+        pages = {
+            base_url: {'title': 'Total Offense', 'pages': 3, 'data': [{'Team': 'A'}]},
+            f"{base_url}/p2": {'pages': 3, 'data': [{'Team': 'B'}]},
+            f"{base_url}/p3": {'pages': 3, 'data': [{'Team': 'C'}]},
+        }
+
+        def handler(request):
+            return httpx.Response(200, json=pages[str(request.url)])
+
+        with patch('services.async_service.get_async_ncaa_client', return_value=self._client(handler)):
+            result = asyncio.run(async_service.get_all_teams_stats(21))
+
+        self.assertEqual([team['Team'] for team in result['data']], ['A', 'B', 'C'])
+        self.assertEqual(result['total_records'], 3)
+
+    def test_upstream_error_returns_none(self):
+        """Test upstream failures surface as None like the sync services"""
+        def handler(request):
+            return httpx.Response(503)
+
+        with patch('services.async_service.get_async_ncaa_client', return_value=self._client(handler)):
+            self.assertIsNone(asyncio.run(async_service.get_ap_rankings()))
+
+
+class TestASGIApp(unittest.TestCase):
+    """Test cases for the ASGI entry point"""
+
+    def _get(self, path, headers=None):
+        """Send a GET request to the ASGI app"""
+        async def run():
+            transport = httpx.ASGITransport(app=asgi.app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://testserver') as client:
+                return await client.get(path, headers=headers)
+        return asyncio.run(run())
+
+    @patch('asgi.async_service.get_ap_rankings', new_callable=AsyncMock)
+    def test_async_route(self, mock_rankings):
+        """Test upstream-bound routes are served by the async handlers"""
+        mock_rankings.return_value = {'data': {'data': []}}
+
+        response = self._get('/rankings/ap-top25')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'success': True, 'data': {'data': {'data': []}}, 'data_type': 'AP rankings'})
+        self.assertIn('s-maxage=3600', response.headers['Cache-Control'])
+
+        response = self._get('/rankings/ap-top25', headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    @patch('asgi.async_service.get_scoreboard_data', new_callable=AsyncMock)
+    def test_async_route_uses_flask_hooks(self, mock_scoreboard):
+        """Test async routes get Last-Modified 304s, compression, CORS and route metrics"""
+        mock_scoreboard.return_value = {
+            'week': 6,
+            'updatedAt': '2025-10-30 04:44:57',
+            'games': [{'gameID': str(i), 'game_state': {'isLive': False, 'isFinished': True}} for i in range(100)]
+        }
+
+        response = self._get('/scoreboard/week/6', headers={'Accept-Encoding': 'gzip', 'Origin': 'http://localhost:3000'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.headers['Access-Control-Allow-Origin'], 'http://localhost:3000')
+        self.assertEqual(len(response.json()['data']['games']), 100)
+
+        response = self._get('/scoreboard/week/6', headers={'If-Modified-Since': response.headers['Last-Modified']})
+        self.assertEqual(response.status_code, 304)
+
+        self.assertIn('route="/scoreboard/week/<int:week>",status="304"', render_metrics())
+
+    def test_other_routes_fall_through_to_flask(self):
+        """Test routes without an async handler are served by Flask"""
+        response = self._get('/about')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('name', response.json())
+
+    @patch('routes.scoreboard.SCOREBOARD_STREAM_KEEPALIVE', 0.05)
+    @patch('services.live_scoreboard_service.get_scoreboard_data')
+    def test_open_stream_does_not_block_other_routes(self, mock_scoreboard):
+        """Test a live scoreboard stream holds its own thread instead of the one all Flask routes share"""
+        mock_scoreboard.return_value = {'week': 5, 'updatedAt': None, 'games': []}
+
+        async def run():
+            first_chunk = asyncio.Event()
+            disconnected = False
+
+            async def receive():
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+            async def send(message):
+                if disconnected:
+                    raise OSError('client disconnected')
+                if message.get('body'):
+                    first_chunk.set()
+
+            scope = {
+                'type': 'http', 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+                'path': '/scoreboard/week/5/stream', 'root_path': '', 'query_string': b'',
+                'headers': [], 'server': ('testserver', 80), 'client': ('127.0.0.1', 1234)
+            }
+            stream = asyncio.create_task(asgi.app(scope, receive, send))
+            await asyncio.wait_for(first_chunk.wait(), timeout=5)
+
+            transport = httpx.ASGITransport(app=asgi.app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://testserver') as client:
+                response = await asyncio.wait_for(client.get('/api/health'), timeout=5)
+
+            # End the stream: its next keep-alive fails like a send to a closed socket
+            disconnected = True
+            with self.assertRaises(OSError):
+                await asyncio.wait_for(stream, timeout=5)
+            return response
+
+        self.assertEqual(asyncio.run(run()).status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
 """Test routes"""
 
+import gzip
+import json
 import unittest
+from unittest.mock import patch
 from app import create_app
 
 class TestRoutes(unittest.TestCase):
@@ -33,5 +36,179 @@ class TestRoutes(unittest.TestCase):
         data = response.get_json()
         self.assertIn('name', data)
 
+    @patch('routes.stats.get_team_profile')
+    def test_team_profile_route_category_filter(self, mock_profile):
+        """Test team profile route passes the categories filter"""
+        mock_profile.return_value = {
+            'team_name': 'Michigan',
+            'categories': {'21': {'stat_name': 'Total Offense', 'data': {}}},
+            'failed_categories': []
+        }
+        response = self.client.get('/stats/team/Michigan/profile?categories=21,22')
+        self.assertEqual(response.status_code, 200)
+        mock_profile.assert_called_once_with('Michigan', [21, 22])
+
+    def test_team_profile_route_rejects_unknown_category(self):
+        """Test team profile route validates category IDs"""
+        response = self.client.get('/stats/team/Michigan/profile?categories=21,abc')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/stats/team/Michigan/profile?categories=1')
+        self.assertEqual(response.status_code, 400)
+
+    def test_etag_and_not_modified(self):
+        """Test JSON routes return an ETag and honour If-None-Match"""
+        response = self.client.get('/about')
+        etag = response.headers.get('ETag')
+        self.assertIsNotNone(etag)
+
+        response = self.client.get('/about', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+    @patch('routes.scoreboard.get_scoreboard_data')
+    def test_scoreboard_last_modified(self, mock_scoreboard):
+        """Test scoreboard responses carry the upstream updated_at as Last-Modified"""
+        mock_scoreboard.return_value = {'week': 6, 'updatedAt': '2025-10-30 04:44:57', 'games': []}
+
+        response = self.client.get('/scoreboard/week/6')
+        self.assertEqual(response.headers.get('Last-Modified'), 'Thu, 30 Oct 2025 04:44:57 GMT')
+
+        response = self.client.get('/scoreboard/week/6', headers={
+            'If-Modified-Since': 'Thu, 30 Oct 2025 04:44:57 GMT'
+        })
+        self.assertEqual(response.status_code, 304)
+
+    @patch('routes.stats.get_all_teams_stats')
+    def test_large_json_is_compressed(self, mock_stats):
+        """Test large JSON responses are gzip encoded when the client accepts it"""
+        mock_stats.return_value = {'data': [{'Team': f'Team {i}', 'YPG': str(i)} for i in range(200)]}
+
+        plain = self.client.get('/stats/stat/21')
+        compressed = self.client.get('/stats/stat/21', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertEqual(compressed.headers.get('Content-Encoding'), 'gzip')
+        self.assertIn('Accept-Encoding', compressed.headers.get('Vary'))
+        self.assertLess(len(compressed.data), len(plain.data))
+        self.assertEqual(json.loads(gzip.decompress(compressed.data)), plain.get_json())
+        self.assertEqual(compressed.headers.get('ETag'), plain.headers.get('ETag'))
+        self.assertTrue(compressed.headers.get('ETag').startswith('W/'))
+
+        response = self.client.get('/stats/stat/21', headers={
+            'Accept-Encoding': 'gzip',
+            'If-None-Match': compressed.headers.get('ETag')
+        })
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_small_json_is_not_compressed(self):
+        """Test small responses skip compression"""
+        response = self.client.get('/about', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_json_keys_are_sorted(self):
+        """Test the fast JSON provider keeps key order stable for ETags"""
+        body = self.app.json.dumps({'b': 1, 'a': 2})
+        self.assertEqual(json.loads(body), {'a': 2, 'b': 1})
+        self.assertLess(body.index('"a"'), body.index('"b"'))
+
+    @patch('routes.stats.query_stats_category')
+    def test_stat_category_query_parameters(self, mock_query):
+        """Test stat category routes pass sort and pagination parameters to the service"""
+        mock_query.return_value = {'data': [], 'total_records': 0}
+        response = self.client.get('/stats/offense?sort=YPG&limit=25&conference=SEC')
+        self.assertEqual(response.status_code, 200)
+        mock_query.assert_called_once_with(
+            21, sort='YPG', order='desc', limit=25, offset=0, conference='SEC', fields=None
+        )
+
+        response = self.client.get('/stats/stat/21?order=sideways')
+        self.assertEqual(response.status_code, 400)
+
+    @patch('routes.scoreboard.get_season_scoreboard')
+    def test_season_scoreboard_route(self, mock_season):
+        """Test the season scoreboard route parses the weeks range"""
+        mock_season.return_value = {'year': 2025, 'weeks': [], 'failedWeeks': [], 'totalGames': 0}
+        response = self.client.get('/scoreboard/season/2025?weeks=1-3')
+        self.assertEqual(response.status_code, 200)
+        mock_season.assert_called_once_with(2025, [1, 2, 3])
+
+        response = self.client.get('/scoreboard/season/2025?weeks=9-2')
+        self.assertEqual(response.status_code, 400)
+
+    @patch('routes.scoreboard.get_scoreboard_data')
+    def test_cache_control_policies(self, mock_scoreboard):
+        """Test Cache-Control follows the route policy and the scoreboard's game states"""
+        response = self.client.get('/api/health')
+        self.assertEqual(response.headers.get('Cache-Control'), 'no-store')
+
+        def scoreboard(live, finished):
+            return {'week': 6, 'games': [{'game_state': {'isUpcoming': False, 'isLive': live, 'isFinished': finished}}]}
+
+        mock_scoreboard.return_value = scoreboard(True, False)
+        response = self.client.get('/scoreboard/week/6')
+        self.assertIn('max-age=5,', response.headers.get('Cache-Control'))
+
+        mock_scoreboard.return_value = scoreboard(False, True)
+        response = self.client.get('/scoreboard/week/6')
+        self.assertIn('s-maxage=86400', response.headers.get('Cache-Control'))
+        self.assertIn('Origin', response.headers.get('Vary'))
+
+        etag = response.headers.get('ETag')
+        response = self.client.get('/scoreboard/week/6', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('public', response.headers.get('Cache-Control'))
+
+        mock_scoreboard.return_value = None
+        response = self.client.get('/scoreboard/week/6')
+        self.assertEqual(response.headers.get('Cache-Control'), 'no-store')
+
+    def test_status_reports_startup_timings(self):
+        """Test /api/status includes the per-module startup report"""
+        data = self.client.get('/api/status').get_json()
+        self.assertIn('import routes.stats', data['startup']['steps'])
+        self.assertIn('probe', data['supabase'])
+
+    def test_metrics_endpoint(self):
+        """Test route latency and cache counters are exposed"""
+        self.client.get('/about')
+        response = self.client.get('/api/metrics')
+        self.assertEqual(response.status_code, 200)
+        body = response.get_data(as_text=True)
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="/about",status="200"}', body)
+        self.assertIn('response_cache{stat="hits"}', body)
+
+    @patch('routes.scoreboard.get_scoreboard_poller')
+    def test_scoreboard_stream_rejects_weeks_outside_season(self, mock_poller):
+        """Test streams for weeks outside the season are refused before a poller is created"""
+        for week in (0, 17, 999):
+            response = self.client.get(f'/scoreboard/week/{week}/stream')
+            self.assertEqual(response.status_code, 400)
+            self.assertFalse(response.get_json()['success'])
+        mock_poller.assert_not_called()
+
+    @patch('routes.stats.get_stats_warehouse')
+    def test_stats_compare_route(self, mock_warehouse):
+        """Test cross-category comparisons pass metrics through and reject bad input"""
+        mock_warehouse.return_value.query.return_value = [{"team": "Ohio St.", "score": 1.0}]
+        response = self.client.get('/stats/compare?metrics=21:YPG,-22:YPG&method=zscore&limit=5')
+        if response.status_code == 503:
+            self.skipTest("numpy and pandas are not installed")
+        self.assertEqual(response.status_code, 200)
+        mock_warehouse.return_value.query.assert_called_once_with(["21:YPG", "-22:YPG"], "zscore", 5)
+
+        mock_warehouse.return_value.query.side_effect = ValueError("Invalid metric")
+        self.assertEqual(self.client.get('/stats/compare?metrics=YPG').status_code, 400)
+        self.assertEqual(self.client.get('/stats/compare?metrics=21:YPG&limit=0').status_code, 400)
+        response = self.client.get('/stats/compare?metrics=21:YPG&limit=abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error'], "limit must be a positive integer")
+
+        mock_warehouse.return_value.query.side_effect = None
+        mock_warehouse.return_value.query.return_value = None
+        response = self.client.get('/stats/compare?metrics=21:YPG')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.get_json()['error'], "Failed to fetch statistics for comparison")
+
 if __name__ == '__main__':
     unittest.main()
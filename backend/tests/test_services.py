@@ -1,14 +1,27 @@
 """ Test Services"""
 
+import os
+import queue
+import tempfile
+from datetime import date
 import unittest
 import requests
 from unittest.mock import patch, Mock
 from app import create_app
-from api_vars import NCAA_API_BASE_URL
+from api_vars import NCAA_API_BASE_URL, SCOREBOARD_PREDICTION_COLUMNS, STAT_CATEGORIES
 from services.history_service import get_championship_winners
 from services.rankings_service import get_ap_rankings
-from services.stats_service import get_all_teams_stats, get_offense_stats
-from services.scoreboard_service import get_scoreboard_data
+from services.stats_service import get_all_teams_stats, get_offense_stats, get_team_stats, get_team_offense_stats, get_team_profile
+from services.stats_service import build_stats_table, parse_stats_query, query_stats_table, query_stats_category, get_stats_table
+from services.scoreboard_service import get_scoreboard_data, get_season_scoreboard, parse_week_range, get_predictions_map, completed_week_key, get_current_week
+from services import live_scoreboard_service
+from services.live_scoreboard_service import ScoreboardPoller, get_scoreboard_poller
+from services.team_service import normalize_team_name, get_team_record
+from services.warmup_service import CacheWarmer, build_warmup_jobs
+from services.team_identity import TeamIdentity, build_prediction_index, get_team_identity, match_prediction
+from services.stats_warehouse import StatsWarehouse, parse_metric, PANDAS_AVAILABLE
+from utils.cache import get_response_cache
+from utils.http_client import get_ncaa_client
 
 
 class TestServices(unittest.TestCase):
@@ -18,9 +31,19 @@ class TestServices(unittest.TestCase):
         self.app = create_app('development')
         self.app.config['TESTING'] = True
         self.client = self.app.test_client()
-       
+        get_response_cache().clear()
+        get_ncaa_client().breaker.reset()
+
+        # Keep team variants learned from test scoreboards out of the real identity file
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        identity_path = patch.object(get_team_identity(), 'path', os.path.join(self.tmpdir.name, 'identity.json'))
+        identity_path.start()
+        self.addCleanup(identity_path.stop)
+        self.addCleanup(get_team_identity().flush)
+
     
-    @patch('services.history_service.requests.get')
+    @patch('utils.http_client.requests.Session.get')
     def test_get_championship_winners_success(self, mock_get):
         """Test successful retrieval of championship winners"""
         
@@ -68,9 +91,9 @@ class TestServices(unittest.TestCase):
         self.assertEqual(first_champion['Champion'], 'Ohio State')
         self.assertEqual(first_champion['Season'], '2024')
         
-        mock_get.assert_called_once_with(f'{NCAA_API_BASE_URL}/history/football/fbs')
+        mock_get.assert_called_once_with(f'{NCAA_API_BASE_URL}/history/football/fbs', timeout=15)
     
-    @patch('services.history_service.requests.get')
+    @patch('utils.http_client.requests.Session.get')
     def test_get_championship_winners_empty_response(self, mock_get):
         """Test handling of empty championship data"""
         
@@ -98,7 +121,7 @@ class TestServices(unittest.TestCase):
         self.assertEqual(result['count'], 0)
         self.assertEqual(len(result['data']['data']), 0)
     
-    @patch('services.history_service.requests.get')
+    @patch('utils.http_client.requests.Session.get')
     def test_get_championship_winners_api_returns_404(self, mock_get):
         """Test handling when API returns 404"""
         
@@ -114,7 +137,7 @@ class TestServices(unittest.TestCase):
         
         self.assertEqual(result['error'], 'Failed to fetch championship data from NCAA API')
     
-    @patch('services.history_service.requests.get')
+    @patch('utils.http_client.requests.Session.get')
     def test_get_championship_winners_api_returns_500(self, mock_get):
         """Test handling when API returns server error"""
         
@@ -130,7 +153,7 @@ class TestServices(unittest.TestCase):
     
     
 
-    @patch('services.rankings_service.requests.get')
+    @patch('utils.http_client.requests.Session.get')
     def test_get_ap_rankings_success(self, mock_get):
         """Test successful retrieval of rankings"""
         mock_response = Mock()
@@ -184,7 +207,7 @@ class TestServices(unittest.TestCase):
         mock_get.assert_called_once_with(f'{NCAA_API_BASE_URL}/rankings/football/fbs/associated-press', timeout=10)
     
 
-    @patch('services.rankings_service.requests.get')
+    @patch('utils.http_client.requests.Session.get')
     def test_get_ap_rankings_empty_response(self, mock_get):
         """Test successful retrieval of empty rankings"""
         mock_response = Mock()
@@ -211,7 +234,7 @@ class TestServices(unittest.TestCase):
         
         mock_get.assert_called_once_with(f'{NCAA_API_BASE_URL}/rankings/football/fbs/associated-press', timeout = 10)
         
-    @patch('services.rankings_service.requests.get')
+    @patch('utils.http_client.requests.Session.get')
     def test_get_get_ap_rankings_returns_404(self, mock_get):
         """Test handling when API returns 404"""
         
@@ -228,7 +251,7 @@ class TestServices(unittest.TestCase):
         self.assertEqual(result['error'], 'Failed to fetch AP rankings')
 
 
-    @patch('services.scoreboard_service.requests.get')
+    @patch('utils.http_client.requests.Session.get')
     def test_get_scoreboard_data_success(self, mock_get):
         """Test successful retrieval of scoreboard data"""
         mock_response = Mock()
@@ -311,7 +334,7 @@ class TestServices(unittest.TestCase):
         
         mock_get.assert_called_once_with(f'{NCAA_API_BASE_URL}/scoreboard/football/fbs/2025/06/all-conf', timeout=10)
     
-    @patch('services.scoreboard_service.requests.get')
+    @patch('utils.http_client.requests.Session.get')
     def test_get_scoreboard_data_404(self, mock_get):
         mock_response = Mock()
         mock_response.status_code = 404
@@ -321,7 +344,7 @@ class TestServices(unittest.TestCase):
         result = get_scoreboard_data(6,2025)
         self.assertIsNone(result)
 
-    @patch('services.stats_service.requests.get')
+    @patch('utils.http_client.requests.Session.get')
     def test_get_offense_stats_empty(self, mock_get):
         """Test successful retrieval Total Offense stats with empty data"""
         mock_response = Mock()
@@ -347,9 +370,9 @@ class TestServices(unittest.TestCase):
         self.assertEqual(result['stat_name'], "Total Offense")
         
         calls = mock_get.call_args_list
-        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(calls), 1)
    
-    @patch('services.stats_service.requests.get')
+    @patch('utils.http_client.requests.Session.get')
     def test_get_all_teams_stats_returns_404(self, mock_get):
         """Test handling when get_team_stats returns 404""" 
         mock_response = Mock()
@@ -362,7 +385,7 @@ class TestServices(unittest.TestCase):
 
 
 
-    @patch('services.stats_service.requests.get')
+    @patch('utils.http_client.requests.Session.get')
     def test_single_page_response(self, mock_get):
         """Test when all data fits on a single page (no pagination needed)"""
         
@@ -405,12 +428,12 @@ class TestServices(unittest.TestCase):
         self.assertEqual(len(result['data']), 2)
         self.assertEqual(result['total_records'], 2)
         
-        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_get.call_count, 1)
         mock_get.assert_any_call(f"{NCAA_API_BASE_URL}/stats/football/fbs/current/team/21", timeout=10)
     
     
     
-    @patch('services.stats_service.requests.get')
+    @patch('utils.http_client.requests.Session.get')
     def test_two_pages_response(self, mock_get):
         """Test pagination with exactly 2 pages of data"""
         
@@ -481,8 +504,7 @@ class TestServices(unittest.TestCase):
         
         mock_get.side_effect = [
             page1_response,  # First call (page 1 in loop)
-            page2_response,  # Second call (page 2 in loop)
-            page1_response   # Third call (getting metadata)
+            page2_response   # Second call (page 2 in loop)
         ]
         
         result = get_all_teams_stats(21)
@@ -495,13 +517,497 @@ class TestServices(unittest.TestCase):
         self.assertIn("Michigan", team_names)
         self.assertIn("Florida St.", team_names)
         
-        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(mock_get.call_count, 2)
         
         calls = mock_get.call_args_list
         self.assertEqual(calls[0][0][0], f"{NCAA_API_BASE_URL}/stats/football/fbs/current/team/21")  # Page 1
         self.assertEqual(calls[1][0][0], f"{NCAA_API_BASE_URL}/stats/football/fbs/current/team/21/p2")  # Page 2
-        self.assertEqual(calls[2][0][0], f"{NCAA_API_BASE_URL}/stats/football/fbs/current/team/21")  # Metadata fetch
 
+    @patch('utils.http_client.requests.Session.get')
+    def test_remaining_pages_fetched_once_in_order(self, mock_get):
+        """Test every page is fetched exactly once and combined in page order"""
+        base_url = f"{NCAA_API_BASE_URL}/stats/football/fbs/current/team/21"
+        pages = {
+            base_url: {"title": "Total Offense", "pages": 3, "data": [{"Team": "A"}]},
+            f"{base_url}/p2": {"pages": 3, "data": [{"Team": "B"}]},
+            f"{base_url}/p3": {"pages": 3, "data": [{"Team": "C"}]},
+        }
+
+        def fake_get(url, timeout):
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = pages[url]
+            return response
+
+        mock_get.side_effect = fake_get
+
+        result = get_all_teams_stats(21)
+
+        self.assertEqual([team['Team'] for team in result['data']], ["A", "B", "C"])
+        self.assertEqual(result['title'], "Total Offense")
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(sorted(call[0][0] for call in mock_get.call_args_list), sorted(pages))
+
+    @patch('utils.http_client.requests.Session.get')
+    def test_team_stats_lookup_uses_index(self, mock_get):
+        """Test team lookups are served from the category index after warm-up"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "title": "Total Offense",
+            "pages": 1,
+            "data": [
+                {"Rank": "1", "Team": "Southern California", "YPG": "530.0"},
+                {"Rank": "2", "Team": "Florida St.", "YPG": "523.3"}
+            ]
+        }
+        mock_get.return_value = mock_response
+
+        first = get_team_stats(21, "florida st.")
+        second = get_team_offense_stats("  Southern   California ")
+        missing = get_team_stats(21, "Michigan")
+
+        self.assertEqual(first['Rank'], "2")
+        self.assertEqual(second['YPG'], "530.0")
+        self.assertIsNone(missing)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('utils.http_client.requests.Session.get')
+    def test_team_profile_across_categories(self, mock_get):
+        """Test a team profile collects every requested category"""
+        def fake_get(url, timeout):
+            stat_id = url.rsplit('/', 1)[-1]
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = {
+                "pages": 1,
+                "data": [{"Team": "Michigan", "Value": stat_id}]
+            }
+            return response
+
+        mock_get.side_effect = fake_get
+
+        result = get_team_profile("Michigan", [21, 22, 23])
+
+        self.assertEqual(set(result['categories']), {"21", "22", "23"})
+        self.assertEqual(result['categories']["22"]['stat_name'], "Total Defense")
+        self.assertEqual(result['categories']["22"]['data']['Value'], "22")
+        self.assertEqual(result['failed_categories'], [])
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch('utils.http_client.requests.Session.get')
+    def test_ap_rankings_served_from_cache(self, mock_get):
+        """Test repeated requests are served from the response cache"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"data": {"data": []}}
+        mock_get.return_value = mock_response
+
+        first = get_ap_rankings()
+        second = get_ap_rankings()
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(get_response_cache().stats()['hits'], 1)
+
+
+    @patch('services.live_scoreboard_service.get_scoreboard_data')
+    def test_scoreboard_poller_publishes_only_changed_games(self, mock_scoreboard):
+        """Test the live poller sends a snapshot first and then only changed games"""
+        def game(game_id, home_score, state='live'):
+            return {
+                'gameID': game_id,
+                'game_state': {'isUpcoming': False, 'isLive': state == 'live', 'isFinished': state == 'final'},
+                'away': {'score': 0, 'rank': None, 'names': {}},
+                'home': {'score': home_score, 'rank': None, 'names': {}},
+                'epoch': '1759453200'
+            }
+
+        poller = ScoreboardPoller(6, 2025)
+        subscriber = queue.Queue()
+        poller._subscribers.add(subscriber)
+
+        mock_scoreboard.return_value = {'updatedAt': 't1', 'games': [game('1', 7), game('2', 0)]}
+        poller.poll_once()
+        mock_scoreboard.return_value = {'updatedAt': 't2', 'games': [game('1', 14), game('2', 0)]}
+        poller.poll_once()
+        mock_scoreboard.return_value = {'updatedAt': 't3', 'games': [game('1', 14), game('2', 0)]}
+        poller.poll_once()
+
+        event, payload = subscriber.get_nowait()
+        self.assertEqual(event, 'snapshot')
+        self.assertEqual(len(payload['games']), 2)
+
+        event, payload = subscriber.get_nowait()
+        self.assertEqual(event, 'update')
+        self.assertEqual([g['gameID'] for g in payload['games']], ['1'])
+        self.assertEqual(payload['games'][0]['home']['score'], 14)
+
+        self.assertTrue(subscriber.empty())
+
+    @patch('services.live_scoreboard_service.get_scoreboard_data')
+    def test_scoreboard_poller_overflow_and_empty_week(self, mock_scoreboard):
+        """Test a full subscriber queue is reset to a snapshot and an empty week is not re-sent"""
+        def game(game_id, home_score):
+            return {'gameID': game_id, 'game_state': {}, 'away': {'score': 0}, 'home': {'score': home_score}}
+
+        poller = ScoreboardPoller(6, 2025)
+        slow = queue.Queue(maxsize=2)
+        poller._subscribers.add(slow)
+
+        for score in (7, 14, 21):
+            mock_scoreboard.return_value = {'updatedAt': 't', 'games': [game('1', score), game('2', 0)]}
+            poller.poll_once()
+
+        event, payload = slow.get_nowait()
+        self.assertEqual(event, 'snapshot')
+        self.assertEqual([g['home']['score'] for g in payload['games']], [21, 0])
+        self.assertTrue(slow.empty())
+
+        poller = ScoreboardPoller(1, 2025)
+        subscriber = queue.Queue()
+        poller._subscribers.add(subscriber)
+        mock_scoreboard.return_value = {'updatedAt': 't', 'games': []}
+        poller.poll_once()
+        poller.poll_once()
+
+        self.assertEqual(subscriber.get_nowait()[0], 'snapshot')
+        self.assertTrue(subscriber.empty())
+
+    @patch.object(ScoreboardPoller, '_run')
+    def test_idle_scoreboard_poller_is_forgotten(self, mock_run):
+        """Test a week's poller is dropped once its last viewer leaves and reused while watched"""
+        poller = get_scoreboard_poller(9, 2025)
+        first = poller.subscribe()
+        second = poller.subscribe()
+        poller.unsubscribe(first)
+        self.assertIs(get_scoreboard_poller(9, 2025), poller)
+
+        poller.unsubscribe(second)
+        self.assertNotIn((2025, 9), live_scoreboard_service._pollers)
+
+        # A viewer of a poller handed out just before it went idle registers it again
+        third = poller.subscribe()
+        self.assertIs(get_scoreboard_poller(9, 2025), poller)
+        poller.unsubscribe(third)
+        self.assertNotIn((2025, 9), live_scoreboard_service._pollers)
+
+    def test_normalize_team_name(self):
+        """Test team names compare equal across case, punctuation, St. and aliases"""
+        self.assertEqual(normalize_team_name("Ohio St."), normalize_team_name("OHIO STATE"))
+        self.assertEqual(normalize_team_name("USC"), normalize_team_name("Southern California"))
+        self.assertEqual(normalize_team_name("Hawai'i"), "hawaii")
+        self.assertEqual(normalize_team_name("St. Francis (PA)"), "saint francis pa")
+        self.assertNotEqual(normalize_team_name("Miami (FL)"), normalize_team_name("Miami (OH)"))
+        self.assertEqual(normalize_team_name("San José State"), "san jose state")
+        self.assertEqual(normalize_team_name("San Jose\u0301 St."), normalize_team_name("San Jose State"))
+
+    @patch('utils.http_client.requests.Session.get')
+    def test_team_record_uses_standings_index(self, mock_get):
+        """Test record lookups tolerate naming differences and reuse one standings fetch"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "data": [
+                {"conference": "Big Ten", "standings": [{"School": "Ohio St.", "Overall W": "7"}]},
+                {"conference": "SEC", "standings": [{"School": "Ole Miss", "Overall W": "6"}]}
+            ]
+        }
+        mock_get.return_value = mock_response
+
+        self.assertEqual(get_team_record("Ohio State")['Overall W'], "7")
+        self.assertEqual(get_team_record("mississippi")['School'], "Ole Miss")
+        self.assertIsNone(get_team_record("Michigan"))
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_stats_table_sort_and_paginate(self):
+        """Test stat categories are sorted by precomputed column orders and sliced"""
+        table = build_stats_table({
+            "title": "Total Offense",
+            "data": [
+                {"Rank": "3", "Team": "Army", "Yards": "1,020", "TOP": "32:10"},
+                {"Rank": "1", "Team": "Navy", "Yards": "2,400", "TOP": "28:05"},
+                {"Rank": "2", "Team": "Air Force", "Yards": "1,950", "TOP": ""}
+            ]
+        })
+        self.assertNotIn("Team", table['orders'])
+
+        result = query_stats_table(table, sort="Yards", limit=2)
+        self.assertEqual([row['Team'] for row in result['data']], ["Navy", "Air Force"])
+        self.assertEqual(result['total_records'], 3)
+        self.assertEqual(result['title'], "Total Offense")
+
+        result = query_stats_table(table, sort="TOP", order="asc", fields=["Team"])
+        self.assertEqual(result['data'], [{"Team": "Navy"}, {"Team": "Army"}, {"Team": "Air Force"}])
+
+        result = query_stats_table(table, offset=1, teams={"army", "navy"})
+        self.assertEqual([row['Team'] for row in result['data']], ["Navy"])
+        self.assertEqual(result['total_records'], 2)
+
+        with self.assertRaises(ValueError):
+            query_stats_table(table, sort="Team")
+
+    @patch('services.stats_service.fetch_all_teams_stats')
+    def test_stats_table_not_cached_from_stale_pages(self, mock_fetch):
+        """Test derived stats tables never outlive the pages they were built from"""
+        stats_data = {"data": [{"Rank": "1", "Team": "Navy", "YPG": "300.0"}]}
+        cache = get_response_cache()
+
+        mock_fetch.return_value = (stats_data, 0)
+        self.assertIsNotNone(get_stats_table(21))
+        self.assertIsNone(cache.get("stats-table:21"))
+
+        mock_fetch.return_value = (stats_data, 30)
+        get_stats_table(21)
+        self.assertLessEqual(cache.ttl("stats-table:21"), 30)
+        self.assertGreater(cache.ttl("stats-table:21"), 0)
+
+    def test_parse_stats_query(self):
+        """Test stat category query parameters are validated"""
+        self.assertIsNone(parse_stats_query({}))
+        self.assertEqual(parse_stats_query({"sort": "YPG", "limit": "25", "fields": "Team, YPG"}), {
+            "sort": "YPG", "order": "desc", "limit": 25, "offset": 0, "conference": None, "fields": ["Team", "YPG"]
+        })
+        for args in ({"order": "up"}, {"limit": "0"}, {"offset": "-1"}, {"limit": "ten"}):
+            with self.assertRaises(ValueError):
+                parse_stats_query(args)
+
+    @patch('utils.http_client.requests.Session.get')
+    def test_query_stats_category_by_conference(self, mock_get):
+        """Test the conference filter uses the standings index"""
+        def fake_get(url, timeout=None):
+            response = Mock()
+            response.status_code = 200
+            if 'standings' in url:
+                response.json.return_value = {"data": [
+                    {"conference": "Big Ten", "standings": [{"School": "Ohio St."}, {"School": "Michigan"}]}
+                ]}
+            else:
+                response.json.return_value = {"pages": 1, "data": [
+                    {"Rank": "1", "Team": "Ohio St.", "YPG": "480.1"},
+                    {"Rank": "2", "Team": "Georgia", "YPG": "470.0"},
+                    {"Rank": "3", "Team": "Michigan", "YPG": "410.5"}
+                ]}
+            return response
+        mock_get.side_effect = fake_get
+
+        result = query_stats_category(21, sort="YPG", order="asc", conference="big ten")
+        self.assertEqual([row['Team'] for row in result['data']], ["Michigan", "Ohio St."])
+
+    def test_parse_week_range(self):
+        """Test week ranges, lists and validation"""
+        self.assertEqual(parse_week_range("1-3"), [1, 2, 3])
+        self.assertEqual(parse_week_range("5, 1,2-3"), [1, 2, 3, 5])
+        for text in ("", "0", "4-2", "a-b", "1-99"):
+            with self.assertRaises(ValueError):
+                parse_week_range(text)
+
+    @patch('services.scoreboard_service.get_supabase_client')
+    @patch('utils.http_client.requests.Session.get')
+    def test_season_scoreboard(self, mock_get, mock_supabase):
+        """Test weeks are fetched together, predictions come from one range query and completed weeks are kept"""
+        def game(state):
+            return {"game": {
+                "gameID": "1", "gameState": state,
+                "home": {"score": "", "names": {"full": "Navy"}, "rank": ""},
+                "away": {"score": "", "names": {"full": "Army"}, "rank": ""}
+            }}
+
+        def fake_get(url, timeout=None):
+            response = Mock()
+            response.status_code = 200
+            if '/2025/01/' in url:
+                response.json.return_value = {"games": [game("final")]}
+            elif '/2025/02/' in url:
+                response.json.return_value = {"games": [game("live")]}
+            else:
+                response.status_code = 404
+                response.raise_for_status.side_effect = requests.exceptions.HTTPError("404 Not Found")
+            return response
+        mock_get.side_effect = fake_get
+
+        supabase = mock_supabase.return_value
+        supabase.is_connected = True
+        supabase.get_predictions_by_week_range.return_value = [
+            {"week": 2, "home_team": "Navy", "away_team": "Army", "predicted_winner": "Navy"}
+        ]
+
+        result = get_season_scoreboard(2025, [1, 2, 3])
+        self.assertEqual([section['week'] for section in result['weeks']], [1, 2])
+        self.assertEqual(result['failedWeeks'], [3])
+        self.assertNotIn('prediction', result['weeks'][0]['games'][0])
+        self.assertEqual(result['weeks'][1]['games'][0]['prediction']['winner'], "Navy")
+        supabase.get_predictions_by_week_range.assert_called_once_with(2025, 1, 3, columns=SCOREBOARD_PREDICTION_COLUMNS)
+
+        cache = get_response_cache()
+        self.assertIsNotNone(cache.get(completed_week_key(2025, 1)))
+        self.assertIsNone(cache.get(completed_week_key(2025, 2)))
+
+        get_season_scoreboard(2025, [1])
+        self.assertEqual(supabase.get_predictions_by_week_range.call_count, 1)
+
+    @patch('services.scoreboard_service.get_supabase_client')
+    @patch('utils.http_client.requests.Session.get')
+    def test_season_scoreboard_skips_cache_without_predictions(self, mock_get, mock_supabase):
+        """Test a completed week is not kept for good when its predictions failed to load"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"games": [{"game": {
+            "gameID": "1", "gameState": "final",
+            "home": {"score": "21", "names": {"full": "Navy"}, "rank": ""},
+            "away": {"score": "14", "names": {"full": "Army"}, "rank": ""}
+        }}]}
+        mock_get.return_value = mock_response
+
+        supabase = mock_supabase.return_value
+        supabase.is_connected = True
+        supabase.get_predictions_by_week_range.return_value = None
+
+        self.assertEqual(len(get_season_scoreboard(2025, [1])['weeks']), 1)
+        cache = get_response_cache()
+        self.assertIsNone(cache.get(completed_week_key(2025, 1)))
+
+        supabase.is_connected = False
+        get_season_scoreboard(2025, [1])
+        self.assertIsNone(cache.get(completed_week_key(2025, 1)))
+
+        supabase.is_connected = True
+        supabase.get_predictions_by_week_range.return_value = []
+        get_season_scoreboard(2025, [1])
+        self.assertIsNotNone(cache.get(completed_week_key(2025, 1)))
+        self.assertEqual(supabase.get_predictions_by_week_range.call_count, 2)
+
+    @patch('services.scoreboard_service.get_supabase_client')
+    def test_predictions_map_cached_per_version(self, mock_supabase):
+        """Test the predictions map is cached per week and version, but not after a failed query"""
+        supabase = mock_supabase.return_value
+        supabase.is_connected = True
+        supabase.predictions_version.return_value = 'v1'
+        supabase.get_predictions_by_week.return_value = None
+
+        self.assertEqual(get_predictions_map(2025, 14), {})
+        supabase.get_predictions_by_week.return_value = [
+            {"home_team": "Navy", "away_team": "Army", "predicted_winner": "Navy"}
+        ]
+        self.assertIn("navy|army", get_predictions_map(2025, 14))
+        get_predictions_map(2025, 14)
+        self.assertEqual(supabase.get_predictions_by_week.call_count, 2)
+
+        supabase.predictions_version.return_value = 'v2'
+        get_predictions_map(2025, 14)
+        self.assertEqual(supabase.get_predictions_by_week.call_count, 3)
+
+    def test_prediction_join_across_ncaa_and_cfbd_names(self):
+        """Test CFBD prediction names match NCAA scoreboard names on canonical ids and date"""
+        with tempfile.TemporaryDirectory() as tmp:
+            identity = TeamIdentity(os.path.join(tmp, 'identity.json'))
+            home = {"short": "Ohio St.", "full": "The Ohio State University", "seo": "ohio-st", "char6": "OHIOST"}
+            away = {"short": "Southern California", "full": "University of Southern California", "seo": "southern-california"}
+            self.assertEqual(identity.register_ncaa_team(home), "ohio state")
+            identity.register_ncaa_team(away)
+            identity.save_in_background()
+            identity.flush()
+            saved = identity._save_future
+            identity.save_in_background()
+            self.assertIs(identity._save_future, saved)
+
+            index = build_prediction_index([
+                {"home_team": "Ohio State", "away_team": "USC", "game_date": "2025-09-06T23:30:00.000Z", "predicted_winner": "Ohio State"},
+                {"home_team": "Ohio State", "away_team": "USC", "game_date": "2025-11-29T17:00:00.000Z", "predicted_winner": "USC"}
+            ], identity)
+
+            # 2025-11-29 17:00 UTC
+            prediction = match_prediction(index, home, away, 1764435600, identity)
+            self.assertEqual(prediction['predicted_winner'], "USC")
+            self.assertIsNone(match_prediction(index, away, home, 1764435600, identity))
+
+            reloaded = TeamIdentity(identity.path)
+            self.assertEqual(reloaded.canonical("The Ohio State University"), "ohio state")
+
+    def test_get_current_week(self):
+        """Test the current week follows the season calendar"""
+        self.assertEqual(get_current_week(date(2025, 7, 1)), 1)
+        self.assertEqual(get_current_week(date(2025, 8, 23)), 1)
+        self.assertEqual(get_current_week(date(2025, 9, 6)), 3)
+        self.assertEqual(get_current_week(date(2026, 1, 10)), 1)
+
+    def test_cache_warmer(self):
+        """Test warm-up jobs run on the pool and readiness flips after the first run"""
+        jobs = build_warmup_jobs(date(2025, 9, 6))
+        names = [name for name, _, _ in jobs]
+        self.assertIn("scoreboard:2025:3", names)
+        self.assertIn("scoreboard:2025:4", names)
+        self.assertIn("rankings", names)
+        self.assertEqual(len([name for name in names if name.startswith("stats:")]), len(STAT_CATEGORIES))
+
+        warmer = CacheWarmer(workers=2)
+        warmer.enabled = True
+        self.assertFalse(warmer.ready)
+
+        def boom():
+            raise ValueError("down")
+
+        failed = warmer.run_once([("ok", lambda: {}, ()), ("empty", lambda: None, ()), ("boom", boom, ())])
+        self.assertEqual(failed, ["empty", "boom"])
+        self.assertTrue(warmer.ready)
+        self.assertEqual(warmer.status()['runs'], 1)
+
+
+    @unittest.skipUnless(PANDAS_AVAILABLE, "numpy and pandas are not installed")
+    @patch('services.stats_warehouse.stats_table_ttl', return_value=3600)
+    @patch('services.stats_warehouse.get_stats_table')
+    def test_stats_warehouse_queries(self, mock_table, mock_ttl):
+        """Test categories load into one table and are scored together"""
+        tables = {
+            21: build_stats_table({"data": [
+                {"Rank": "1", "Team": "Ohio St.", "YPG": "480.0"},
+                {"Rank": "2", "Team": "Georgia", "YPG": "450.0"},
+                {"Rank": "3", "Team": "Navy", "YPG": "300.0"}
+            ]}),
+            22: build_stats_table({"data": [
+                {"Rank": "1", "Team": "Ohio St.", "YPG": "240.0"},
+                {"Rank": "2", "Team": "Georgia", "YPG": "250.0"},
+                {"Rank": "3", "Team": "Navy", "YPG": "380.0"}
+            ]})
+        }
+        mock_table.side_effect = lambda stat_id: tables.get(stat_id)
+
+        warehouse = StatsWarehouse(max_age=3600, workers=2)
+        self.assertEqual(warehouse.refresh([21, 22, 23]), [23])
+        self.assertEqual(sorted(warehouse.metrics()), ["21:YPG", "22:YPG"])
+
+        ranked = warehouse.query(["21:YPG", "-22:YPG"], method="rank")
+        self.assertEqual([team['team'] for team in ranked], ["Ohio St.", "Georgia", "Navy"])
+        self.assertEqual(ranked[0]['rank'], {"21:YPG": 1.0, "22:YPG": 1.0})
+        self.assertEqual(ranked[0]['score'], 1.0)
+
+        percentiles = warehouse.query(["-22:YPG"], method="percentile", limit=1)
+        self.assertEqual(percentiles[0]['team'], "Ohio St.")
+        self.assertEqual(percentiles[0]['score'], 1.0)
+
+        zscores = warehouse.query(["21:YPG"], method="zscore")
+        self.assertEqual(zscores[-1]['team'], "Navy")
+        self.assertAlmostEqual(sum(team['score'] for team in zscores), 0.0, places=3)
+
+        # Only stale categories are reloaded, and a reload replaces just that category's columns
+        calls = mock_table.call_count
+        warehouse.refresh()
+        self.assertEqual(mock_table.call_count - calls, len(STAT_CATEGORIES) - 2)
+        tables[21] = build_stats_table({"data": [{"Rank": "1", "Team": "Navy", "YPG": "500.0"}]})
+        warehouse.refresh([21], force=True)
+        self.assertEqual(warehouse.query(["21:YPG"])[0]['team'], "Navy")
+        self.assertEqual(len(warehouse.frame), 3)
+        self.assertEqual(warehouse.frame.loc["georgia", "22:YPG"], 250.0)
+
+        for metric in ("YPG", "999:YPG", "21"):
+            with self.assertRaises(ValueError):
+                parse_metric(metric)
+        with self.assertRaises(ValueError):
+            warehouse.query(["21:Missing"])
+        # A category the upstream failed to deliver is an error of ours, not an invalid metric
+        self.assertIsNone(warehouse.query(["21:YPG", "23:YPG"]))
+        with self.assertRaises(ValueError):
+            warehouse.query(["21:YPG"], method="median")
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,460 @@
+"""Test utilities"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch, Mock
+import requests
+from api_vars import NCAA_API_BASE_URL, SCOREBOARD_LIVE_TTL, SCOREBOARD_FINAL_TTL
+from utils.cache import TTLCache
+from utils.http_client import NCAAClient, get_ncaa_client
+from utils.metrics import Histogram, endpoint_template, observe_upstream, upstream_latency
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.rate_limiter import TokenBucket, RateLimitedError
+from utils.singleflight import SingleFlight
+from utils.sqlite_cache import SQLiteCache, TieredCache
+from utils.supabase_client import SupabaseClient
+
+
+class TestNCAAClient(unittest.TestCase):
+    """Test cases for the shared NCAA client"""
+
+    def test_shared_client_instance(self):
+        """Test every caller gets the same pooled client"""
+        self.assertIs(get_ncaa_client(), get_ncaa_client())
+
+    def test_pool_and_retry_configuration(self):
+        """Test the pooled adapter honours pool size and retry settings"""
+        client = NCAAClient(pool_size=5, max_retries=3, backoff_factor=0.5)
+        adapter = client.session.get_adapter(NCAA_API_BASE_URL)
+
+        self.assertEqual(adapter._pool_maxsize, 5)
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertEqual(adapter.max_retries.backoff_factor, 0.5)
+
+    def test_per_endpoint_timeouts(self):
+        """Test timeouts are chosen by endpoint"""
+        self.assertEqual(NCAAClient.timeout_for('/history/football/fbs'), 15)
+        self.assertEqual(NCAAClient.timeout_for('/stats/football/fbs/current/team/21'), 10)
+        self.assertEqual(NCAAClient.timeout_for('/unknown/path'), 10)
+
+
+    def test_scoreboard_ttl_follows_game_state(self):
+        """Test live weeks expire quickly and finished weeks are kept long"""
+        path = '/scoreboard/football/fbs/2025/06/all-conf'
+        live = {'games': [{'game': {'gameState': 'live'}}, {'game': {'gameState': 'final'}}]}
+        final = {'games': [{'game': {'gameState': 'final'}}]}
+
+        self.assertEqual(NCAAClient.ttl_for(path, live), SCOREBOARD_LIVE_TTL)
+        self.assertEqual(NCAAClient.ttl_for(path, final), SCOREBOARD_FINAL_TTL)
+
+
+    def _client_with_cached_rankings(self, mock_monotonic):
+        """Build a client whose cache holds rankings fetched at t=0"""
+        mock_monotonic.return_value = 0.0
+        client = NCAAClient(cache=TTLCache(max_bytes=1024 * 1024), stale_if_error=7200)
+        client.session = Mock()
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {'version': 1}
+        client.session.get.return_value = response
+
+        client.get_json('/rankings/football/fbs/associated-press', ttl=60)
+        return client, response
+
+    @patch('utils.cache.time.monotonic')
+    def test_stale_while_revalidate(self, mock_monotonic):
+        """Test an expired entry is served at once and refreshed in the background"""
+        client, response = self._client_with_cached_rankings(mock_monotonic)
+        response.json.return_value = {'version': 2}
+
+        mock_monotonic.return_value = 90.0
+        result = client.get_json('/rankings/football/fbs/associated-press', ttl=60)
+        client._refresh_executor.shutdown(wait=True)
+
+        self.assertEqual(result, {'version': 1})
+        self.assertEqual(client.session.get.call_count, 2)
+        self.assertEqual(client.get_json('/rankings/football/fbs/associated-press'), {'version': 2})
+
+    @patch('utils.cache.time.monotonic')
+    def test_stale_if_error(self, mock_monotonic):
+        """Test the last good response is served while the upstream fails"""
+        client, response = self._client_with_cached_rankings(mock_monotonic)
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError('503')
+
+        # Past the stale-while-revalidate window but inside the error grace window
+        mock_monotonic.return_value = 60.0 + 3600 + 1
+        self.assertEqual(client.get_json('/rankings/football/fbs/associated-press'), {'version': 1})
+
+        # Past the error grace window the failure is raised
+        mock_monotonic.return_value = 60.0 + 7200 + 1
+        with self.assertRaises(requests.exceptions.HTTPError):
+            client.get_json('/rankings/football/fbs/associated-press')
+
+
+    @patch('utils.cache.time.monotonic')
+    def test_client_errors_are_not_served_stale(self, mock_monotonic):
+        """Test a 4xx response is raised even while a stale response is retained"""
+        client, response = self._client_with_cached_rankings(mock_monotonic)
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError('404', response=Mock(status_code=404))
+
+        mock_monotonic.return_value = 60.0 + 3600 + 1
+        with self.assertRaises(requests.exceptions.HTTPError):
+            client.get_json('/rankings/football/fbs/associated-press')
+
+    @patch('utils.cache.time.monotonic')
+    def test_get_json_reports_remaining_ttl(self, mock_monotonic):
+        """Test fresh responses report their remaining TTL and stale ones report 0"""
+        client, response = self._client_with_cached_rankings(mock_monotonic)
+
+        mock_monotonic.return_value = 45.0
+        self.assertEqual(client.get_json_with_ttl('/rankings/football/fbs/associated-press'), ({'version': 1}, 15.0))
+
+        mock_monotonic.return_value = 90.0
+        self.assertEqual(client.get_json_with_ttl('/rankings/football/fbs/associated-press', ttl=60), ({'version': 1}, 0))
+        client._refresh_executor.shutdown(wait=True)
+
+class TestTTLCache(unittest.TestCase):
+    """Test cases for the response cache"""
+
+    def test_hit_and_miss_counters(self):
+        """Test hits and misses are counted"""
+        cache = TTLCache(max_bytes=1024)
+        cache.set('a', {'x': 1}, ttl=60)
+
+        self.assertEqual(cache.get('a'), {'x': 1})
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    @patch('utils.cache.time.monotonic')
+    def test_entries_expire(self, mock_monotonic):
+        """Test entries are not served after their TTL"""
+        cache = TTLCache(max_bytes=1024)
+        mock_monotonic.return_value = 100.0
+        cache.set('a', 'value', ttl=10)
+
+        mock_monotonic.return_value = 109.0
+        self.assertEqual(cache.get('a'), 'value')
+        mock_monotonic.return_value = 110.0
+        self.assertIsNone(cache.get('a'))
+
+    def test_lru_eviction_under_memory_budget(self):
+        """Test least recently used entries are evicted first"""
+        cache = TTLCache(max_bytes=30)
+        cache.set('a', 'a', ttl=60, size=10)
+        cache.set('b', 'b', ttl=60, size=10)
+        cache.set('c', 'c', ttl=60, size=10)
+        cache.get('a')
+        cache.set('d', 'd', ttl=60, size=10)
+
+        self.assertEqual(cache.get('a'), 'a')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertLessEqual(cache.stats()['bytes'], 30)
+
+
+class TestSQLiteCache(unittest.TestCase):
+    """Test cases for the shared persistent cache"""
+
+    def setUp(self):
+        """Create a throwaway database file"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'cache.sqlite3')
+
+    def tearDown(self):
+        """Remove the database file"""
+        self.tmpdir.cleanup()
+
+    def test_values_shared_between_instances(self):
+        """Test a value written by one worker is read by another"""
+        writer = SQLiteCache(path=self.path)
+        reader = SQLiteCache(path=self.path)
+        writer.set('scoreboard', {'games': [{'id': 1}]}, ttl=60)
+
+        self.assertEqual(reader.get('scoreboard'), {'games': [{'id': 1}]})
+        self.assertEqual(reader.stats()['entries'], 1)
+
+    @patch('utils.sqlite_cache.time.time')
+    def test_expiry_and_stale_window(self, mock_time):
+        """Test entries expire and remain readable as stale for their stale window"""
+        cache = SQLiteCache(path=self.path)
+        mock_time.return_value = 1000.0
+        cache.set('rankings', [1, 2, 3], ttl=10, stale_ttl=20)
+
+        mock_time.return_value = 1015.0
+        self.assertIsNone(cache.get('rankings'))
+        self.assertEqual(cache.get_stale('rankings', 20), [1, 2, 3])
+
+        mock_time.return_value = 1031.0
+        self.assertIsNone(cache.get_stale('rankings', 20))
+
+    def test_tiered_cache_warms_memory_from_shared(self):
+        """Test a fresh process is served from the shared tier and promotes into memory"""
+        TieredCache(TTLCache(), SQLiteCache(path=self.path)).set('history', {'data': []}, ttl=60)
+
+        restarted = TieredCache(TTLCache(), SQLiteCache(path=self.path))
+        self.assertEqual(restarted.get('history'), {'data': []})
+        self.assertEqual(restarted.memory.get('history'), {'data': []})
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for the upstream circuit breaker"""
+
+    @patch('utils.circuit_breaker.time.monotonic')
+    def test_opens_probes_and_recovers(self, mock_monotonic):
+        """Test the breaker opens after failures, allows one probe, then closes"""
+        mock_monotonic.return_value = 0.0
+        breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=30, slow_call_threshold=5)
+
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+        mock_monotonic.return_value = 31.0
+        self.assertEqual(breaker.state, 'half_open')
+        breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success(latency=0.1)
+        self.assertEqual(breaker.state, 'closed')
+
+    def test_slow_calls_count_as_failures(self):
+        """Test latency spikes trip the breaker"""
+        breaker = CircuitBreaker('test', failure_threshold=1, slow_call_threshold=1)
+        breaker.record_success(latency=2.5)
+        self.assertEqual(breaker.state, 'open')
+
+    def test_open_circuit_serves_cached_data(self):
+        """Test an open circuit fails fast and falls back to the last good response"""
+        breaker = CircuitBreaker('test', failure_threshold=1)
+        client = NCAAClient(cache=TTLCache(max_bytes=1024 * 1024), breaker=breaker, stale_if_error=3600)
+        client.session = Mock()
+        client.cache.set(client.url_for('/rankings/x'), {'cached': True}, ttl=0.001, stale_ttl=3600)
+        time.sleep(0.01)
+        breaker.record_failure()
+
+        self.assertEqual(client.get_json('/rankings/x'), {'cached': True})
+        client.session.get.assert_not_called()
+
+
+    @patch('utils.circuit_breaker.time.monotonic')
+    def test_rate_limited_probe_is_released(self, mock_monotonic):
+        """Test a half-open probe rejected by the rate limiter does not wedge the circuit"""
+        mock_monotonic.return_value = 0.0
+        breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=30)
+        limiter = Mock()
+        limiter.acquire.side_effect = [RateLimitedError('limited'), None]
+        client = NCAAClient(cache=TTLCache(max_bytes=1024 * 1024), breaker=breaker, rate_limiter=limiter)
+        client.session = Mock()
+        client.session.get.return_value = Mock(status_code=200)
+        breaker.record_failure()
+
+        mock_monotonic.return_value = 31.0
+        with self.assertRaises(RateLimitedError):
+            client.get('/rankings/x')
+        self.assertEqual(breaker.state, 'half_open')
+
+        client.get('/rankings/x')
+        self.assertEqual(breaker.state, 'closed')
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for the outbound rate limiter"""
+
+    @patch('utils.rate_limiter.time.monotonic')
+    def test_burst_then_wait(self, mock_monotonic):
+        """Test a burst is allowed up to capacity and further calls must wait"""
+        mock_monotonic.return_value = 0.0
+        bucket = TokenBucket(rate=10, capacity=2, max_wait=0.15)
+
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+        with self.assertRaises(RateLimitedError):
+            bucket.reserve()
+
+        mock_monotonic.return_value = 1.0
+        self.assertEqual(bucket.reserve(), 0.0)
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for request coalescing"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test concurrent callers with the same key trigger one call"""
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def slow_fetch():
+            calls.append(1)
+            release.wait(timeout=5)
+            return {'games': []}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do('week-6', slow_fetch)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        while flight.in_flight() == 0:
+            time.sleep(0.001)
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'games': []}] * 5)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_errors_are_shared_and_not_remembered(self):
+        """Test a failed call raises for its callers and the next call runs again"""
+        flight = SingleFlight()
+
+        def failing_fetch():
+            raise ValueError('upstream down')
+
+        with self.assertRaises(ValueError):
+            flight.do('key', failing_fetch)
+        self.assertEqual(flight.do('key', lambda: 'ok'), 'ok')
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for Prometheus metrics"""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test observations count toward every bucket at or above them"""
+        histogram = Histogram('test_seconds', 'Test', ('route',), buckets=(0.1, 1))
+        histogram.observe(0.05, '/a')
+        histogram.observe(0.5, '/a')
+        lines = histogram.render()
+        self.assertIn('test_seconds_bucket{route="/a",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{route="/a",le="1"} 2', lines)
+        self.assertIn('test_seconds_bucket{route="/a",le="+Inf"} 2', lines)
+        self.assertIn('test_seconds_count{route="/a"} 2', lines)
+
+    def test_endpoint_template(self):
+        """Test numeric path segments collapse into one series"""
+        self.assertEqual(endpoint_template('/scoreboard/football/fbs/2024/05/all-conf'),
+                         '/scoreboard/football/fbs/:n/:n/all-conf')
+
+    def test_observe_upstream_outcome(self):
+        """Test failed and raising calls are recorded as errors"""
+        with observe_upstream('test', '/ok'):
+            pass
+        with observe_upstream('test', '/bad') as call:
+            call['failed'] = True
+        with self.assertRaises(ValueError):
+            with observe_upstream('test', '/raise'):
+                raise ValueError()
+        body = '\n'.join(upstream_latency.render())
+        self.assertIn('endpoint="/ok",outcome="ok"', body)
+        self.assertIn('endpoint="/bad",outcome="error"', body)
+        self.assertIn('endpoint="/raise",outcome="error"', body)
+
+
+class TestSupabaseClient(unittest.TestCase):
+    """Test cases for Supabase prediction queries"""
+
+    def setUp(self):
+        """Set up a client around a fake query builder"""
+        self.query = Mock()
+        for method in ('select', 'eq', 'or_', 'order', 'limit'):
+            getattr(self.query, method).return_value = self.query
+        with patch('utils.supabase_client.SUPABASE_AVAILABLE', False):
+            self.client = SupabaseClient()
+        self.client._client = Mock()
+        self.client._client.table.return_value = self.query
+
+    def test_column_projection(self):
+        """Test call sites can select only the columns they read"""
+        self.query.execute.return_value = Mock(data=[])
+        self.client.get_latest_predictions(columns=('home_team', 'away_team'))
+        self.query.select.assert_any_call('home_team,away_team')
+
+    def test_failed_query_is_not_an_empty_result(self):
+        """Test a failed query returns None and is retried instead of cached as no rows"""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.client.version_file = os.path.join(tmp, 'predictions.version')
+            self.query.execute.side_effect = [RuntimeError('timeout'), Mock(data=[])]
+
+            self.assertIsNone(self.client.get_predictions_by_week(2025, 14))
+            self.assertEqual(self.client.get_predictions_by_week(2025, 14), [])
+            self.assertEqual(self.query.execute.call_count, 2)
+
+    def test_iter_prediction_pages_uses_keyset_cursor(self):
+        """Test pages continue after the last (game_date, id) instead of an offset"""
+        self.query.execute.side_effect = [
+            Mock(data=[{'id': 1, 'game_date': '2025-09-01'}, {'id': 2, 'game_date': '2025-09-06'}]),
+            Mock(data=[{'id': 3, 'game_date': '2025-09-06'}]),
+        ]
+
+        pages = list(self.client.iter_prediction_pages(page_size=2, season=2025, columns=('home_team',)))
+
+        self.assertEqual([[row['id'] for row in page] for page in pages], [[1, 2], [3]])
+        self.query.select.assert_called_with('home_team,game_date,id')
+        self.query.or_.assert_called_once_with(
+            'game_date.gt."2025-09-06",and(game_date.eq."2025-09-06",id.gt.2),game_date.is.null'
+        )
+
+    def test_prediction_page_cursor_with_null_sort_value(self):
+        """Test a NULL game_date cursor is matched with is.null instead of the literal 'None'"""
+        self.query.execute.return_value = Mock(data=[{'id': 4, 'game_date': None}])
+
+        self.client.get_predictions_page(cursor=(None, 3), page_size=1)
+        self.query.or_.assert_called_with('and(game_date.is.null,id.gt.3)')
+
+        self.client.get_predictions_page(cursor=(None, 3), desc=True, page_size=1)
+        self.query.or_.assert_called_with('and(game_date.is.null,id.lt.3),game_date.not.is.null')
+
+        rows, cursor = self.client.get_predictions_page(page_size=1)
+        self.assertEqual(cursor, (None, 4))
+        self.assertNotIn('None', ''.join(str(call) for call in self.query.or_.call_args_list))
+
+    def test_read_through_cache_follows_version_file(self):
+        """Test cached predictions are reused until the writer bumps the version stamp"""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.client.version_file = os.path.join(tmp, 'predictions.version')
+            self.query.execute.return_value = Mock(data=[{'home_team': 'Navy'}])
+
+            self.client.get_predictions_by_week(2025, 14)
+            self.client.get_predictions_by_week(2025, 14)
+            self.assertEqual(self.query.execute.call_count, 1)
+
+            # The prediction writer touches the file after every run
+            open(self.client.version_file, 'w').close()
+            self.query.execute.reset_mock()
+            self.client.get_predictions_by_week(2025, 14)
+            self.assertEqual(self.query.execute.call_count, 1)
+
+    def test_version_is_fetched_outside_the_lock(self):
+        """Test the predictions_meta round trip does not block readers of the current stamp"""
+        def fetch():
+            self.assertFalse(self.client._version_lock.locked())
+            return 'v2'
+
+        with patch.object(self.client, '_fetch_meta_version', side_effect=fetch) as mock_fetch:
+            self.assertEqual(self.client.predictions_version(), 'v2')
+            self.assertEqual(self.client.predictions_version(), 'v2')
+        self.assertEqual(mock_fetch.call_count, 1)
+
+    @patch('supabase.create_client')
+    def test_connects_on_first_use(self, mock_create):
+        """Test the SDK client is only created when a query needs it"""
+        with patch.dict(os.environ, {'SUPABASE_URL': 'https://example.supabase.co', 'SUPABASE_KEY': 'key'}):
+            client = SupabaseClient()
+            mock_create.assert_not_called()
+            self.assertTrue(client.is_connected)
+            self.assertTrue(client.is_connected)
+        mock_create.assert_called_once_with('https://example.supabase.co', 'key')
+
+
+if __name__ == '__main__':
+    unittest.main()
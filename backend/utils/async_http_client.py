@@ -0,0 +1,260 @@
+"""
+Async HTTP client for NCAA API requests
+Async counterpart of utils.http_client built on httpx, so a single process
+can keep many upstream requests in flight. It shares the response cache and
+freshness policies with the sync client, and calls the cache (which may be
+backed by SQLite) from worker threads.
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from typing import Any, Dict
+import httpx
+from api_vars import NCAA_API_BASE_URL, NCAA_STALE_IF_ERROR
+from utils.cache import get_response_cache
+from utils.circuit_breaker import CircuitOpenError
+from utils.http_client import NCAAClient, get_ncaa_client, serves_stale_on_error
+from utils.metrics import observe_upstream
+from utils.rate_limiter import RateLimitedError
+
+
+class _LoopState:
+    """Connection pool and in-flight requests belonging to one event loop"""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.in_flight: Dict[str, asyncio.Task] = {}
+        self.refreshing = set()
+
+
+class AsyncNCAAClient:
+    """Wrapper around a pooled httpx.AsyncClient for the NCAA API"""
+
+    def __init__(self,
+                 base_url: str = NCAA_API_BASE_URL,
+                 pool_size: int = None,
+                 max_retries: int = None,
+                 cache=None,
+                 stale_if_error: float = None,
+                 transport: httpx.AsyncBaseTransport = None):
+        """
+        Initialize the client from arguments or environment variables
+
+        Args:
+            base_url: NCAA API base URL
+            pool_size: Maximum number of concurrent connections (NCAA_ASYNC_POOL_SIZE)
+            max_retries: Retries for connection errors (NCAA_MAX_RETRIES)
+            cache: Response cache, defaults to the global response cache
+            stale_if_error: Seconds past expiry the last good response is served
+                while the upstream fails (NCAA_STALE_IF_ERROR)
+            transport: Optional httpx transport, replaces the retrying default transport
+        """
+        if pool_size is None:
+            pool_size = int(os.environ.get('NCAA_ASYNC_POOL_SIZE', 100))
+        if max_retries is None:
+            max_retries = int(os.environ.get('NCAA_MAX_RETRIES', 2))
+        if stale_if_error is None:
+            stale_if_error = float(os.environ.get('NCAA_STALE_IF_ERROR', NCAA_STALE_IF_ERROR))
+
+        self.base_url = base_url.rstrip('/')
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.cache = cache if cache is not None else get_response_cache()
+        self.stale_if_error = stale_if_error
+        self.transport = transport
+
+        # httpx clients are bound to the loop they were created on
+        self._loops: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]' = weakref.WeakKeyDictionary()
+
+    def url_for(self, path: str) -> str:
+        """Build the full upstream URL for an API path"""
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _state(self) -> _LoopState:
+        """Get (or create) the connection pool for the running event loop"""
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            client = httpx.AsyncClient(
+                headers={'Accept': 'application/json'},
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+                transport=self.transport or httpx.AsyncHTTPTransport(retries=self.max_retries)
+            )
+            state = _LoopState(client)
+            self._loops[loop] = state
+        return state
+
+    async def get(self, path: str, timeout: float = None) -> httpx.Response:
+        """
+        Send a GET request to the NCAA API over the pooled async client
+
+        Args:
+            path: API path, e.g. '/rankings/football/fbs/associated-press'
+            timeout: Optional timeout override in seconds
+
+        Returns:
+            httpx.Response from the upstream API
+
+        Raises:
+            httpx.TransportError: If the upstream circuit is open or the outbound rate limit is exceeded
+        """
+        if timeout is None:
+            timeout = NCAAClient.timeout_for(path)
+
+        # Share the sync client's breaker and limiter: they guard the same upstream
+        sync_client = get_ncaa_client()
+        try:
+            sync_client.breaker.before_call()
+        except CircuitOpenError as e:
+            raise httpx.ConnectError(str(e)) from e
+
+        try:
+            try:
+                wait = sync_client.rate_limiter.reserve()
+            except RateLimitedError as e:
+                raise httpx.ConnectError(str(e)) from e
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            start = time.monotonic()
+            with observe_upstream('ncaa', path) as call:
+                try:
+                    response = await self._state().client.get(self.url_for(path), timeout=timeout)
+                except httpx.TransportError:
+                    sync_client.breaker.record_failure()
+                    raise
+
+                if response.status_code >= 500:
+                    call['failed'] = True
+                    sync_client.breaker.record_failure()
+                else:
+                    sync_client.breaker.record_success(time.monotonic() - start)
+        except BaseException:
+            # A call that was rate limited or cancelled must not hold the half-open probe
+            sync_client.breaker.release_probe()
+            raise
+        return response
+
+    async def get_json(self, path: str, timeout: float = None, ttl: float = None) -> Any:
+        """
+        Get parsed JSON for an API path with the same caching rules as NCAAClient.get_json
+
+        The returned value may be shared with other callers and must not be mutated.
+
+        Args:
+            path: API path
+            timeout: Optional timeout override in seconds
+            ttl: Optional cache lifetime override in seconds
+
+        Returns:
+            Parsed JSON response
+
+        Raises:
+            httpx.HTTPError: On connection errors or non-2xx responses
+        """
+        return (await self.get_json_with_ttl(path, timeout, ttl))[0]
+
+    async def get_json_with_ttl(self, path: str, timeout: float = None, ttl: float = None) -> tuple:
+        """
+        Get parsed JSON for an API path together with how long it stays fresh
+
+        Args:
+            path: API path
+            timeout: Optional timeout override in seconds
+            ttl: Optional cache lifetime override in seconds
+
+        Returns:
+            Tuple of (parsed JSON, seconds until it expires, 0 if it was served stale)
+
+        Raises:
+            httpx.HTTPError: On connection errors or non-2xx responses
+        """
+        key = self.url_for(path)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            return cached, await asyncio.to_thread(self.cache.ttl, key)
+
+        stale = await asyncio.to_thread(self.cache.get_stale, key, NCAAClient.stale_while_revalidate_for(path))
+        if stale is not None:
+            self._refresh_in_background(path, timeout, ttl)
+            return stale, 0
+
+        try:
+            return await self._coalesced_fetch(path, timeout, ttl)
+        except httpx.HTTPError as e:
+            stale = None
+            if serves_stale_on_error(e):
+                stale = await asyncio.to_thread(self.cache.get_stale, key, self.stale_if_error)
+            if stale is None:
+                raise
+            print(f"Serving stale response for {path} after upstream error: {e}")
+            return stale, 0
+
+    async def _coalesced_fetch(self, path: str, timeout: float = None, ttl: float = None) -> tuple:
+        """Fetch a path as (data, ttl), sharing one in-flight request between concurrent callers"""
+        key = self.url_for(path)
+        state = self._state()
+
+        task = state.in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_json(path, timeout, ttl))
+            state.in_flight[key] = task
+            task.add_done_callback(lambda _: state.in_flight.pop(key, None))
+
+        # Shield so one cancelled caller does not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    def _refresh_in_background(self, path: str, timeout: float = None, ttl: float = None) -> None:
+        """Schedule a background refresh for a path unless one is already running"""
+        key = self.url_for(path)
+        state = self._state()
+        if key in state.refreshing:
+            return
+        state.refreshing.add(key)
+
+        async def refresh():
+            try:
+                await self._coalesced_fetch(path, timeout, ttl)
+            except httpx.HTTPError as e:
+                print(f"Background refresh failed for {path}: {e}")
+            finally:
+                state.refreshing.discard(key)
+
+        asyncio.ensure_future(refresh())
+
+    async def _fetch_json(self, path: str, timeout: float = None, ttl: float = None) -> tuple:
+        """Fetch an API path from upstream, store the parsed JSON in the cache and return it with its TTL"""
+        response = await self.get(path, timeout=timeout)
+        response.raise_for_status()
+        data = response.json()
+
+        if ttl is None:
+            ttl = NCAAClient.ttl_for(path, data)
+        stale_ttl = max(NCAAClient.stale_while_revalidate_for(path), self.stale_if_error)
+        await asyncio.to_thread(
+            self.cache.set, self.url_for(path), data, ttl, size=len(response.content), stale_ttl=stale_ttl
+        )
+
+        return data, ttl
+
+    async def aclose(self) -> None:
+        """Close the connection pool of the running event loop"""
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state.client.aclose()
+
+
+# Global async NCAA client instance
+async_ncaa_client = AsyncNCAAClient()
+
+
+def get_async_ncaa_client() -> AsyncNCAAClient:
+    """
+    Get the global async NCAA client instance
+
+    Returns:
+        AsyncNCAAClient instance
+    """
+    return async_ncaa_client
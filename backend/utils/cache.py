@@ -0,0 +1,236 @@
+"""
+In-process TTL cache for upstream API responses
+Entries expire after a per-entry TTL and the least recently used entries
+are evicted once the memory budget is exceeded. Expired entries can be
+kept for a stale window so callers may serve them while revalidating or
+when the upstream is failing.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class CacheEntry:
+    """A single cached value with its expiry times and estimated size"""
+
+    __slots__ = ('value', 'expires_at', 'stale_until', 'size')
+
+    def __init__(self, value: Any, expires_at: float, stale_until: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.size = size
+
+    def is_fresh(self, now: float) -> bool:
+        """Check if the entry has not yet expired"""
+        return now < self.expires_at
+
+    def is_retained(self, now: float) -> bool:
+        """Check if the entry is still within its stale window"""
+        return now < self.stale_until
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the memory footprint of a JSON-like value from its serialized length"""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class TTLCache:
+    """Thread-safe TTL cache with LRU eviction under a memory budget"""
+
+    def __init__(self, max_bytes: int = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Memory budget in bytes (CACHE_MAX_BYTES), 0 disables caching
+        """
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Check if the cache has a memory budget to work with"""
+        return self.max_bytes > 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a fresh value from the cache
+
+        Cached values are shared between callers and must be treated as read-only.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            now = time.monotonic()
+            if not entry.is_fresh(now):
+                if not entry.is_retained(now):
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def ttl(self, key: str) -> float:
+        """Seconds until a cached value expires, 0 if it is missing or already expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return 0
+            return max(entry.expires_at - time.monotonic(), 0)
+
+    def get_stale(self, key: str, max_staleness: float) -> Optional[Any]:
+        """
+        Get an expired value that is at most max_staleness seconds past its expiry
+
+        Args:
+            key: Cache key
+            max_staleness: How long after expiry the value may still be served
+
+        Returns:
+            Cached value, or None if there is no entry recent enough
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            now = time.monotonic()
+            if not entry.is_retained(now) or now - entry.expires_at >= max_staleness:
+                return None
+
+            self._entries.move_to_end(key)
+            self.stale_hits += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl: float, size: int = None, stale_ttl: float = 0) -> None:
+        """
+        Store a value in the cache
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds
+            size: Size in bytes, estimated from the value when not given
+            stale_ttl: How long to keep the value after it expires for stale reads
+        """
+        if not self.enabled or ttl <= 0:
+            return
+
+        if size is None:
+            size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            expires_at = time.monotonic() + ttl
+            self._entries[key] = CacheEntry(value, expires_at, expires_at + stale_ttl, size)
+            self._total_bytes += size
+
+            while self._total_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        """Remove a single key from the cache"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.stale_hits = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with entry count, memory use and hit/miss counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale_hits': self.stale_hits,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _remove(self, key: str) -> None:
+        """Remove a key, caller must hold the lock"""
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size
+
+
+def create_response_cache():
+    """
+    Build the response cache selected by the CACHE_BACKEND environment variable
+
+    'memory' (default) keeps entries in this process only. 'sqlite' puts the
+    in-process cache in front of a SQLite database shared by every worker on
+    the host that survives restarts.
+
+    Returns:
+        TTLCache or TieredCache instance
+    """
+    backend = os.environ.get('CACHE_BACKEND', 'memory').lower()
+    if backend == 'sqlite':
+        from utils.sqlite_cache import SQLiteCache, TieredCache
+        return TieredCache(TTLCache(), SQLiteCache())
+    return TTLCache()
+
+
+# Global response cache instance
+response_cache = create_response_cache()
+
+
+def get_response_cache():
+    """
+    Get the global response cache instance
+
+    Returns:
+        TTLCache or TieredCache instance
+    """
+    return response_cache
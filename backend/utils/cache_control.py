@@ -0,0 +1,99 @@
+"""
+HTTP Cache-Control policies
+Adds Cache-Control headers to successful GET responses from the per-prefix
+policies in CACHE_CONTROL_POLICIES, so browsers, CDNs and reverse proxies can
+serve repeat reads. Views can shorten or extend the lifetime of a single
+response with set_cache_ttl when freshness depends on the data.
+"""
+
+from typing import Optional
+from flask import Flask, g, request
+from api_vars import CACHE_CONTROL_POLICIES, CACHE_CONTROL_VARY
+
+
+def policy_for(path: str) -> Optional[dict]:
+    """
+    Find the caching policy for a request path
+
+    Args:
+        path: Request path, e.g. '/history/champions'
+
+    Returns:
+        Policy dict from CACHE_CONTROL_POLICIES, or None if no prefix matches
+    """
+    best = None
+    for prefix in CACHE_CONTROL_POLICIES:
+        if (path == prefix or path.startswith(prefix + '/')) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return CACHE_CONTROL_POLICIES[best] if best is not None else None
+
+
+def cache_control_value(policy: Optional[dict], ttl: Optional[float] = None) -> Optional[str]:
+    """
+    Build a Cache-Control header value
+
+    Args:
+        policy: Policy dict, see CACHE_CONTROL_POLICIES
+        ttl: Data-derived lifetime in seconds, replaces max_age and s_maxage
+
+    Returns:
+        Header value, or None if there is no policy
+    """
+    if policy is None:
+        return None
+    if policy.get('no_store'):
+        return 'no-store'
+
+    max_age = policy.get('max_age', 0)
+    s_maxage = policy.get('s_maxage', max_age)
+    if ttl is not None:
+        max_age = s_maxage = int(ttl)
+
+    directives = ['public', f'max-age={max_age}', f's-maxage={s_maxage}']
+    if policy.get('stale_while_revalidate'):
+        directives.append(f"stale-while-revalidate={min(policy['stale_while_revalidate'], max(max_age, 1))}")
+    return ', '.join(directives)
+
+
+def set_cache_ttl(ttl: float) -> None:
+    """
+    Override the policy lifetime for the current response
+
+    Args:
+        ttl: Seconds browsers and shared caches may reuse the response
+    """
+    g.cache_ttl = ttl
+
+
+def add_cache_control(response):
+    """
+    After-request hook that applies the route's caching policy
+
+    Successful (200 and 304) GET/HEAD responses get the policy header and the
+    CACHE_CONTROL_VARY headers, server errors get no-store, and responses that already set Cache-Control (such as
+    event streams) are left alone.
+
+    Args:
+        response: Outgoing Flask response
+
+    Returns:
+        The response
+    """
+    if request.method not in ('GET', 'HEAD') or 'Cache-Control' in response.headers:
+        return response
+
+    if response.status_code >= 500:
+        response.headers['Cache-Control'] = 'no-store'
+    elif response.status_code in (200, 304):
+        value = cache_control_value(policy_for(request.path), g.pop('cache_ttl', None))
+        if value is not None:
+            response.headers['Cache-Control'] = value
+            if value != 'no-store':
+                for header in CACHE_CONTROL_VARY:
+                    response.vary.add(header)
+    return response
+
+
+def register_cache_control(app: Flask) -> None:
+    """Register Cache-Control policies for every route of the app"""
+    app.after_request(add_cache_control)
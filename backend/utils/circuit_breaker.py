@@ -0,0 +1,131 @@
+"""
+Circuit breaker for upstream API calls
+Trips open after consecutive failures or slow calls so requests fail fast
+(and callers can serve cached data), then lets a single probe through
+after a cool-down to check whether the upstream has recovered
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict
+import requests
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of calling an upstream whose circuit is open"""
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker"""
+
+    def __init__(self,
+                 name: str,
+                 failure_threshold: int = None,
+                 reset_timeout: float = None,
+                 slow_call_threshold: float = None):
+        """
+        Initialize the breaker from arguments or environment variables
+
+        Args:
+            name: Upstream name used in error messages
+            failure_threshold: Consecutive failures that open the circuit (NCAA_BREAKER_FAILURES)
+            reset_timeout: Seconds to stay open before probing again (NCAA_BREAKER_RESET)
+            slow_call_threshold: Calls slower than this many seconds count as failures (NCAA_BREAKER_SLOW_CALL)
+        """
+        if failure_threshold is None:
+            failure_threshold = int(os.environ.get('NCAA_BREAKER_FAILURES', 5))
+        if reset_timeout is None:
+            reset_timeout = float(os.environ.get('NCAA_BREAKER_RESET', 30))
+        if slow_call_threshold is None:
+            slow_call_threshold = float(os.environ.get('NCAA_BREAKER_SLOW_CALL', 5))
+
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call_threshold = slow_call_threshold
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Get the current state, moving from open to half-open once the cool-down has passed"""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        """Switch an open circuit to half-open after reset_timeout, caller must hold the lock"""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+
+    def before_call(self) -> None:
+        """
+        Check whether a call may go to the upstream
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a probe already in flight
+        """
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == OPEN:
+                raise CircuitOpenError(f"Circuit for {self.name} is open")
+            if self._state == HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpenError(f"Circuit for {self.name} is half-open, waiting on probe")
+                self._probe_in_flight = True
+
+    def release_probe(self) -> None:
+        """
+        Give back a half-open probe slot for a call that ended without an outcome
+
+        Called when a permitted call is abandoned before the upstream answered
+        (rate limited or cancelled), so the next call can probe instead of the
+        circuit waiting on a probe that will never report.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record_success(self, latency: float) -> None:
+        """Record a completed call, counting it as a failure if it was too slow"""
+        if latency > self.slow_call_threshold:
+            self.record_failure()
+            return
+
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call and open the circuit when the threshold is reached"""
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    print(f"Circuit for {self.name} opened after {self._failures} failures")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        """Close the circuit and forget past failures"""
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the breaker state and failure count"""
+        with self._lock:
+            self._maybe_half_open()
+            return {'state': self._state, 'consecutive_failures': self._failures}
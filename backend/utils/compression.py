@@ -0,0 +1,92 @@
+"""
+Response compression for large JSON payloads
+Negotiates brotli or gzip from Accept-Encoding and reuses compressed
+bodies for responses that have been sent before
+"""
+
+import gzip
+import hashlib
+from flask import Flask, request
+from api_vars import COMPRESS_MIN_BYTES, COMPRESS_CACHE_BYTES
+from utils.cache import TTLCache
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Compressed bodies keyed by content hash and encoding; identical payloads
+# (e.g. repeated hits on cached upstream data) skip compression entirely
+compressed_cache = TTLCache(max_bytes=COMPRESS_CACHE_BYTES)
+COMPRESSED_CACHE_TTL = 60 * 60
+
+
+def choose_encoding(accept_encoding) -> str:
+    """
+    Pick the best supported content encoding the client accepts
+
+    Args:
+        accept_encoding: werkzeug Accept-Encoding header object
+
+    Returns:
+        'br', 'gzip' or None
+    """
+    if BROTLI_AVAILABLE and accept_encoding['br']:
+        return 'br'
+    if accept_encoding['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a response body with the given encoding"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def compress_response(response):
+    """
+    After-request hook that compresses large JSON responses
+
+    Args:
+        response: Outgoing Flask response
+
+    Returns:
+        The response, compressed when the client accepts it and the body is large enough
+    """
+    if response.status_code != 200 or response.is_streamed or not response.is_json:
+        return response
+    if 'Content-Encoding' in response.headers:
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+
+    key = f"{hashlib.sha1(body).hexdigest()}:{encoding}"
+    compressed = compressed_cache.get(key)
+    if compressed is None:
+        compressed = compress(body, encoding)
+        compressed_cache.set(key, compressed, COMPRESSED_CACHE_TTL, size=len(compressed))
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+
+    # A strong ETag names exact bytes, so it cannot be kept on the compressed body
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def register_compression(app: Flask) -> None:
+    """Register response compression for every route of the app"""
+    app.after_request(compress_response)
@@ -0,0 +1,57 @@
+"""
+Conditional GET support for JSON routes
+Adds weak ETag headers to every JSON response and answers matching
+If-None-Match / If-Modified-Since requests with 304 Not Modified
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+from flask import Flask, request
+
+
+def parse_upstream_timestamp(value) -> Optional[datetime]:
+    """
+    Parse an upstream 'updated_at' timestamp such as '2025-10-30 04:44:57'
+
+    Args:
+        value: Timestamp string from the NCAA API, assumed to be UTC
+
+    Returns:
+        Timezone-aware datetime, or None if the value is missing or not parseable
+    """
+    if not value:
+        return None
+
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S'):
+        try:
+            return datetime.strptime(str(value), fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+def add_conditional_headers(response):
+    """
+    After-request hook that adds a content-hash ETag and handles conditional requests
+
+    Args:
+        response: Outgoing Flask response
+
+    Returns:
+        The response, or a 304 Not Modified response when the client copy is current
+    """
+    if request.method not in ('GET', 'HEAD') or response.status_code != 200:
+        return response
+    if response.is_streamed or not response.is_json:
+        return response
+
+    # Flask sorts JSON keys, so equal payloads always hash to the same ETag. It is
+    # weak because compression sends other bytes under it: a strong ETag would have
+    # to differ per Content-Encoding, a weak one may be shared by all of them.
+    response.add_etag(overwrite=False, weak=True)
+    return response.make_conditional(request)
+
+
+def register_conditional_requests(app: Flask) -> None:
+    """Register ETag and 304 handling for every route of the app"""
+    app.after_request(add_conditional_headers)
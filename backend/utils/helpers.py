@@ -1,8 +1,10 @@
 """Simple utility functions"""
 
 import logging
+import os
 
 def setup_logging():
-    """Setup basic logging"""
-    logging.basicConfig(level=logging.INFO)
+    """Setup basic logging, level from LOG_LEVEL (default INFO, so debug output is off)"""
+    level = getattr(logging, os.environ.get('LOG_LEVEL', 'INFO').upper(), logging.INFO)
+    logging.basicConfig(level=level)
     return logging.getLogger(__name__)
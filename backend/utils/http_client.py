@@ -0,0 +1,313 @@
+"""
+Shared HTTP client for NCAA API requests
+Provides one pooled keep-alive session that every service uses,
+with parsed responses cached according to per-endpoint freshness policies.
+Recently expired responses are served while a background worker refreshes
+them, and the last good response is served while the upstream is failing.
+Outbound calls pass through a circuit breaker and a token bucket rate limiter.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from api_vars import (
+    NCAA_API_BASE_URL,
+    NCAA_DEFAULT_TIMEOUT,
+    NCAA_ENDPOINT_TIMEOUTS,
+    NCAA_CACHE_TTLS,
+    NCAA_STALE_WHILE_REVALIDATE,
+    NCAA_STALE_IF_ERROR,
+    SCOREBOARD_LIVE_TTL,
+    SCOREBOARD_FINAL_TTL,
+)
+from utils.cache import TTLCache, get_response_cache
+from utils.circuit_breaker import CircuitBreaker
+from utils.metrics import observe_upstream
+from utils.rate_limiter import TokenBucket
+from utils.singleflight import get_single_flight
+
+# Upstream status codes that are worth retrying
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def serves_stale_on_error(error: Exception) -> bool:
+    """
+    Check if a failed upstream call may fall back to a stale response
+
+    Only connection errors and 5xx responses do: a 4xx (e.g. a 404 for an
+    unknown stat category) is the upstream's answer, not an outage.
+
+    Args:
+        error: Exception raised by the upstream call (requests or httpx)
+
+    Returns:
+        True if the last good response may be served instead
+    """
+    response = getattr(error, 'response', None)
+    return response is None or response.status_code >= 500
+
+
+class NCAAClient:
+    """Wrapper around a pooled requests.Session for the NCAA API"""
+
+    def __init__(self,
+                 base_url: str = NCAA_API_BASE_URL,
+                 pool_size: int = None,
+                 max_retries: int = None,
+                 backoff_factor: float = None,
+                 cache: TTLCache = None,
+                 stale_if_error: float = None,
+                 breaker: CircuitBreaker = None,
+                 rate_limiter: TokenBucket = None):
+        """
+        Initialize the pooled session from arguments or environment variables
+
+        Args:
+            base_url: NCAA API base URL
+            pool_size: Maximum number of keep-alive connections (NCAA_POOL_SIZE)
+            max_retries: Retries for connection errors and 5xx responses (NCAA_MAX_RETRIES)
+            backoff_factor: Exponential backoff factor between retries (NCAA_BACKOFF_FACTOR)
+            cache: Response cache, defaults to the global response cache
+            stale_if_error: Seconds past expiry the last good response is served
+                while the upstream fails (NCAA_STALE_IF_ERROR)
+            breaker: Circuit breaker guarding the upstream
+            rate_limiter: Token bucket capping the outbound request rate
+        """
+        if pool_size is None:
+            pool_size = int(os.environ.get('NCAA_POOL_SIZE', 20))
+        if max_retries is None:
+            max_retries = int(os.environ.get('NCAA_MAX_RETRIES', 2))
+        if backoff_factor is None:
+            backoff_factor = float(os.environ.get('NCAA_BACKOFF_FACTOR', 0.3))
+        if stale_if_error is None:
+            stale_if_error = float(os.environ.get('NCAA_STALE_IF_ERROR', NCAA_STALE_IF_ERROR))
+
+        self.base_url = base_url.rstrip('/')
+        self.cache = cache if cache is not None else get_response_cache()
+        self.stale_if_error = stale_if_error
+        self.breaker = breaker if breaker is not None else CircuitBreaker('NCAA API')
+        self.rate_limiter = rate_limiter if rate_limiter is not None else TokenBucket()
+
+        # Background revalidation of stale entries, one refresh per URL at a time
+        self._refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='ncaa-refresh')
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            # Hand the last response back so callers can still inspect it
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.headers.update({'Accept': 'application/json'})
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def url_for(self, path: str) -> str:
+        """Build the full upstream URL for an API path"""
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    @staticmethod
+    def timeout_for(path: str) -> float:
+        """Get the timeout for an API path based on its first path segment"""
+        endpoint = path.lstrip('/').split('/', 1)[0]
+        return NCAA_ENDPOINT_TIMEOUTS.get(endpoint, NCAA_DEFAULT_TIMEOUT)
+
+    @staticmethod
+    def ttl_for(path: str, data: Any) -> float:
+        """
+        Get how long a response may be cached
+
+        Scoreboards are cached briefly while any game is live and for a long
+        time once every game is final. Other endpoints use NCAA_CACHE_TTLS.
+
+        Args:
+            path: API path the data was fetched from
+            data: Parsed JSON response
+
+        Returns:
+            Time to live in seconds
+        """
+        endpoint = path.lstrip('/').split('/', 1)[0]
+        ttl = NCAA_CACHE_TTLS.get(endpoint, 0)
+
+        if endpoint == 'scoreboard' and isinstance(data, dict):
+            states = [
+                (game_wrapper.get('game') or {}).get('gameState')
+                for game_wrapper in data.get('games', [])
+            ]
+            if 'live' in states:
+                return SCOREBOARD_LIVE_TTL
+            if states and all(state == 'final' for state in states):
+                return SCOREBOARD_FINAL_TTL
+
+        return ttl
+
+    @staticmethod
+    def stale_while_revalidate_for(path: str) -> float:
+        """Get how long after expiry a response is served while being refreshed"""
+        endpoint = path.lstrip('/').split('/', 1)[0]
+        return NCAA_STALE_WHILE_REVALIDATE.get(endpoint, 0)
+
+    def get(self, path: str, timeout: float = None) -> requests.Response:
+        """
+        Send a GET request to the NCAA API over the pooled session
+
+        Args:
+            path: API path, e.g. '/rankings/football/fbs/associated-press'
+            timeout: Optional timeout override in seconds
+
+        Returns:
+            requests.Response from the upstream API
+
+        Raises:
+            CircuitOpenError: If the upstream circuit is open
+            RateLimitedError: If the outbound rate limit would delay the call too long
+        """
+        if timeout is None:
+            timeout = self.timeout_for(path)
+
+        self.breaker.before_call()
+        try:
+            self.rate_limiter.acquire()
+
+            start = time.monotonic()
+            with observe_upstream('ncaa', path) as call:
+                try:
+                    response = self.session.get(self.url_for(path), timeout=timeout)
+                except requests.exceptions.RequestException:
+                    self.breaker.record_failure()
+                    raise
+
+                if response.status_code >= 500:
+                    call['failed'] = True
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success(time.monotonic() - start)
+        except BaseException:
+            # A call that never reached the upstream must not hold the half-open probe
+            self.breaker.release_probe()
+            raise
+        return response
+
+    def get_json(self, path: str, timeout: float = None, ttl: float = None) -> Any:
+        """
+        Get parsed JSON for an API path, served from the response cache when fresh
+
+        An expired entry within the endpoint's stale-while-revalidate window is
+        returned immediately and refreshed in the background. If the upstream
+        request fails with a connection error or a 5xx response, the last good
+        response within the stale-if-error window is returned instead of raising.
+
+        The returned value may be shared with other callers and must not be mutated.
+
+        Args:
+            path: API path, e.g. '/rankings/football/fbs/associated-press'
+            timeout: Optional timeout override in seconds
+            ttl: Optional cache lifetime override in seconds
+
+        Returns:
+            Parsed JSON response
+
+        Raises:
+            requests.exceptions.RequestException: On connection errors or non-2xx responses
+        """
+        return self.get_json_with_ttl(path, timeout, ttl)[0]
+
+    def get_json_with_ttl(self, path: str, timeout: float = None, ttl: float = None) -> tuple:
+        """
+        Get parsed JSON for an API path together with how long it stays fresh
+
+        Data derived from the response (indexes, tables) should not be cached
+        for longer than the returned TTL, and not at all when it is 0.
+
+        Args:
+            path: API path
+            timeout: Optional timeout override in seconds
+            ttl: Optional cache lifetime override in seconds
+
+        Returns:
+            Tuple of (parsed JSON, seconds until it expires, 0 if it was served stale)
+
+        Raises:
+            requests.exceptions.RequestException: On connection errors or non-2xx responses
+        """
+        key = self.url_for(path)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, self.cache.ttl(key)
+
+        stale = self.cache.get_stale(key, self.stale_while_revalidate_for(path))
+        if stale is not None:
+            self._refresh_in_background(path, timeout, ttl)
+            return stale, 0
+
+        try:
+            # Concurrent misses for the same URL share one upstream request
+            return get_single_flight().do(('ncaa', key), self._fetch_json, path, timeout, ttl)
+        except requests.exceptions.RequestException as e:
+            stale = self.cache.get_stale(key, self.stale_if_error) if serves_stale_on_error(e) else None
+            if stale is None:
+                raise
+            print(f"Serving stale response for {path} after upstream error: {e}")
+            return stale, 0
+
+    def _refresh_in_background(self, path: str, timeout: float = None, ttl: float = None) -> None:
+        """Schedule a background refresh for a path unless one is already running"""
+        key = self.url_for(path)
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                get_single_flight().do(('ncaa', key), self._fetch_json, path, timeout, ttl)
+            except requests.exceptions.RequestException as e:
+                print(f"Background refresh failed for {path}: {e}")
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(key)
+
+        self._refresh_executor.submit(refresh)
+
+    def _fetch_json(self, path: str, timeout: float = None, ttl: float = None) -> tuple:
+        """Fetch an API path from upstream, store the parsed JSON in the cache and return it with its TTL"""
+        key = self.url_for(path)
+        response = self.get(path, timeout=timeout)
+        response.raise_for_status()
+        data = response.json()
+
+        if ttl is None:
+            ttl = self.ttl_for(path, data)
+        content = getattr(response, 'content', None)
+        size = len(content) if isinstance(content, (bytes, bytearray)) else None
+        stale_ttl = max(self.stale_while_revalidate_for(path), self.stale_if_error)
+        self.cache.set(key, data, ttl, size=size, stale_ttl=stale_ttl)
+
+        return data, ttl
+
+
+# Global NCAA client instance
+ncaa_client = NCAAClient()
+
+
+def get_ncaa_client() -> NCAAClient:
+    """
+    Get the global NCAA client instance
+
+    Returns:
+        NCAAClient instance
+    """
+    return ncaa_client
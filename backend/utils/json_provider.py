@@ -0,0 +1,75 @@
+"""
+Fast JSON provider for Flask
+Serializes responses with orjson when it is installed and falls back to
+Flask's default json-based provider otherwise
+"""
+
+import json
+from typing import Any
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider that uses orjson for serialization"""
+
+    def _orjson_option(self, indent: bool = False) -> int:
+        """Build orjson options matching Flask's sorted-key output"""
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize obj to a JSON string"""
+        if not ORJSON_AVAILABLE:
+            return super().dumps(obj, **kwargs)
+
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_option(bool(kwargs.get('indent')))).decode('utf-8')
+        except (TypeError, orjson.JSONEncodeError):
+            # e.g. integers wider than 64 bits
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        """Deserialize a JSON string or bytes"""
+        if not ORJSON_AVAILABLE or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Serialize arguments straight to a JSON response body without a str round trip"""
+        if not ORJSON_AVAILABLE:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        try:
+            body = orjson.dumps(obj, default=self.default, option=self._orjson_option(indent))
+        except (TypeError, orjson.JSONEncodeError):
+            return super().response(*args, **kwargs)
+
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    Serialize obj to compact JSON bytes with sorted keys, outside of a Flask app
+
+    Args:
+        obj: JSON-serializable value
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        except (TypeError, orjson.JSONEncodeError):
+            pass
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
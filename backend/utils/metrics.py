@@ -0,0 +1,198 @@
+"""
+Request and upstream instrumentation
+Records latency histograms per Flask route and per upstream endpoint, plus
+in-flight gauges and cache counters, and renders them in the Prometheus
+text exposition format for /api/metrics
+"""
+
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
+from flask import Flask, g, request
+
+# Latency buckets in seconds, from cache hits up to the upstream timeout
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_NUMBER = re.compile(r'\d+')
+
+
+def _format_labels(labelnames: Iterable[str], values: Iterable[str], extra: str = '') -> str:
+    """Render a Prometheus label set"""
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in zip(labelnames, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Histogram:
+    """Cumulative latency histogram with labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...], buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """Record one observation for a label set"""
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                # One counter per bucket, then +Inf, sum and count
+                series = [0] * (len(self.buckets) + 1) + [0.0, 0]
+                self._series[labelvalues] = series
+
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[len(self.buckets)] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        """Render the histogram in Prometheus text format"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labelvalues, series in sorted(self._series.items()):
+                for i, bound in enumerate(self.buckets):
+                    labels = _format_labels(self.labelnames, labelvalues, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{labels} {series[i]}")
+                labels = _format_labels(self.labelnames, labelvalues, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {series[len(self.buckets)]}")
+                labels = _format_labels(self.labelnames, labelvalues)
+                lines.append(f"{self.name}_sum{labels} {series[-2]}")
+                lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class Gauge:
+    """Gauge with labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        """Increase the gauge for a label set"""
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def dec(self, *labelvalues: str, amount: float = 1) -> None:
+        """Decrease the gauge for a label set"""
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        """Set the gauge for a label set"""
+        with self._lock:
+            self._values[labelvalues] = value
+
+    def render(self) -> List[str]:
+        """Render the gauge in Prometheus text format"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for labelvalues, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {value}")
+        return lines
+
+
+route_latency = Histogram(
+    'http_request_duration_seconds', 'Latency of Flask routes', ('method', 'route', 'status')
+)
+route_in_flight = Gauge(
+    'http_requests_in_flight', 'Flask requests currently being served'
+)
+upstream_latency = Histogram(
+    'upstream_request_duration_seconds', 'Latency of upstream API calls', ('upstream', 'endpoint', 'outcome')
+)
+upstream_in_flight = Gauge(
+    'upstream_requests_in_flight', 'Upstream API calls currently in flight', ('upstream',)
+)
+cache_stats = Gauge(
+    'response_cache', 'Response cache counters (hits, misses, stale_hits, evictions, entries, bytes, hit_ratio)', ('stat',)
+)
+
+
+def endpoint_template(path: str) -> str:
+    """Collapse numbers in an upstream path so each endpoint is one metric series"""
+    return _NUMBER.sub(':n', path.split('?', 1)[0])
+
+
+@contextmanager
+def observe_upstream(upstream: str, endpoint: str):
+    """
+    Time an upstream call and track it as in flight
+
+    Args:
+        upstream: Upstream name, e.g. 'ncaa' or 'supabase'
+        endpoint: Path or table name, numbers are collapsed to ':n'
+
+    Yields:
+        dict: Set 'failed' to True to record a call that returned an error response
+    """
+    endpoint = endpoint_template(endpoint)
+    upstream_in_flight.inc(upstream)
+    start = time.perf_counter()
+    call = {'failed': False}
+    outcome = 'error'
+    try:
+        yield call
+        outcome = 'error' if call['failed'] else 'ok'
+    finally:
+        upstream_latency.observe(time.perf_counter() - start, upstream, endpoint, outcome)
+        upstream_in_flight.dec(upstream)
+
+
+def render_metrics() -> str:
+    """
+    Render every metric in Prometheus text format
+
+    Returns:
+        Exposition text
+    """
+    from utils.cache import get_response_cache
+
+    for stat, value in get_response_cache().stats().items():
+        if isinstance(value, (int, float)):
+            cache_stats.set(value, stat)
+
+    lines = []
+    for metric in (route_latency, route_in_flight, upstream_latency, upstream_in_flight, cache_stats):
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def _start_timer():
+    """Before-request hook: start timing and count the request as in flight"""
+    g.metrics_start = time.perf_counter()
+    route_in_flight.inc()
+
+
+def _record_latency(response):
+    """After-request hook: record route latency labelled by URL rule"""
+    start = g.pop('metrics_start', None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        route_latency.observe(time.perf_counter() - start, request.method, route, str(response.status_code))
+    return response
+
+
+def _finish_request(exc):
+    """Teardown hook: the request is no longer in flight"""
+    route_in_flight.dec()
+
+
+def register_metrics(app: Flask) -> None:
+    """Register request timing hooks for every route of the app"""
+    app.before_request(_start_timer)
+    app.after_request(_record_latency)
+    app.teardown_request(_finish_request)
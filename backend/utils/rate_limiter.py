@@ -0,0 +1,72 @@
+"""
+Token bucket rate limiter for outbound upstream requests
+Caps the sustained request rate while allowing short bursts, so a traffic
+spike on our side cannot get us throttled by the upstream
+"""
+
+import os
+import threading
+import time
+import requests
+
+
+class RateLimitedError(requests.exceptions.RequestException):
+    """Raised when a request would have to wait too long for a token"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket"""
+
+    def __init__(self, rate: float = None, capacity: float = None, max_wait: float = None):
+        """
+        Initialize the bucket from arguments or environment variables
+
+        Args:
+            rate: Tokens added per second (NCAA_RATE_LIMIT), 0 disables limiting
+            capacity: Maximum burst size (NCAA_RATE_BURST)
+            max_wait: Longest a caller waits for a token, in seconds (NCAA_RATE_MAX_WAIT)
+        """
+        if rate is None:
+            rate = float(os.environ.get('NCAA_RATE_LIMIT', 20))
+        if capacity is None:
+            capacity = float(os.environ.get('NCAA_RATE_BURST', 40))
+        if max_wait is None:
+            max_wait = float(os.environ.get('NCAA_RATE_MAX_WAIT', 2))
+
+        self.rate = rate
+        self.capacity = capacity
+        self.max_wait = max_wait
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, possibly borrowing against future refills
+
+        Returns:
+            Seconds the caller must wait before sending its request
+
+        Raises:
+            RateLimitedError: If the wait would exceed max_wait (no token is taken)
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > self.max_wait:
+                raise RateLimitedError(f"Outbound rate limit of {self.rate}/s exceeded")
+
+            self._tokens -= 1
+            return wait
+
+    def acquire(self) -> None:
+        """Block until a token is available"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,85 @@
+"""
+Single-flight request coalescing
+Concurrent callers asking for the same key wait on one in-flight call
+and share its result instead of each repeating the upstream request
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """An in-flight call that followers can wait on"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        The first caller runs fn; callers arriving while it is in flight block
+        until it finishes and receive the same result or exception.
+
+        Args:
+            key: Identity of the call, e.g. the upstream URL or query
+            fn: Function to run
+            *args, **kwargs: Arguments passed to fn
+
+        Returns:
+            Result of fn
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Get the number of calls currently in flight"""
+        with self._lock:
+            return len(self._calls)
+
+
+# Global single-flight instance shared by the upstream clients
+single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Get the global single-flight instance
+
+    Returns:
+        SingleFlight instance
+    """
+    return single_flight
@@ -0,0 +1,323 @@
+"""
+SQLite-backed response cache shared by every worker process on a host
+Payloads are stored as compressed JSON with wall-clock expiry timestamps,
+so the cache survives restarts and deploys
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from utils.cache import TTLCache
+
+# Trim the database back under its budget every this many writes
+_TRIM_INTERVAL = 100
+
+
+class SQLiteCache:
+    """Persistent cache with the same interface as TTLCache"""
+
+    def __init__(self, path: str = None, max_bytes: int = None):
+        """
+        Open (or create) the cache database
+
+        Args:
+            path: Database file path (CACHE_SQLITE_PATH)
+            max_bytes: Budget for stored compressed payloads (CACHE_SQLITE_MAX_BYTES), 0 disables caching
+        """
+        if path is None:
+            path = os.environ.get('CACHE_SQLITE_PATH') or os.path.join(tempfile.gettempdir(), 'ncaa_cache.sqlite3')
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('CACHE_SQLITE_MAX_BYTES', 256 * 1024 * 1024))
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._counter_lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, '
+                'value BLOB NOT NULL, '
+                'expires_at REAL NOT NULL, '
+                'stale_until REAL NOT NULL, '
+                'size INTEGER NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS cache_stale_until ON cache (stale_until)')
+
+    @property
+    def enabled(self) -> bool:
+        """Check if the cache has a storage budget to work with"""
+        return self.max_bytes > 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it in WAL mode on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA mmap_size=268435456')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        """Serialize and compress a value"""
+        return zlib.compress(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+
+    @staticmethod
+    def _decode(blob: bytes) -> Any:
+        """Decompress and deserialize a value"""
+        return json.loads(zlib.decompress(blob))
+
+    def _count(self, counter: str) -> None:
+        """Increment one of the per-process counters"""
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float, float]]:
+        """
+        Get a retained entry with its wall-clock expiry times
+
+        Args:
+            key: Cache key
+
+        Returns:
+            (value, expires_at, stale_until) tuple, or None if missing or past its stale window
+        """
+        try:
+            row = self._connection().execute(
+                'SELECT value, expires_at, stale_until FROM cache WHERE key = ? AND stale_until > ?',
+                (key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"SQLite cache read failed: {e}")
+            return None
+
+        if row is None:
+            return None
+        return self._decode(row[0]), row[1], row[2]
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a fresh value from the cache
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss or expired entry
+        """
+        entry = self.get_entry(key)
+        if entry is None or time.time() >= entry[1]:
+            self._count('misses')
+            return None
+
+        self._count('hits')
+        return entry[0]
+
+    def ttl(self, key: str) -> float:
+        """Seconds until a cached value expires, 0 if it is missing or already expired"""
+        entry = self.get_entry(key)
+        if entry is None:
+            return 0
+        return max(entry[1] - time.time(), 0)
+
+    def get_stale(self, key: str, max_staleness: float) -> Optional[Any]:
+        """
+        Get an expired value that is at most max_staleness seconds past its expiry
+
+        Args:
+            key: Cache key
+            max_staleness: How long after expiry the value may still be served
+
+        Returns:
+            Cached value, or None if there is no entry recent enough
+        """
+        entry = self.get_entry(key)
+        if entry is None or time.time() - entry[1] >= max_staleness:
+            return None
+
+        self._count('stale_hits')
+        return entry[0]
+
+    def set(self, key: str, value: Any, ttl: float, size: int = None, stale_ttl: float = 0) -> None:
+        """
+        Store a value in the cache
+
+        Args:
+            key: Cache key
+            value: Value to store (must be JSON serializable)
+            ttl: Time to live in seconds
+            size: Ignored, the stored size is the compressed payload length
+            stale_ttl: How long to keep the value after it expires for stale reads
+        """
+        if not self.enabled or ttl <= 0:
+            return
+
+        try:
+            blob = self._encode(value)
+        except (TypeError, ValueError) as e:
+            print(f"SQLite cache skipped unserializable value for {key}: {e}")
+            return
+        if len(blob) > self.max_bytes:
+            return
+
+        expires_at = time.time() + ttl
+        try:
+            self._connection().execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires_at, stale_until, size) VALUES (?, ?, ?, ?, ?)',
+                (key, sqlite3.Binary(blob), expires_at, expires_at + stale_ttl, len(blob))
+            )
+        except sqlite3.Error as e:
+            print(f"SQLite cache write failed: {e}")
+            return
+
+        with self._counter_lock:
+            self._writes += 1
+            should_trim = self._writes % _TRIM_INTERVAL == 0
+        if should_trim:
+            self.trim()
+
+    def delete(self, key: str) -> None:
+        """Remove a single key from the cache"""
+        try:
+            self._connection().execute('DELETE FROM cache WHERE key = ?', (key,))
+        except sqlite3.Error as e:
+            print(f"SQLite cache delete failed: {e}")
+
+    def trim(self) -> None:
+        """Drop entries past their stale window, then the soonest-expiring entries until under budget"""
+        try:
+            conn = self._connection()
+            conn.execute('DELETE FROM cache WHERE stale_until <= ?', (time.time(),))
+
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM cache').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            for key, size in conn.execute('SELECT key, size FROM cache ORDER BY stale_until').fetchall():
+                conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                self._count('evictions')
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        except sqlite3.Error as e:
+            print(f"SQLite cache trim failed: {e}")
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters"""
+        try:
+            self._connection().execute('DELETE FROM cache')
+        except sqlite3.Error as e:
+            print(f"SQLite cache clear failed: {e}")
+
+        with self._counter_lock:
+            self.hits = 0
+            self.misses = 0
+            self.stale_hits = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with entry count, stored bytes and this process's hit/miss counters
+        """
+        try:
+            entries, total = self._connection().execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache'
+            ).fetchone()
+        except sqlite3.Error:
+            entries, total = 0, 0
+
+        lookups = self.hits + self.misses
+        return {
+            'path': self.path,
+            'entries': entries,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale_hits': self.stale_hits,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+class TieredCache:
+    """In-process TTLCache in front of a shared SQLiteCache"""
+
+    def __init__(self, memory: TTLCache, shared: SQLiteCache):
+        self.memory = memory
+        self.shared = shared
+
+    @property
+    def enabled(self) -> bool:
+        """Check if either tier can store values"""
+        return self.memory.enabled or self.shared.enabled
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a fresh value from memory, falling back to (and promoting from) the shared tier"""
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        entry = self.shared.get_entry(key)
+        now = time.time()
+        if entry is None or now >= entry[1]:
+            self.shared._count('misses')
+            return None
+
+        self.shared._count('hits')
+        value, expires_at, stale_until = entry
+        self.memory.set(key, value, expires_at - now, stale_ttl=stale_until - expires_at)
+        return value
+
+    def ttl(self, key: str) -> float:
+        """Seconds until a cached value expires, from memory or the shared tier"""
+        return self.memory.ttl(key) or self.shared.ttl(key)
+
+    def get_stale(self, key: str, max_staleness: float) -> Optional[Any]:
+        """Get a recently expired value from memory, falling back to the shared tier"""
+        value = self.memory.get_stale(key, max_staleness)
+        if value is not None:
+            return value
+        return self.shared.get_stale(key, max_staleness)
+
+    def set(self, key: str, value: Any, ttl: float, size: int = None, stale_ttl: float = 0) -> None:
+        """Store a value in both tiers"""
+        self.memory.set(key, value, ttl, size=size, stale_ttl=stale_ttl)
+        self.shared.set(key, value, ttl, stale_ttl=stale_ttl)
+
+    def delete(self, key: str) -> None:
+        """Remove a key from both tiers"""
+        self.memory.delete(key)
+        self.shared.delete(key)
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers"""
+        self.memory.clear()
+        self.shared.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get counters for both tiers"""
+        stats = self.memory.stats()
+        stats['shared'] = self.shared.stats()
+        return stats
@@ -0,0 +1,87 @@
+"""
+Startup timing report
+Measures how long each module import and initialization step of
+create_app takes, so slow worker boots can be traced to a module.
+"""
+
+import importlib
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """Ordered step name -> seconds timings for application startup"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self.total = 0.0
+
+    @contextmanager
+    def measure(self, name: str):
+        """
+        Time a startup step
+
+        Args:
+            name: Step name shown in the report
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round(time.perf_counter() - start, 4)
+
+    def import_module(self, name: str):
+        """
+        Import a module on demand, recording the import cost
+
+        Modules already imported by an earlier create_app report ~0.
+
+        Args:
+            name: Dotted module name
+
+        Returns:
+            The imported module
+        """
+        with self.measure(f"import {name}"):
+            return importlib.import_module(name)
+
+    def finish(self, elapsed: float) -> None:
+        """
+        Record the total create_app time and log the report
+
+        Logs the slowest steps at INFO and every step at DEBUG.
+
+        Args:
+            elapsed: Seconds spent in create_app
+        """
+        self.total = round(elapsed, 4)
+        slowest = sorted(self.timings.items(), key=lambda item: item[1], reverse=True)[:3]
+        logger.info("Startup took %.3fs, slowest: %s", self.total,
+                    ', '.join(f"{name} {seconds:.3f}s" for name, seconds in slowest))
+        for name, seconds in self.timings.items():
+            logger.debug("Startup step %s: %.4fs", name, seconds)
+
+    def report(self) -> Dict[str, Any]:
+        """Get the total and per-step timings for /api/status"""
+        return {
+            'total': self.total,
+            'steps': dict(self.timings)
+        }
+
+
+# Global startup report, filled in by create_app
+startup_report = StartupReport()
+
+
+def get_startup_report() -> StartupReport:
+    """
+    Get the global startup report
+
+    Returns:
+        StartupReport instance
+    """
+    return startup_report
@@ -3,55 +3,214 @@ Supabase Client Initialization and Helper Functions
 Provides a centralized Supabase client for database operations
 """
 
+import importlib.util
 import os
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Iterator, Sequence, Tuple
 from datetime import datetime
+from api_vars import (
+    PREDICTIONS_CACHE_BYTES,
+    PREDICTIONS_CACHE_TTL,
+    PREDICTIONS_PAGE_SIZE,
+    PREDICTIONS_VERSION_CHECK,
+)
+from utils.cache import TTLCache
+from utils.metrics import observe_upstream
+from utils.singleflight import get_single_flight
 
-try:
-    from supabase import create_client, Client
-    SUPABASE_AVAILABLE = True
-except ImportError:
-    SUPABASE_AVAILABLE = False
+# The supabase SDK takes a few hundred milliseconds to import, so only check
+# that it is installed here and import it on the first connection
+SUPABASE_AVAILABLE = importlib.util.find_spec('supabase') is not None
+if not SUPABASE_AVAILABLE:
     print("Warning: Supabase client not installed. Install with: pip install supabase")
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 
 class SupabaseClient:
     """Wrapper class for Supabase client operations"""
     
     def __init__(self):
-        """Initialize Supabase client from environment variables"""
-        self._client: Optional[Client] = None
+        """
+        Initialize the wrapper from environment variables
         
-        if not SUPABASE_AVAILABLE:
-            return
+        The SDK client is created on first use (or by start_probe), so
+        importing this module and creating the app stay fast.
+        """
+        self._client: Optional['Client'] = None
+        self._connect_attempted = False
+        self._connect_lock = threading.Lock()
+        self._probe_thread: Optional[threading.Thread] = None
+        self.probe: Dict[str, Any] = {'status': 'pending'}
         
-        supabase_url = os.environ.get('SUPABASE_URL')
-        supabase_key = os.environ.get('SUPABASE_KEY')
+        # Read-through cache of prediction queries, dropped whenever the
+        # predictions version stamp changes
+        self._cache = TTLCache(PREDICTIONS_CACHE_BYTES)
+        self._version: Optional[str] = None
+        self._version_checked_at = 0.0
+        self._version_lock = threading.Lock()
+        self.version_file = os.environ.get('PREDICTIONS_VERSION_FILE')
+    
+    def _connect(self) -> None:
+        """Create the SDK client once, on first use"""
+        with self._connect_lock:
+            if self._connect_attempted:
+                return
+            self._connect_attempted = True
+            
+            if not SUPABASE_AVAILABLE:
+                return
+            
+            supabase_url = os.environ.get('SUPABASE_URL')
+            supabase_key = os.environ.get('SUPABASE_KEY')
+            
+            if supabase_url and supabase_key:
+                try:
+                    from supabase import create_client
+                    self._client = create_client(supabase_url, supabase_key)
+                except Exception as e:
+                    print(f"Error initializing Supabase client: {e}")
+                    self._client = None
+            else:
+                print("Warning: SUPABASE_URL or SUPABASE_KEY not set in environment")
+    
+    def start_probe(self) -> None:
+        """
+        Connect and check Supabase reachability in a background thread
         
-        if supabase_url and supabase_key:
-            try:
-                self._client = create_client(supabase_url, supabase_key)
-            except Exception as e:
-                print(f"Error initializing Supabase client: {e}")
-                self._client = None
-        else:
-            print("Warning: SUPABASE_URL or SUPABASE_KEY not set in environment")
+        The result is kept in self.probe for /api/status. Calling it again
+        does nothing.
+        """
+        with self._connect_lock:
+            if self._probe_thread is not None:
+                return
+            self._probe_thread = threading.Thread(target=self._run_probe, name='supabase-probe', daemon=True)
+        self._probe_thread.start()
+    
+    def _run_probe(self) -> None:
+        """Connect, then run one small query and record its outcome"""
+        start = time.monotonic()
+        if not self.is_connected:
+            self.probe = {'status': 'unavailable'}
+            return
+        
+        try:
+            self._execute(self.client.table('predictions').select('id').limit(1))
+            self.probe = {'status': 'ok', 'latency': round(time.monotonic() - start, 3)}
+        except Exception as e:
+            print(f"Supabase connectivity probe failed: {e}")
+            self.probe = {'status': 'error', 'error': str(e)}
     
     @property
-    def client(self) -> Optional[Client]:
-        """Get the Supabase client instance"""
+    def client(self) -> Optional['Client']:
+        """Get the Supabase client instance, connecting on first use"""
+        if self._client is None and not self._connect_attempted:
+            self._connect()
         return self._client
     
     @property
     def is_connected(self) -> bool:
         """Check if Supabase client is connected"""
-        return self._client is not None
+        return self.client is not None
+    
+    @staticmethod
+    def _select(columns: Optional[Sequence[str]]) -> str:
+        """Build a select() column list, all columns when none are given"""
+        return ','.join(columns) if columns else '*'
+    
+    def _execute(self, query, table: str = 'predictions'):
+        """Execute a query builder, recording its latency under /api/metrics"""
+        with observe_upstream('supabase', table):
+            return query.execute()
+    
+    def predictions_version(self) -> str:
+        """
+        Get the current predictions version stamp
+        
+        The prediction writer bumps the stamp after every run. It is the mtime
+        of PREDICTIONS_VERSION_FILE when that is set (checked on every call),
+        otherwise the version column of the predictions_meta row (re-read at
+        most every PREDICTIONS_VERSION_CHECK seconds, see
+        ml/m1/predictions_meta.sql). Cached predictions are dropped when the
+        stamp changes.
+        
+        Returns:
+            Version stamp, '' when no stamp is available
+        """
+        if self.version_file:
+            try:
+                version = str(os.stat(self.version_file).st_mtime_ns)
+            except OSError:
+                version = ''
+            return self._set_version(version)
+        
+        if self._version_is_current():
+            return self._version
+        
+        with self._version_lock:
+            if self._version_is_current():
+                return self._version
+            # Claim the check so other callers keep the current stamp until it is done
+            self._version_checked_at = time.monotonic()
+        
+        # Query outside the lock, concurrent first reads share one round trip
+        version = get_single_flight().do(('supabase', 'predictions_version'), self._fetch_meta_version)
+        return self._set_version(version)
+    
+    def _version_is_current(self) -> bool:
+        """Check if the predictions_meta stamp was read within PREDICTIONS_VERSION_CHECK seconds"""
+        return self._version is not None and time.monotonic() - self._version_checked_at < PREDICTIONS_VERSION_CHECK
+    
+    def _fetch_meta_version(self) -> str:
+        """Read the version stamp from the predictions_meta table"""
+        if not self.is_connected:
+            return ''
+        
+        try:
+            query = self.client.table('predictions_meta').select('version').eq('id', 1).limit(1)
+            response = self._execute(query, 'predictions_meta')
+            return str(response.data[0]['version']) if response.data else ''
+        except Exception as e:
+            print(f"Error fetching predictions version: {e}")
+            return self._version or ''
+    
+    def _set_version(self, version: str) -> str:
+        """Record the latest version stamp, clearing cached predictions when it changed"""
+        with self._version_lock:
+            if version != self._version:
+                if self._version is not None:
+                    self._cache.clear()
+                self._version = version
+        return version
+    
+    def _read_through(self, key: str, fetch) -> Any:
+        """
+        Serve a prediction query from the cache, running it on a miss
+        
+        Args:
+            key: Query cache key, prefixed with the version stamp here
+            fetch: Callable that runs the query; exceptions propagate and are not cached
+        
+        Returns:
+            Query result (shared with the cache, do not mutate)
+        """
+        cache_key = f"{self.predictions_version()}:{key}"
+        value = self._cache.get(cache_key)
+        if value is not None:
+            return value
+        
+        value = fetch()
+        self._cache.set(cache_key, value, PREDICTIONS_CACHE_TTL)
+        return value
     
     def get_predictions(self, 
                        limit: int = 100,
                        season: Optional[int] = None,
                        week: Optional[int] = None,
-                       team: Optional[str] = None) -> List[Dict[str, Any]]:
+                       team: Optional[str] = None,
+                       columns: Optional[Sequence[str]] = None) -> Optional[List[Dict[str, Any]]]:
         """
         Get predictions with optional filters
         
@@ -60,15 +219,16 @@ class SupabaseClient:
             season: Filter by season year
             week: Filter by week number
             team: Filter by team name (home or away)
+            columns: Columns to select, defaults to all
         
         Returns:
-            List of prediction dictionaries
+            List of prediction dictionaries, None if Supabase is unavailable or the query failed
         """
         if not self.is_connected:
-            return []
+            return None
         
         try:
-            query = self._client.table('predictions').select('*')
+            query = self.client.table('predictions').select(self._select(columns))
             
             if season:
                 query = query.eq('season', season)
@@ -82,19 +242,20 @@ class SupabaseClient:
             
             query = query.order('game_date', desc=False).limit(limit)
             
-            response = query.execute()
-            return response.data if response.data else []
+            key = f"predictions:{limit}:{season}:{week}:{team}:{self._select(columns)}"
+            return self._read_through(key, lambda: self._execute(query).data or [])
         
         except Exception as e:
             print(f"Error fetching predictions: {e}")
-            return []
+            return None
     
-    def get_prediction_by_game_id(self, game_id: int) -> Optional[Dict[str, Any]]:
+    def get_prediction_by_game_id(self, game_id: int, columns: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
         """
         Get the most recent prediction for a specific game
         
         Args:
             game_id: Game ID from College Football Data API
+            columns: Columns to select, defaults to all
         
         Returns:
             Prediction dictionary or None
@@ -103,102 +264,267 @@ class SupabaseClient:
             return None
         
         try:
-            response = self._client.table('predictions')\
-                .select('*')\
+            query = self.client.table('predictions')\
+                .select(self._select(columns))\
                 .eq('game_id', game_id)\
                 .order('prediction_made_at', desc=True)\
-                .limit(1)\
-                .execute()
+                .limit(1)
             
-            return response.data[0] if response.data else None
+            rows = self._read_through(f"game:{game_id}:{self._select(columns)}", lambda: self._execute(query).data or [])
+            
+            return rows[0] if rows else None
         
         except Exception as e:
             print(f"Error fetching prediction for game {game_id}: {e}")
             return None
     
-    def get_predictions_by_week(self, season: int, week: int) -> List[Dict[str, Any]]:
+    def get_predictions_by_week(self, season: int, week: int, columns: Optional[Sequence[str]] = None) -> Optional[List[Dict[str, Any]]]:
         """
         Get all predictions for a specific week
         
+        Results are cached until the predictions version stamp changes, and
+        concurrent misses for the same week share a single Supabase query.
+        
         Args:
             season: Season year
             week: Week number
+            columns: Columns to select, defaults to all
         
         Returns:
-            List of prediction dictionaries
+            List of prediction dictionaries, None if Supabase is unavailable or the query failed
         """
         if not self.is_connected:
-            return []
+            return None
         
+        return get_single_flight().do(
+            ('supabase', 'predictions_by_week', season, week, tuple(columns or ())),
+            self._fetch_predictions_by_week, season, week, columns
+        )
+    
+    def _fetch_predictions_by_week(self, season: int, week: int, columns: Optional[Sequence[str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Query Supabase for all predictions in a week"""
         try:
-            response = self._client.table('predictions')\
-                .select('*')\
+            query = self.client.table('predictions')\
+                .select(self._select(columns))\
                 .eq('season', season)\
                 .eq('week', week)\
-                .order('game_date', desc=False)\
-                .execute()
+                .order('game_date', desc=False)
             
-            return response.data if response.data else []
+            key = f"week:{season}:{week}:{self._select(columns)}"
+            return self._read_through(key, lambda: self._execute(query).data or [])
         
         except Exception as e:
             print(f"Error fetching predictions for week {week}: {e}")
-            return []
+            return None
+    
+    def get_predictions_by_week_range(self, season: int, start_week: int, end_week: int,
+                                      columns: Optional[Sequence[str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get all predictions for a range of weeks in one query
+        
+        Args:
+            season: Season year
+            start_week: First week number (inclusive)
+            end_week: Last week number (inclusive)
+            columns: Columns to select, defaults to all
+        
+        Returns:
+            List of prediction dictionaries ordered by week and game date,
+            None if Supabase is unavailable or the query failed
+        """
+        if not self.is_connected:
+            return None
+        
+        try:
+            query = self.client.table('predictions')\
+                .select(self._select(columns))\
+                .eq('season', season)\
+                .gte('week', start_week)\
+                .lte('week', end_week)\
+                .order('week', desc=False)\
+                .order('game_date', desc=False)
+            
+            key = f"weeks:{season}:{start_week}-{end_week}:{self._select(columns)}"
+            return self._read_through(key, lambda: self._execute(query).data or [])
+        
+        except Exception as e:
+            print(f"Error fetching predictions for weeks {start_week}-{end_week}: {e}")
+            return None
     
-    def get_predictions_by_team(self, team_name: str, season: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_predictions_by_team(self, team_name: str, season: Optional[int] = None,
+                                columns: Optional[Sequence[str]] = None) -> Optional[List[Dict[str, Any]]]:
         """
         Get all predictions involving a specific team
         
         Args:
             team_name: Team name
             season: Optional season filter
+            columns: Columns to select, defaults to all
         
         Returns:
-            List of prediction dictionaries
+            List of prediction dictionaries, None if Supabase is unavailable or the query failed
         """
         if not self.is_connected:
-            return []
+            return None
         
         try:
-            query = self._client.table('predictions')\
-                .select('*')\
+            query = self.client.table('predictions')\
+                .select(self._select(columns))\
                 .or_(f'home_team.eq.{team_name},away_team.eq.{team_name}')
             
             if season:
                 query = query.eq('season', season)
             
-            response = query.order('game_date', desc=False).execute()
-            
-            return response.data if response.data else []
+            query = query.order('game_date', desc=False)
+            key = f"team:{team_name}:{season}:{self._select(columns)}"
+            return self._read_through(key, lambda: self._execute(query).data or [])
         
         except Exception as e:
             print(f"Error fetching predictions for team {team_name}: {e}")
-            return []
+            return None
     
-    def get_latest_predictions(self, limit: int = 50) -> List[Dict[str, Any]]:
+    def get_latest_predictions(self, limit: int = 50, columns: Optional[Sequence[str]] = None) -> Optional[List[Dict[str, Any]]]:
         """
         Get the most recently created predictions
         
         Args:
             limit: Maximum number of predictions to return
+            columns: Columns to select, defaults to all
         
         Returns:
-            List of prediction dictionaries
+            List of prediction dictionaries, None if Supabase is unavailable or the query failed
         """
         if not self.is_connected:
-            return []
+            return None
         
         try:
-            response = self._client.table('predictions')\
-                .select('*')\
+            query = self.client.table('predictions')\
+                .select(self._select(columns))\
                 .order('created_at', desc=True)\
-                .limit(limit)\
-                .execute()
+                .limit(limit)
             
-            return response.data if response.data else []
+            key = f"latest:{limit}:{self._select(columns)}"
+            return self._read_through(key, lambda: self._execute(query).data or [])
         
         except Exception as e:
             print(f"Error fetching latest predictions: {e}")
-            return []
+            return None
+    
+    def get_predictions_page(self,
+                             season: Optional[int] = None,
+                             week: Optional[int] = None,
+                             team: Optional[str] = None,
+                             columns: Optional[Sequence[str]] = None,
+                             order_by: str = 'game_date',
+                             desc: bool = False,
+                             cursor: Optional[Tuple[Any, Any]] = None,
+                             page_size: int = PREDICTIONS_PAGE_SIZE) -> Tuple[List[Dict[str, Any]], Optional[Tuple[Any, Any]]]:
+        """
+        Get one page of predictions using keyset pagination
+        
+        Pages are ordered by (order_by, id) and each page starts after the
+        cursor of the previous one, so deep pages cost the same as the first
+        instead of scanning past an offset. Rows with a NULL order_by value
+        come last (first when desc), as Postgres sorts them.
+        
+        Args:
+            season: Filter by season year
+            week: Filter by week number
+            team: Filter by team name (home or away)
+            columns: Columns to select, defaults to all (order_by and id are always included)
+            order_by: Sort column, 'game_date' or 'created_at'
+            desc: Sort newest first
+            cursor: Cursor returned with the previous page, None for the first page
+            page_size: Maximum number of predictions per page
+        
+        Returns:
+            Tuple of (predictions, cursor for the next page or None after the last page)
+        """
+        if order_by not in ('game_date', 'created_at'):
+            raise ValueError(f"Cannot paginate predictions by '{order_by}'")
+        
+        if not self.is_connected:
+            return [], None
+        
+        if columns:
+            columns = list(columns) + [column for column in (order_by, 'id') if column not in columns]
+        
+        try:
+            query = self.client.table('predictions').select(self._select(columns))
+            
+            if season:
+                query = query.eq('season', season)
+            
+            if week:
+                query = query.eq('week', week)
+            
+            if team:
+                query = query.or_(f'home_team.eq.{team},away_team.eq.{team}')
+            
+            if cursor is not None:
+                query = query.or_(self._keyset_filter(order_by, desc, cursor))
+            
+            query = query.order(order_by, desc=desc).order('id', desc=desc).limit(page_size)
+            
+            response = self._execute(query)
+            rows = response.data if response.data else []
+        
+        except Exception as e:
+            print(f"Error fetching predictions page: {e}")
+            return [], None
+        
+        if len(rows) < page_size:
+            return rows, None
+        return rows, (rows[-1].get(order_by), rows[-1].get('id'))
+    
+    @staticmethod
+    def _keyset_filter(order_by: str, desc: bool, cursor: Tuple[Any, Any]) -> str:
+        """
+        Build the or_() filter for the rows after a keyset cursor
+        
+        Postgres sorts NULLs last in ascending and first in descending order,
+        so a NULL cursor value is matched with is.null instead of being
+        compared, and NULL rows still ahead of a non-NULL cursor are included.
+        
+        Args:
+            order_by: Sort column
+            desc: Whether the pages are sorted newest first
+            cursor: (order_by value, id) of the last row of the previous page
+        
+        Returns:
+            PostgREST logical filter for or_()
+        """
+        value, last_id = cursor
+        op = 'lt' if desc else 'gt'
+        
+        if value is None:
+            filters = [f'and({order_by}.is.null,id.{op}.{last_id})']
+            if desc:
+                filters.append(f'{order_by}.not.is.null')
+        else:
+            filters = [f'{order_by}.{op}."{value}"', f'and({order_by}.eq."{value}",id.{op}.{last_id})']
+            if not desc:
+                filters.append(f'{order_by}.is.null')
+        return ','.join(filters)
+    
+    def iter_prediction_pages(self, page_size: int = PREDICTIONS_PAGE_SIZE, **filters) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream predictions page by page without loading the whole result into memory
+        
+        Args:
+            page_size: Maximum number of predictions per page
+            **filters: season, week, team, columns, order_by and desc, as for get_predictions_page
+        
+        Yields:
+            Lists of prediction dictionaries, one per page
+        """
+        cursor = None
+        while True:
+            rows, cursor = self.get_predictions_page(cursor=cursor, page_size=page_size, **filters)
+            if rows:
+                yield rows
+            if cursor is None:
+                return
 
 
 # Global Supabase client instance
@@ -354,6 +354,28 @@ def predict_games(games: List[Dict], year: int) -> List[Dict]:
     return predictions
 
 
+def bump_predictions_version() -> None:
+    """
+    Bump the predictions version stamp so the backend drops its cached predictions
+    Updates the predictions_meta row (see predictions_meta.sql) and touches PREDICTIONS_VERSION_FILE when set
+    """
+    version_file = os.getenv("PREDICTIONS_VERSION_FILE")
+    if version_file:
+        try:
+            with open(version_file, 'a'):
+                os.utime(version_file)
+        except OSError as e:
+            print(f"⚠ Could not touch predictions version file: {e}")
+    
+    try:
+        supabase.table('predictions_meta').upsert({
+            'id': 1,
+            'version': datetime.utcnow().isoformat()
+        }).execute()
+    except Exception as e:
+        print(f"⚠ Could not update predictions version: {e}")
+
+
 def save_to_supabase(predictions: List[Dict]) -> bool:
     """
     Save predictions to Supabase database
@@ -376,6 +398,7 @@ def save_to_supabase(predictions: List[Dict]) -> bool:
         # Insert predictions into database
         response = supabase.table('predictions').insert(predictions).execute()
         print(f"✓ Successfully saved {len(predictions)} predictions to Supabase")
+        bump_predictions_version()
         return True
     except Exception as e:
         print(f"⚠ Error saving to Supabase: {e}")
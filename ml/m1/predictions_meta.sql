@@ -0,0 +1,12 @@
+-- Predictions version stamp
+-- predict_upcoming.py upserts row 1 with a new version after every write to the
+-- predictions table. The backend re-reads it every PREDICTIONS_VERSION_CHECK
+-- seconds and drops its cached predictions when it changes.
+-- Run once in the Supabase SQL editor.
+
+create table if not exists predictions_meta (
+    id integer primary key check (id = 1),
+    version text not null default ''
+);
+
+insert into predictions_meta (id, version) values (1, '') on conflict (id) do nothing;